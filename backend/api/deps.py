@@ -1,11 +1,14 @@
 #backend/api/deps.py
 from __future__ import annotations
 from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional
 
 from backend.core.config import settings
+from backend.core.metrics import UPLOADS_IN_FLIGHT
 from backend.db.mongo import db_dependency
-from fastapi import Depends
+from fastapi import Depends, Query, Request
 from pymongo.database import Database
+from backend.services.dimension_filters import dimension_range_filter
 from backend.storage.base import StorageBackend
 from backend.storage.filesystem import FileSystemStorage
 
@@ -16,8 +19,42 @@ def get_db(db: Database = Depends(db_dependency)) -> Database:
 
 @lru_cache
 def _storage_instance() -> StorageBackend:
-    return FileSystemStorage(settings.file_base_dir)
+    return FileSystemStorage(settings.file_base_dir, dedupe=settings.storage_dedupe)
 
 
 def get_storage() -> StorageBackend:
     return _storage_instance()
+
+
+def track_upload(request: Request) -> Iterator[None]:
+    """
+    Route dependency counting upload requests currently in progress.
+    """
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    gauge = UPLOADS_IN_FLIGHT.labels(route)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def dimension_ranges(
+    width_min_mm: Optional[float] = Query(None, ge=0),
+    width_max_mm: Optional[float] = Query(None, ge=0),
+    height_min_mm: Optional[float] = Query(None, ge=0),
+    height_max_mm: Optional[float] = Query(None, ge=0),
+    depth_min_mm: Optional[float] = Query(None, ge=0),
+    depth_max_mm: Optional[float] = Query(None, ge=0),
+    max_min_mm: Optional[float] = Query(None, ge=0, description="Bounds on the largest dimension of any kind."),
+    max_max_mm: Optional[float] = Query(None, ge=0),
+) -> Dict[str, Any]:
+    """
+    Listing query params -> Mongo range filter on dimension_summary.
+    """
+    return dimension_range_filter({
+        "width": (width_min_mm, width_max_mm),
+        "height": (height_min_mm, height_max_mm),
+        "depth": (depth_min_mm, depth_max_mm),
+        "max": (max_min_mm, max_max_mm),
+    })
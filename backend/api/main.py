@@ -1,18 +1,56 @@
 #backend/api/main.py
 from __future__ import annotations
-from backend.api.routes import assets, views
+from backend.api.middleware import MetricsMiddleware
+from backend.api.responses import FastJSONResponse
+from backend.api.routes import assets, campaigns, uploads, views
+from backend.core.metrics import COLLECTORS, render_metrics
+from backend.services.cache import cache_stats
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_metrics() -> list:
+    lines = [
+        "# HELP archimera_cache_events_total Read-through cache lookups and evictions.",
+        "# TYPE archimera_cache_events_total counter",
+    ]
+    sizes = [
+        "# HELP archimera_cache_entries Entries currently held per cache.",
+        "# TYPE archimera_cache_entries gauge",
+    ]
+    for name, stats in cache_stats().items():
+        for event in ("hits", "misses", "evictions"):
+            lines.append(f'archimera_cache_events_total{{cache="{name}",event="{event}"}} {stats[event]}')
+        sizes.append(f'archimera_cache_entries{{cache="{name}"}} {stats["size"]}')
+    return lines + sizes
+
+
+COLLECTORS.append(_cache_metrics)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Archimera Backend", version="0.1.0")
+    app = FastAPI(title="Archimera Backend", version="0.1.0", default_response_class=FastJSONResponse)
+    app.add_middleware(MetricsMiddleware)
 
     app.include_router(assets.router)
     app.include_router(views.router)
+    app.include_router(uploads.router)
+    app.include_router(campaigns.router)
 
     @app.get("/health")
     def health_check():
         return {"status": "ok"}
+
+    @app.get("/health/cache")
+    def cache_health():
+        return cache_stats()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
     
     return app
 
@@ -0,0 +1,161 @@
+#backend/api/multipart_stream.py
+"""
+Streaming multipart/form-data reader for view uploads.
+
+Starlette's form parser spools every file part to a local
+SpooledTemporaryFile before the route sees it. This reader instead feeds
+the raw request body through python-multipart and pushes file bytes
+straight into StorageWriters (temp files on the NAS), so each upload
+crosses the disk once.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.core.concurrency import run_blocking
+from backend.storage.base import StorageWriter
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+
+
+FLUSH_SIZE = 1024 * 1024
+MAX_FIELD_BYTES = 64 * 1024
+
+# (field name, filename, content type) -> writer, or None to discard the part
+WriterFactory = Callable[[str, str, str], Optional[StorageWriter]]
+
+
+class StreamedForm:
+    """
+    Result of streaming a multipart body: small text fields are kept in
+    memory, file parts are left as open (uncommitted) writers so the
+    caller can validate the metadata before anything becomes visible.
+    """
+    def __init__(self) -> None:
+        self.fields: Dict[str, str] = {}
+        self.writers: Dict[str, StorageWriter] = {}
+
+    async def abort(self) -> None:
+        for writer in self.writers.values():
+            await run_blocking(writer.abort)
+        self.writers.clear()
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class _PartEvents:
+    """
+    Collects parser callbacks. The parser is synchronous, so callbacks only
+    record what happened; the async loop replays events and does the I/O.
+    """
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, object]] = []
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        }
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        content_type = self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+        self.events.append(("begin", (name, None if filename is None else filename.decode("utf-8", "replace"), content_type)))
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def _on_part_end(self) -> None:
+        self.events.append(("end", None))
+
+
+async def stream_multipart(request: Request, writer_factory: WriterFactory) -> StreamedForm:
+    """
+    Parse a multipart body from `request.stream()`.
+
+    File parts are routed to `writer_factory(name, filename, content_type)`;
+    text parts end up in `StreamedForm.fields`. On any error every writer
+    opened so far is aborted before the exception propagates.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise _bad_request("Expected a multipart/form-data body.")
+
+    form = StreamedForm()
+    events = _PartEvents()
+    parser = MultipartParser(params[b"boundary"], events.callbacks())
+
+    name: str = ""
+    writer: Optional[StorageWriter] = None
+    is_file = False
+    field_buf = bytearray()
+    file_buf = bytearray()
+
+    async def _flush() -> None:
+        if writer is not None and file_buf:
+            await run_blocking(writer.write, bytes(file_buf))
+        file_buf.clear()
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for kind, payload in events.events:
+                if kind == "begin":
+                    name, filename, part_type = payload  # type: ignore[misc]
+                    is_file = filename is not None
+                    writer = None
+                    if is_file:
+                        if name in form.writers:
+                            raise _bad_request(f"Duplicate file field: {name}")
+                        writer = await run_blocking(writer_factory, name, filename, part_type)
+                        if writer is not None:
+                            form.writers[name] = writer
+                elif kind == "data":
+                    if is_file:
+                        if writer is not None:
+                            file_buf += payload  # type: ignore[operator]
+                            if len(file_buf) >= FLUSH_SIZE:
+                                await _flush()
+                    else:
+                        field_buf += payload  # type: ignore[operator]
+                        if len(field_buf) > MAX_FIELD_BYTES:
+                            raise _bad_request(f"Form field too large: {name}")
+                else:
+                    if is_file:
+                        await _flush()
+                    else:
+                        form.fields[name] = field_buf.decode("utf-8")
+                        field_buf.clear()
+                    writer = None
+            events.events.clear()
+        parser.finalize()
+    except BaseException:
+        await form.abort()
+        raise
+
+    return form
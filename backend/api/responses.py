@@ -0,0 +1,45 @@
+#backend/api/responses.py
+"""
+Fast response helpers.
+
+Services already return validated `*Public` models, so routes hand them
+to `model_response` instead of letting FastAPI validate them a second time
+against `response_model` (which is still declared, for the OpenAPI schema).
+Models and plain dict payloads such as listing pages both go through orjson
+with the same options.
+"""
+from __future__ import annotations
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+# Naive datetimes (as returned by pymongo) are UTC and rendered with a
+# trailing "Z", like aware ones.
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson-backed JSON response (see JSON_OPTIONS).
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+def model_json(model: BaseModel) -> bytes:
+    """
+    JSON bytes for an already-validated model, rendered like FastJSONResponse
+    so a datetime reads the same from single-object and listing endpoints.
+    """
+    return orjson.dumps(model.model_dump(), option=JSON_OPTIONS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize an already-validated model straight to JSON bytes.
+    """
+    return Response(content=model_json(model), status_code=status_code, media_type="application/json")
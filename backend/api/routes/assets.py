@@ -1,23 +1,101 @@
 #backend/api/routes/assets.py
 from __future__ import annotations
-from backend.api.deps import get_db
+import re
+from typing import Literal, Optional
+
+from backend.api.deps import dimension_ranges, get_db, get_storage, track_upload
+from backend.api.responses import FastJSONResponse, model_response
 from backend.db.asset_models import AssetCreate, AssetPublic
-from fastapi import APIRouter, Depends, HTTPException, status
+from backend.db.bulk_models import AssetWithViewsPublic
+from backend.db.common_models import Page
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pymongo.database import Database
-from backend.services import asset_service
+from backend.services import asset_service, bulk_service
+from backend.storage.base import StorageBackend
 
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
+_BULK_FILE_FIELD = re.compile(r"^(sketch|cad)_(\d+)$")
+MAX_BULK_VIEWS = 100
+
 
 @router.post("", response_model=AssetPublic, status_code=status.HTTP_201_CREATED)
-def create_asset_endpoint(payload: AssetCreate, db: Database = Depends(get_db)) -> AssetPublic:
-    return asset_service.create_asset(db=db, payload=payload)
+def create_asset_endpoint(payload: AssetCreate, db: Database = Depends(get_db)) -> Response:
+    asset = asset_service.create_asset(db=db, payload=payload)
+    return model_response(asset, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("", response_model=Page)
+def list_assets_endpoint(
+    client_name: Optional[str] = None,
+    project_name: Optional[str] = None,
+    category: Optional[str] = None,
+    tag_category: Optional[str] = None,
+    tag_value: Optional[str] = None,
+    sort: Literal["_id", "updated_at"] = "_id",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (id is always included)."),
+    dimensions: dict = Depends(dimension_ranges),
+    db: Database = Depends(get_db),
+) -> Response:
+    filters = asset_service.asset_list_filter(
+        client_name=client_name,
+        project_name=project_name,
+        category=category,
+        tag_category=tag_category,
+        tag_value=tag_value,
+        dimensions=dimensions,
+    )
+    page = asset_service.list_assets(
+        db=db, filters=filters, sort_field=sort, order=order, limit=limit, cursor=cursor, fields=fields,
+    )
+    return FastJSONResponse(page)
+
+
+@router.post("/bulk", response_model=AssetWithViewsPublic, status_code=status.HTTP_201_CREATED, dependencies=[Depends(track_upload)])
+async def create_asset_with_views_endpoint(
+    request: Request,
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> Response:
+    """
+    Create an asset and all of its views in one multipart request.
+
+    Form fields:
+        payload_json - {"asset": {...AssetCreate}, "views": [{...ViewCreate}, ...]}
+        sketch_{i} / cad_{i} - files for the i-th entry of `views`
+    """
+    form = await request.form(max_files=2 * MAX_BULK_VIEWS, max_fields=2 * MAX_BULK_VIEWS + 1)
+    try:
+        payload_json = form.get("payload_json")
+        if not isinstance(payload_json, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payload_json is required.")
+
+        uploads: bulk_service.ViewUploads = {}
+        for key, value in form.multi_items():
+            match = _BULK_FILE_FIELD.match(key)
+            if match is None or isinstance(value, str):
+                continue
+            kind, index = match.group(1), int(match.group(2))
+            sketch, cad = uploads.get(index, (None, None))
+            uploads[index] = (value, cad) if kind == "sketch" else (sketch, value)
+
+        asset, views = bulk_service.validate_submission(payload_json, uploads)
+        if len(views) > MAX_BULK_VIEWS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_BULK_VIEWS} views per request.")
+
+        result = await bulk_service.create_asset_with_views(db, storage, asset, views, uploads)
+        return model_response(result, status_code=status.HTTP_201_CREATED)
+    finally:
+        await form.close()
 
 
 @router.get("/{asset_id}", response_model=AssetPublic)
-def get_asset_endpoint(asset_id: str, db: Database = Depends(get_db)) -> AssetPublic:
+def get_asset_endpoint(asset_id: str, db: Database = Depends(get_db)) -> Response:
     asset = asset_service.get_asset(db=db, asset_id=asset_id)
     if asset is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
-    return asset
+    return model_response(asset)
@@ -0,0 +1,30 @@
+#backend/api/routes/campaigns.py
+from __future__ import annotations
+from typing import List
+
+from backend.api.deps import get_db
+from backend.api.responses import FastJSONResponse, model_response
+from backend.db.campaign_models import CampaignProgress
+from fastapi import APIRouter, Depends, Query, Response
+from pymongo.database import Database
+from backend.services import campaign_service
+
+
+router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+
+
+@router.get("", response_model=List[CampaignProgress])
+def list_campaigns_endpoint(
+    limit: int = Query(20, ge=1, le=200),
+    db: Database = Depends(get_db),
+) -> Response:
+    campaigns = campaign_service.list_campaigns(db=db, limit=limit)
+    return FastJSONResponse([c.model_dump() for c in campaigns])
+
+
+@router.get("/{campaign_id}", response_model=CampaignProgress)
+def get_campaign_endpoint(campaign_id: str, db: Database = Depends(get_db)) -> Response:
+    """
+    Progress of a reprocessing campaign: per-status counts, throughput and ETA.
+    """
+    return model_response(campaign_service.get_campaign_progress(db=db, campaign_id=campaign_id))
@@ -0,0 +1,78 @@
+#backend/api/routes/uploads.py
+from __future__ import annotations
+
+from backend.api.deps import get_db, get_storage, track_upload
+from backend.core.concurrency import run_blocking
+from backend.db.upload_models import UploadSessionCreate, UploadSessionPublic
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pymongo.database import Database
+from backend.services import upload_service
+from backend.storage.base import StorageBackend
+
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+FLUSH_SIZE = 1024 * 1024
+
+
+@router.post("", response_model=UploadSessionPublic, status_code=status.HTTP_201_CREATED)
+def create_upload_session_endpoint(
+    payload: UploadSessionCreate,
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> UploadSessionPublic:
+    return upload_service.create_session(db=db, storage=storage, payload=payload)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionPublic)
+def get_upload_session_endpoint(upload_id: str, db: Database = Depends(get_db)) -> UploadSessionPublic:
+    return upload_service.get_session(db=db, upload_id=upload_id)
+
+
+@router.put("/{upload_id}", response_model=UploadSessionPublic, dependencies=[Depends(track_upload)])
+async def put_upload_chunk_endpoint(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> UploadSessionPublic:
+    """
+    Write the raw request body at `offset`. Chunks may be sent in any order
+    and in parallel; only fully received chunks are recorded.
+    """
+    doc = await run_blocking(upload_service.get_open_session_doc, db, upload_id)
+    total_size = doc["total_size"]
+    session_id = str(doc["_id"])
+
+    position = offset
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+        if position + len(buf) > total_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk runs past the declared size of {total_size} bytes",
+            )
+        if len(buf) >= FLUSH_SIZE:
+            await run_blocking(upload_service.write_chunk, db, storage, session_id, position, bytes(buf))
+            position += len(buf)
+            buf.clear()
+    if buf:
+        await run_blocking(upload_service.write_chunk, db, storage, session_id, position, bytes(buf))
+        position += len(buf)
+
+    if position == offset:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty chunk")
+
+    return await run_blocking(upload_service.record_range, db, upload_id, offset, position)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session_endpoint(
+    upload_id: str,
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> Response:
+    upload_service.abort_session(db=db, storage=storage, upload_id=upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
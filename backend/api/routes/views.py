@@ -1,21 +1,62 @@
 #backend/api/routes/views.py
 from __future__ import annotations
 import json
-from typing import Optional
+from typing import Literal, Optional
 
-from backend.api.deps import get_db, get_storage
-from backend.db.view_models import ViewCreate, ViewPublic
-from fastapi import APIRouter, Depends, File, Form, HTTPException, status, UploadFile
+from backend.api.deps import dimension_ranges, get_db, get_storage, track_upload
+from backend.api.multipart_stream import stream_multipart
+from backend.api.responses import FastJSONResponse, model_response
+from backend.core.concurrency import run_blocking
+from backend.db.common_models import Page
+from backend.db.upload_models import ViewFromUploads
+from backend.db.view_models import ViewCreate, ViewFiles, ViewPublic
+from bson import ObjectId
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, status, UploadFile
 from pydantic import ValidationError
 from pymongo.database import Database
-from backend.services.view_service import create_view as svc_create_view
-from backend.storage.base import StorageBackend
+from backend.services.upload_service import finalize_view
+from backend.services.view_service import create_view as svc_create_view, ensure_asset_exists, get_view, insert_view, list_views, view_list_filter
+from backend.storage.base import StorageBackend, StorageWriter
 
 
 router = APIRouter(prefix="/assets/{asset_id}/views", tags=["views"])
 
 
-@router.post("", response_model=ViewPublic, status_code=status.HTTP_201_CREATED)
+def _parse_view_meta(payload_json: str) -> ViewCreate:
+    try:
+        payload_dict = json.loads(payload_json)
+        return ViewCreate.model_validate(payload_dict)
+    except (json.JSONDecodeError, ValidationError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid view metadata: {exc}")
+
+
+@router.get("", response_model=Page)
+def list_views_endpoint(
+    asset_id: str,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    view_type: Optional[str] = None,
+    sort: Literal["_id", "updated_at"] = "_id",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (id is always included)."),
+    dimensions: dict = Depends(dimension_ranges),
+    db: Database = Depends(get_db),
+) -> Response:
+    filters = view_list_filter(asset_id, status=status_filter, view_type=view_type, dimensions=dimensions)
+    page = list_views(db=db, filters=filters, sort_field=sort, order=order, limit=limit, cursor=cursor, fields=fields)
+    return FastJSONResponse(page)
+
+
+@router.get("/{view_id}", response_model=ViewPublic)
+def get_view_endpoint(asset_id: str, view_id: str, db: Database = Depends(get_db)) -> Response:
+    view = get_view(db=db, asset_id=asset_id, view_id=view_id)
+    if view is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="View not found")
+    return model_response(view)
+
+
+@router.post("", response_model=ViewPublic, status_code=status.HTTP_201_CREATED, dependencies=[Depends(track_upload)])
 async def create_view_endpoint(
     asset_id: str,
     payload_json: str = Form(...),
@@ -23,17 +64,15 @@ async def create_view_endpoint(
     cad: Optional[UploadFile] = File(None),
     db: Database = Depends(get_db),
     storage: StorageBackend = Depends(get_storage),
-) -> ViewPublic:
-    try:
-        payload_dict = json.loads(payload_json)
-        meta = ViewCreate.model_validate(payload_dict)
-    except (json.JSONDecodeError, ValidationError) as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid view metadata: {exc}")
+) -> Response:
+    meta = _parse_view_meta(payload_json)
     
     if sketch is None and cad is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one of sketch or cad must be provided.")
     
-    return svc_create_view(
+    # Mongo lookups/inserts and NAS writes are all blocking; keep them off the event loop.
+    view = await run_blocking(
+        svc_create_view,
         db=db,
         storage=storage,
         asset_id=asset_id,
@@ -41,3 +80,60 @@ async def create_view_endpoint(
         sketch=sketch,
         cad=cad,
     )
+    return model_response(view, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/stream", response_model=ViewPublic, status_code=status.HTTP_201_CREATED, dependencies=[Depends(track_upload)])
+async def create_view_streaming_endpoint(
+    asset_id: str,
+    request: Request,
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> Response:
+    """
+    Same form fields as POST /assets/{asset_id}/views (payload_json, sketch,
+    cad), but file parts are streamed straight into temp files on the NAS
+    and renamed into raw/ once the metadata validates. Nothing is spooled
+    to local disk, so upload size is bounded only by the NAS.
+    """
+    await run_blocking(ensure_asset_exists, db, asset_id)
+    view_id = str(ObjectId())
+
+    def _writer_for(name: str, filename: str, content_type: str) -> Optional[StorageWriter]:
+        if name not in ("sketch", "cad"):
+            return None
+        rel_path = storage.view_rel_path(name, asset_id, view_id, filename)
+        return storage.open_writer(rel_path, content_type)
+
+    form = await stream_multipart(request, _writer_for)
+    try:
+        if "payload_json" not in form.fields:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payload_json is required.")
+        meta = _parse_view_meta(form.fields["payload_json"])
+        if not form.writers:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one of sketch or cad must be provided.")
+    except HTTPException:
+        await form.abort()
+        raise
+
+    files = ViewFiles()
+    for name, writer in form.writers.items():
+        setattr(files, name, await run_blocking(writer.commit))
+    form.writers.clear()
+
+    view = await run_blocking(insert_view, db, asset_id, ObjectId(view_id), meta, files)
+    return model_response(view, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/from-uploads", response_model=ViewPublic, status_code=status.HTTP_201_CREATED, dependencies=[Depends(track_upload)])
+def create_view_from_uploads_endpoint(
+    asset_id: str,
+    payload: ViewFromUploads,
+    db: Database = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> Response:
+    """
+    Create a view from completed resumable upload sessions (see /uploads).
+    """
+    view = finalize_view(db=db, storage=storage, asset_id=asset_id, payload=payload)
+    return model_response(view, status_code=status.HTTP_201_CREATED)
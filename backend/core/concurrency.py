@@ -0,0 +1,29 @@
+# backend/core/concurrency.py
+from __future__ import annotations
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+from backend.core.config import settings
+
+
+T = TypeVar("T")
+
+
+@lru_cache
+def io_limiter() -> CapacityLimiter:
+    """
+    Shared limiter for blocking work (pymongo calls, NAS writes).
+
+    Kept separate from Starlette's default threadpool so a burst of slow
+    uploads can never take every worker thread away from light endpoints
+    such as /health.
+    """
+    return CapacityLimiter(settings.io_max_workers)
+
+
+async def run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable in a worker thread bounded by `io_limiter()`.
+    """
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=io_limiter())
@@ -10,9 +10,31 @@ class Settings(BaseSettings):
     Reads env vars:
         MONGO_URI - full URI, ideally with DB: mongodb://mongo:27017/cad_db
         FILE_BASE_DIR - where the NAS is mounted inside the container (e.g., /mnt/assets)
+        STORAGE_DEDUPE - keep one content-addressed copy per unique file (raw/ paths become hardlinks)
+        UPLOAD_SESSION_TTL_SECONDS - idle time after which resumable upload sessions are garbage-collected
+        CACHE_MAX_ENTRIES / CACHE_TTL_SECONDS - bounds for the in-process asset/view read cache
+        IO_MAX_WORKERS - max blocking Mongo/NAS calls offloaded from the event loop at once
+        JOB_LEASE_SECONDS - how long a claimed view/embedding job stays owned without a heartbeat
+        JOB_MAX_ATTEMPTS - claims per job before it is parked in "Error"
+        JOB_BACKOFF_BASE_SECONDS / JOB_BACKOFF_MAX_SECONDS - retry delay, doubled per failed attempt
+        JOB_POLL_MIN_SECONDS / JOB_POLL_MAX_SECONDS - idle worker poll backoff when change streams are unavailable;
+            the max is also the safety-net claim interval while change streams are active
+        JOB_FAIR_SHARE - interactive claims per bulk-lane (reprocessing campaign) claim while both lanes have work
     """
     mongo_uri: str = "mongodb://mongo:27017/cad_db"
     file_base_dir: str = "/mnt/assets"
+    storage_dedupe: bool = True
+    upload_session_ttl_seconds: int = 24 * 60 * 60
+    io_max_workers: int = 16
+    cache_max_entries: int = 10_000
+    cache_ttl_seconds: float = 60.0
+    job_lease_seconds: float = 300.0
+    job_max_attempts: int = 5
+    job_backoff_base_seconds: float = 30.0
+    job_backoff_max_seconds: float = 3600.0
+    job_poll_min_seconds: float = 0.05
+    job_poll_max_seconds: float = 30.0
+    job_fair_share: int = 4
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,224 @@
+#backend/core/metrics.py
+"""
+Minimal Prometheus-text metrics for the backend.
+
+Metric families are declared once at import time. Each label combination
+gets one child object that is created on first use and cached, and
+histograms use fixed bucket boundaries, so recording a sample is a dict
+lookup, a bisect and a couple of integer adds; nothing is allocated per
+request. Scrape with GET /metrics.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+THROUGHPUT_BUCKETS = tuple(float(2 ** p) * 1024 * 1024 for p in range(-2, 11))  # 256 KiB/s .. 1 GiB/s
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Family] = []
+# Callables returning extra exposition lines (computed at scrape time).
+COLLECTORS: List[Callable[[], List[str]]] = []
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for family in REGISTRY:
+        lines.extend(family.render())
+    for collector in COLLECTORS:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+# --- HTTP ---
+HTTP_REQUEST_DURATION = Histogram(
+    "archimera_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+UPLOADS_IN_FLIGHT = Gauge(
+    "archimera_uploads_in_flight",
+    "Upload requests currently being processed.",
+    ("route",),
+)
+
+# --- Mongo ---
+MONGO_COMMAND_DURATION = Histogram(
+    "archimera_mongo_command_duration_seconds",
+    "MongoDB command round-trip time by command name.",
+    ("command", "outcome"),
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "archimera_mongo_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ("address",),
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "archimera_mongo_pool_open_connections",
+    "Open connections in the pool.",
+    ("address",),
+)
+MONGO_POOL_CHECKOUT_FAILED = Counter(
+    "archimera_mongo_pool_checkout_failed_total",
+    "Failed connection checkouts by reason.",
+    ("address", "reason"),
+)
+
+# --- Storage ---
+STORAGE_WRITE_BYTES = Counter(
+    "archimera_storage_write_bytes_total",
+    "Bytes written to file storage.",
+    ("operation",),
+)
+STORAGE_WRITE_DURATION = Histogram(
+    "archimera_storage_write_duration_seconds",
+    "Time spent writing one file (excluding time waiting on the client).",
+    ("operation",),
+)
+STORAGE_WRITE_THROUGHPUT = Histogram(
+    "archimera_storage_write_throughput_bytes_per_second",
+    "Per-file storage write throughput.",
+    ("operation",),
+    buckets=THROUGHPUT_BUCKETS,
+)
+
+
+def observe_storage_write(operation: str, size_bytes: int, seconds: float) -> None:
+    STORAGE_WRITE_BYTES.labels(operation).inc(size_bytes)
+    STORAGE_WRITE_DURATION.labels(operation).observe(seconds)
+    if seconds > 0:
+        STORAGE_WRITE_THROUGHPUT.labels(operation).observe(size_bytes / seconds)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Annotated, List, Literal, Optional
 
-from backend.db.common_models import ProjectLocation, Tag, empty_str_to_none
+from backend.db.common_models import DimensionSummary, ProjectLocation, Tag, empty_str_to_none
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
@@ -71,6 +71,8 @@ class AssetInDB(AssetBase):
 
     # Per-asset tag -> text status (for GPT-nano step)
     tag_text_state: AssetTagTextState = Field(default_factory=AssetTagTextState)
+    # Roll-up of the views' dimension summaries (build_dimension_summaries)
+    dimension_summary: Optional[DimensionSummary] = None
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -82,3 +84,4 @@ class AssetPublic(AssetBase):
     id: str
     uploaded_at: datetime
     updated_at: datetime
+    dimension_summary: Optional[DimensionSummary] = None
@@ -0,0 +1,28 @@
+#backend/db/bulk_models.py
+from __future__ import annotations
+from typing import List, Optional
+
+from backend.db.asset_models import AssetPublic
+from backend.db.view_models import ViewPublic
+from pydantic import BaseModel, Field
+
+
+class BulkViewError(BaseModel):
+    """
+    Problem with one view of a bulk submission; `index` is its position
+    in the submitted `views` list.
+    """
+    index: int
+    error: str
+
+
+class AssetWithViewsPublic(BaseModel):
+    asset: AssetPublic
+    views: List[ViewPublic] = Field(default_factory=list)
+    # Views whose files could not be stored; the rest were created.
+    errors: List[BulkViewError] = Field(default_factory=list)
+
+
+class BulkValidationErrorDetail(BaseModel):
+    asset_error: Optional[str] = None
+    view_errors: List[BulkViewError] = Field(default_factory=list)
@@ -0,0 +1,54 @@
+#backend/db/campaign_models.py
+from __future__ import annotations
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CampaignCreate(BaseModel):
+    """
+    A bulk reprocessing of existing views for a new extractor/rasterizer.
+
+    Views already stamped with `extractor_version` are skipped; the rest
+    (optionally narrowed to some assets / view types) are moved back to
+    "Pending Processing" in the bulk lane, `batch_size` at a time, at most
+    `rate_per_second` views per second and never more than `max_pending`
+    of this campaign's views waiting at once.
+    """
+    name: str = Field(min_length=1, max_length=100)
+    extractor_version: str = Field(min_length=1, max_length=100)
+    asset_ids: Optional[List[str]] = None
+    view_types: Optional[List[Literal["elevation", "plan", "section", "detail"]]] = None
+    batch_size: int = Field(500, ge=1, le=10_000)
+    rate_per_second: float = Field(50.0, gt=0)
+    max_pending: int = Field(5_000, ge=1)
+
+
+class CampaignProgress(BaseModel):
+    id: str
+    name: str
+    extractor_version: str
+    # Enqueueing state; "done" means every matching view has been enqueued.
+    state: Literal["created", "running", "paused", "cancelled", "done"]
+
+    total: int              # matching views when the campaign was created
+    enqueued: int           # views moved into the bulk lane so far
+    pending: int            # waiting in the bulk lane
+    processing: int
+    completed: int
+    failed: int
+    remaining: int          # not yet completed or failed
+    percent_done: float
+
+    # Completions per second since the first batch, and the ETA it implies.
+    throughput_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    eta_at: Optional[datetime] = None
+
+    status_counts: Dict[str, int] = Field(default_factory=dict)
+
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: datetime
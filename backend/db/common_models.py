@@ -1,6 +1,6 @@
 # backend/db/common_models.py
 from __future__ import annotations
-from typing import Annotated, Optional, Any
+from typing import Annotated, Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -23,7 +23,32 @@ class FileRef(BaseModel):
     rel_path: str
     content_type: str
     size_bytes: Optional[int] = None
-    checksum: Optional[str] = None # e.g. sha256
+    checksum: Optional[str] = None # sha256 hex digest of the file content
+
+
+class DerivativeRef(FileRef):
+    """
+    A file generated from another one (thumbnail, preview...). `source_checksum`
+    is the checksum of the source it was built from, so rebuilding is skipped
+    while the source is unchanged.
+    """
+    source_checksum: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class DimensionSummary(BaseModel):
+    """
+    Numeric summary of a view's dimensions in mm (backend/processing/dimensions.py).
+    On assets, the extents are the maximum over the asset's views.
+    """
+    width_mm: Optional[float] = None
+    height_mm: Optional[float] = None
+    depth_mm: Optional[float] = None
+    max_mm: Optional[float] = None
+    count: int = 0
+    histogram: List[int] = Field(default_factory=list)
+    bins: List[int] = Field(default_factory=list)
 
 
 class Tag(BaseModel):
@@ -42,3 +67,12 @@ class ProjectLocation(BaseModel):
     @classmethod
     def _empty_str_to_none(cls, v):
         return empty_str_to_none(v)
+
+
+class Page(BaseModel):
+    """
+    One page of a keyset-paginated listing. Items carry only the projected
+    fields; pass `next_cursor` back as `cursor` to get the next page.
+    """
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
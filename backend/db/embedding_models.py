@@ -24,6 +24,7 @@ class EmbeddingDoc(BaseModel):
 
     status: Literal[
         "Pending Processing",
+        "Processing",
         "Ready for Embedding",
         "Embedded",
         "Error"
@@ -29,6 +29,35 @@ def ensure_indexes(db: Database | None = None) -> None:
         name="tags_category_value_idx",
     )
 
+    # Keyset pagination for GET /assets: equality filter + _id order, and updated_at order
+    assets.create_index([("client_name", ASCENDING), ("_id", ASCENDING)], name="client_name_id_idx")
+    assets.create_index([("project_name", ASCENDING), ("_id", ASCENDING)], name="project_name_id_idx")
+    assets.create_index([("category", ASCENDING), ("_id", ASCENDING)], name="category_id_idx")
+    assets.create_index([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_id_idx")
+
+    # Equality filter + sort=updated_at: without these the plan is a blocking
+    # in-memory SORT over every match, or an updated_at scan that filters
+    for field in ("client_name", "project_name", "category"):
+        assets.create_index(
+            [(field, ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)],
+            name=f"{field}_updated_at_id_idx",
+        )
+    assets.create_index(
+        [("tags.category", ASCENDING), ("tags.value", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)],
+        name="tags_updated_at_id_idx",
+    )
+
+    # backfill_projects: one asset per imported source folder (resume upserts on it)
+    assets.create_index([("source_dir", ASCENDING)], name="source_dir_uniq", unique=True, sparse=True)
+
+    # Dimension range filters (dimension_summary roll-up): index range scans
+    for dim in ("width", "height", "depth", "max"):
+        assets.create_index(
+            [(f"dimension_summary.{dim}_mm", ASCENDING), ("_id", ASCENDING)],
+            name=f"dim_{dim}_id_idx",
+            sparse=True,
+        )
+
     # Optional: text index over tag text (when GPT-nano fills it later)
     assets.create_index(
         [("tag_text_state.tags_text", TEXT)],
@@ -45,6 +74,39 @@ def ensure_indexes(db: Database | None = None) -> None:
     # Processing queues: find views by status
     views.create_index([("status", ASCENDING)], name="status_idx")
 
+    # Job queue (backend/services/job_queue.py): claim order and expired-lease sweep
+    views.create_index([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_idx")
+    views.create_index([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_idx")
+    views.create_index(
+        [("status", ASCENDING), ("lane", ASCENDING), ("next_attempt_at", ASCENDING)],
+        name="status_lane_next_attempt_idx",
+    )
+
+    # Reprocessing campaigns: per-campaign progress counts
+    views.create_index([("campaign_id", ASCENDING), ("status", ASCENDING)], name="campaign_status_idx", sparse=True)
+
+    # PDF metadata extractor: views with a PDF, scanned in _id order
+    views.create_index(
+        [("files.pdf.rel_path", ASCENDING), ("_id", ASCENDING)],
+        name="pdf_rel_path_id_idx",
+        sparse=True,
+    )
+
+    # Keyset pagination for GET /assets/{asset_id}/views
+    views.create_index([("asset_id", ASCENDING), ("_id", ASCENDING)], name="asset_id_id_idx")
+    views.create_index(
+        [("asset_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)],
+        name="asset_id_updated_at_id_idx",
+    )
+
+    # Dimension range filters within an asset, and corpus-wide by histogram bin
+    for dim in ("width", "height", "depth", "max"):
+        views.create_index(
+            [("asset_id", ASCENDING), (f"dimension_summary.{dim}_mm", ASCENDING), ("_id", ASCENDING)],
+            name=f"asset_dim_{dim}_id_idx",
+        )
+    views.create_index([("dimension_summary.bins", ASCENDING)], name="dim_bins_idx", sparse=True)
+
     # Combined: all pending views for a given asset (CAD worker, ML, etc.)
     views.create_index(
         [("asset_id", ASCENDING), ("status", ASCENDING)],
@@ -76,3 +138,29 @@ def ensure_indexes(db: Database | None = None) -> None:
         [("status", ASCENDING), ("model_version", ASCENDING)],
         name="emb_status_model_idx",
     )
+
+    # Job queue claims per model and expired-lease sweep
+    embeddings.create_index(
+        [("status", ASCENDING), ("model_version", ASCENDING), ("next_attempt_at", ASCENDING)],
+        name="emb_status_model_next_attempt_idx",
+    )
+    embeddings.create_index(
+        [("status", ASCENDING), ("lease_expires_at", ASCENDING)],
+        name="emb_status_lease_idx",
+    )
+    embeddings.create_index(
+        [("status", ASCENDING), ("model_version", ASCENDING), ("lane", ASCENDING), ("next_attempt_at", ASCENDING)],
+        name="emb_status_model_lane_next_attempt_idx",
+    )
+
+    # Retrieval delta segment: tail of a model's docs in (updated_at, _id) order
+    embeddings.create_index(
+        [("model_version", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)],
+        name="emb_model_updated_idx",
+    )
+
+    # --- upload_sessions collection (resumable uploads) ---
+    upload_sessions = db["upload_sessions"]
+
+    # Garbage collection of stale sessions
+    upload_sessions.create_index([("updated_at", ASCENDING)], name="upload_updated_at_idx")
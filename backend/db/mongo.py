@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Generator, Optional
 
 from backend.core.config import settings
+from backend.db.mongo_monitoring import CommandMetricsListener, PoolMetricsListener
 from pymongo import MongoClient
 from pymongo.database import Database
 
@@ -14,7 +15,10 @@ _db: Optional[Database] = None
 def get_client() -> MongoClient:
     global _client
     if _client is None:
-        _client = MongoClient(settings.mongo_uri)
+        _client = MongoClient(
+            settings.mongo_uri,
+            event_listeners=[CommandMetricsListener(), PoolMetricsListener()],
+        )
     return _client
 
 
@@ -0,0 +1,49 @@
+#backend/db/upload_models.py
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from backend.db.view_models import ViewCreate
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    """
+    Opens a resumable upload for one view file.
+    """
+    asset_id: str
+    kind: Literal["sketch", "cad"]
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    total_size: int = Field(gt=0)
+
+
+class UploadSessionPublic(BaseModel):
+    id: str
+    asset_id: str
+    kind: Literal["sketch", "cad"]
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    total_size: int
+
+    # Contiguous bytes from offset 0; a client resumes from here.
+    committed_offset: int
+    # Merged [start, end) ranges received so far (chunks may arrive out of order).
+    received_ranges: List[List[int]] = Field(default_factory=list)
+
+    # open -> finalizing (claimed by one finalize request) -> finalized, or
+    # failed when finalizing broke after the partial file was moved.
+    status: Literal["open", "finalizing", "finalized", "failed"]
+    view_id: Optional[str] = None
+
+    created_at: datetime
+    updated_at: datetime
+
+
+class ViewFromUploads(BaseModel):
+    """
+    Finalizes one or two completed upload sessions into a new view.
+    """
+    view: ViewCreate
+    sketch_upload_id: Optional[str] = None
+    cad_upload_id: Optional[str] = None
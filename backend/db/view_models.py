@@ -1,9 +1,9 @@
 #backend/db/view_models.py
 from __future__ import annotations
 from datetime import datetime
-from typing import Annotated, Literal, Optional
+from typing import Annotated, Dict, Literal, Optional
 
-from backend.db.common_models import FileRef, empty_str_to_none
+from backend.db.common_models import DerivativeRef, DimensionSummary, FileRef, empty_str_to_none
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
@@ -15,8 +15,11 @@ ViewDescription = Annotated[str, Field(min_length=1, max_length=256)]
 class ViewFiles(BaseModel):
     sketch: Optional[FileRef] = None
     cad: Optional[FileRef] = None
+    pdf: Optional[FileRef] = None  # PDF exported from the DWG by the CAD worker
     raster: Optional[FileRef] = None
     metadata: Optional[FileRef] = None
+    # "{source}_{size}" -> derivative, e.g. "sketch_thumb", "raster_preview"
+    thumbs: Dict[str, DerivativeRef] = Field(default_factory=dict)
 
 
 class ViewBase(BaseModel):
@@ -52,11 +55,16 @@ class ViewInDB(ViewBase):
 
     status: Literal[
         "Pending Processing",
+        "Processing",
         "Ready for Embedding",
         "Embedded",
         "Error"
     ] = "Pending Processing"
     last_processing_error: Optional[str] = None
+    # Version of the extractor that last processed this view (set by the CAD
+    # worker on completion); reprocessing campaigns target views without it.
+    extractor_version: Optional[str] = None
+    dimension_summary: Optional[DimensionSummary] = None
 
     created_at: datetime
     updated_at: datetime
@@ -68,5 +76,6 @@ class ViewPublic(ViewBase):
     id: str
     status: str
     last_processing_error: Optional[str] = None
+    dimension_summary: Optional[DimensionSummary] = None
     created_at: datetime
     updated_at: datetime
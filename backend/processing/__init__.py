@@ -0,0 +1,3 @@
+"""
+Linux-side drawing processing.
+"""
@@ -0,0 +1,168 @@
+#backend/processing/dimensions.py
+"""
+Dimension strings -> millimetres, and per-view dimension summaries.
+
+`parse_dimensions` converts a whole column of strings in one call: the
+pattern is matched by Arrow's RE2 kernel (pyarrow.compute.extract_regex)
+and the feet/inch/fraction/metric groups are combined with numpy, so there
+is no per-string Python work. Accepted forms (whole string, whitespace
+ignored):
+
+    1'-6"   3'-8 3/4"   5'   5'6"   8 3/4"   3/4"   18"      imperial
+    2800    2800mm   280 cm   2.8 m   1800.5                  metric
+
+Plain numbers use `default_unit` (mm). Anything else is NaN.
+
+`summarize_views` turns the dimension spans of many views (PDF text with
+bounding boxes, plus DWG `Measurement` values) into a compact
+`views.dimension_summary`:
+
+    width_mm / height_mm / depth_mm   largest horizontal / vertical dimension,
+                                      mapped to axes by view_type
+    max_mm, count                     over all parsed values
+    histogram                         counts per HISTOGRAM_EDGES_MM bin
+    bins                              indices of non-empty bins (multikey-indexable)
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+MM_PER_UNIT = {"mm": 1.0, "cm": 10.0, "m": 1000.0, "in": 25.4, "ft": 304.8}
+
+# Upper edges in mm; the last bin is open-ended.
+HISTOGRAM_EDGES_MM = (50, 100, 200, 300, 450, 600, 900, 1200, 1800, 2400, 3000)
+
+_NUM = r"\d+(?:\.\d+)?"
+DIMENSION_PATTERN = (
+    r"(?i)^\s*(?:"
+    rf"(?P<ft>{_NUM})\s*['′]\s*-?\s*(?:(?P<ft_in>{_NUM})?\s*(?:(?P<ft_num>\d+)/(?P<ft_den>\d+))?\s*[\"″]?)?"
+    r"|"
+    rf"(?P<inch>{_NUM})?\s*(?:(?P<in_num>\d+)/(?P<in_den>\d+))?\s*[\"″]"
+    r"|"
+    rf"(?P<metric>{_NUM})\s*(?P<unit>mm|cm|m)?"
+    r")\s*$"
+)
+
+# view_type -> axis measured by (horizontal, vertical) dimensions
+VIEW_AXES = {
+    "elevation": ("width", "height"),
+    "plan": ("width", "depth"),
+    "section": ("depth", "height"),
+    "detail": ("width", "height"),
+}
+
+
+def _group(groups: pa.StructArray, name: str) -> np.ndarray:
+    # Unmatched optional groups come back as "", unmatched rows as null.
+    col = pc.if_else(pc.equal(groups.field(name), ""), None, groups.field(name))
+    return pc.cast(col, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def parse_dimensions(texts: Iterable[Optional[str]], default_unit: str = "mm") -> np.ndarray:
+    """
+    Millimetre value per input string (NaN when it is not a dimension).
+    """
+    arr = texts if isinstance(texts, (pa.Array, pa.ChunkedArray)) else pa.array(list(texts), type=pa.string())
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if arr.type != pa.string():
+        arr = pc.cast(arr, pa.string())
+    if len(arr) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    groups = pc.extract_regex(arr, DIMENSION_PATTERN)
+    if isinstance(groups, pa.ChunkedArray):
+        groups = groups.combine_chunks()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ft = _group(groups, "ft")
+        imperial_ft = (
+            ft * MM_PER_UNIT["ft"]
+            + np.nan_to_num(_group(groups, "ft_in")) * MM_PER_UNIT["in"]
+            + np.nan_to_num(_group(groups, "ft_num") / _group(groups, "ft_den")) * MM_PER_UNIT["in"]
+        )
+
+        inch = _group(groups, "inch")
+        frac = _group(groups, "in_num") / _group(groups, "in_den")
+        imperial_in = (np.nan_to_num(inch) + np.nan_to_num(frac)) * MM_PER_UNIT["in"]
+        imperial_in[np.isnan(inch) & np.isnan(frac)] = np.nan
+
+        unit = pc.utf8_lower(groups.field("unit"))
+        scale = np.full(len(arr), MM_PER_UNIT[default_unit])
+        for name in ("mm", "cm", "m"):
+            scale[pc.fill_null(pc.equal(unit, name), False).to_numpy(zero_copy_only=False)] = MM_PER_UNIT[name]
+        metric = _group(groups, "metric") * scale
+
+    return np.where(~np.isnan(ft), imperial_ft, np.where(~np.isnan(imperial_in), imperial_in, metric))
+
+
+def histogram(values_mm: np.ndarray) -> List[int]:
+    values_mm = values_mm[~np.isnan(values_mm)]
+    return np.bincount(
+        np.searchsorted(HISTOGRAM_EDGES_MM, values_mm, side="right"),
+        minlength=len(HISTOGRAM_EDGES_MM) + 1,
+    ).tolist()
+
+
+def summarize(
+        values_mm: np.ndarray,
+        horizontal: np.ndarray,
+        oriented: np.ndarray,
+        view_type: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Summary of one view's dimensions. `horizontal` says whether each value
+    runs along x; only `oriented` values (from text with a bbox) count
+    towards the axis extents.
+    """
+    valid = ~np.isnan(values_mm) & (values_mm > 0)
+    if not valid.any():
+        return None
+    values_mm, horizontal, oriented = values_mm[valid], horizontal[valid], oriented[valid]
+
+    summary: Dict[str, Any] = {"width_mm": None, "height_mm": None, "depth_mm": None}
+    h_axis, v_axis = VIEW_AXES.get(view_type or "", VIEW_AXES["detail"])
+    for axis, mask in ((h_axis, oriented & horizontal), (v_axis, oriented & ~horizontal)):
+        if mask.any():
+            summary[f"{axis}_mm"] = round(float(values_mm[mask].max()), 1)
+
+    counts = histogram(values_mm)
+    summary.update(
+        max_mm=round(float(values_mm.max()), 1),
+        count=int(len(values_mm)),
+        histogram=counts,
+        bins=[i for i, c in enumerate(counts) if c],
+    )
+    return summary
+
+
+def summarize_views(
+        view_ids: Sequence[str],
+        values_mm: np.ndarray,
+        horizontal: np.ndarray,
+        oriented: np.ndarray,
+        view_types: Dict[str, Optional[str]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Group flat per-dimension arrays by view (one sort, no per-row Python)
+    and summarize each view.
+    """
+    ids = np.asarray(view_ids, dtype=object)
+    if len(ids) == 0:
+        return {}
+    order = np.argsort(ids, kind="stable")
+    ids, values_mm, horizontal, oriented = ids[order], values_mm[order], horizontal[order], oriented[order]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)]
+
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for start, end in zip(starts, ends):
+        view_id = ids[start]
+        summary = summarize(values_mm[start:end], horizontal[start:end], oriented[start:end], view_types.get(view_id))
+        if summary is not None:
+            summaries[view_id] = summary
+    return summaries
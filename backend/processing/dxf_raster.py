@@ -0,0 +1,183 @@
+#backend/processing/dxf_raster.py
+"""
+Headless DXF/DWG rasterization (ezdxf drawing add-on + matplotlib Agg).
+
+Replaces AutoCAD `_PNGOUT` for processed/raster/{asset_id}/{view_id}.png.
+DXF is read directly; DWG is converted through ezdxf's ODA File Converter
+add-on (odafc), which must be installed on the host. Which reader applies
+is decided by the file's signature, since uploads are stored as .dwg
+whatever they contain. Each drawing is one
+task on a process pool; workers write the PNG through their own
+FileSystemStorage and return the FileRef, and the parent records results
+with one bulk_write per batch (failures go to views.raster_error).
+"""
+from __future__ import annotations
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import io
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from backend.storage.filesystem import FileSystemStorage
+import ezdxf
+from ezdxf import bbox, units
+from ezdxf.addons import odafc
+from ezdxf.addons.drawing import Frontend, RenderContext
+from ezdxf.addons.drawing.config import BackgroundPolicy, ColorPolicy, Configuration
+import matplotlib
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+# Headless; pyplot (also imported by ezdxf's matplotlib backend) is only
+# imported inside render_png, after this.
+matplotlib.use("Agg")
+
+
+Extents = Tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class RasterOptions:
+    dpi: int = 150              # pixels per inch of drawing (unitless drawings count as mm)
+    max_px: int = 2048          # cap on the longest side of the output image
+    extents: Optional[Extents] = None  # (x0, y0, x1, y1) in drawing units; None = drawing extents
+    margin: float = 0.02        # fraction of the extents added on each side
+    monochrome: bool = True     # black linework on white, closest to the sketches
+
+
+def parse_extents(value: Optional[str]) -> Optional[Extents]:
+    if not value or value == "auto":
+        return None
+    x0, y0, x1, y1 = (float(v) for v in value.split(","))
+    return x0, y0, x1, y1
+
+
+def is_dwg(path: str | Path) -> bool:
+    """
+    DWG files start with their version tag ("AC1015", "AC1032", ...);
+    ASCII and binary DXF never do.
+    """
+    with open(path, "rb") as f:
+        head = f.read(6)
+    return head[:4] == b"AC10" and head[4:].isdigit()
+
+
+def load_drawing(path: str | Path) -> "ezdxf.document.Drawing":
+    path = Path(path)
+    if is_dwg(path):
+        if not odafc.is_installed():
+            raise RuntimeError("DWG input needs the ODA File Converter (ezdxf odafc add-on) on this host")
+        return odafc.readfile(str(path))
+    return ezdxf.readfile(str(path))
+
+
+def _drawing_extents(doc: Any, options: RasterOptions) -> Extents:
+    if options.extents is not None:
+        x0, y0, x1, y1 = options.extents
+    else:
+        box = bbox.extents(doc.modelspace(), fast=True)
+        if not box.has_data:
+            raise ValueError("Drawing has no model-space geometry")
+        (x0, y0, _), (x1, y1, _) = box.extmin, box.extmax
+    pad = max(x1 - x0, y1 - y0) * options.margin
+    return x0 - pad, y0 - pad, x1 + pad, y1 + pad
+
+
+def _inches_per_unit(doc: Any) -> float:
+    try:
+        return units.conversion_factor(doc.units or units.MM, units.IN)
+    except ValueError:
+        return units.conversion_factor(units.MM, units.IN)
+
+
+def render_png(doc: Any, options: RasterOptions) -> bytes:
+    from ezdxf.addons.drawing.matplotlib import MatplotlibBackend
+    import matplotlib.pyplot as plt
+
+    x0, y0, x1, y1 = _drawing_extents(doc, options)
+    width, height = max(x1 - x0, 1e-9), max(y1 - y0, 1e-9)
+    # Pixels per drawing unit at the requested DPI, reduced if the image would exceed max_px.
+    px_per_unit = min(_inches_per_unit(doc) * options.dpi, options.max_px / max(width, height))
+    fig = plt.figure(
+        figsize=(max(width * px_per_unit, 1) / options.dpi, max(height * px_per_unit, 1) / options.dpi),
+        dpi=options.dpi,
+    )
+    try:
+        ax = fig.add_axes((0, 0, 1, 1))
+        config = Configuration(
+            background_policy=BackgroundPolicy.WHITE,
+            color_policy=ColorPolicy.BLACK if options.monochrome else ColorPolicy.COLOR_SWAP_BW,
+        )
+        backend = MatplotlibBackend(ax, adjust_figure=False)
+        Frontend(RenderContext(doc), backend, config=config).draw_layout(doc.modelspace(), finalize=True)
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        ax.set_axis_off()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=options.dpi, facecolor="white")
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+_worker_storage: Optional[FileSystemStorage] = None
+
+
+def init_worker(base_dir: str, dedupe: bool) -> None:
+    global _worker_storage
+    _worker_storage = FileSystemStorage(base_dir, dedupe=dedupe)
+
+
+def rasterize_file(task: Tuple[str, str, RasterOptions]) -> Tuple[bool, Any]:
+    """
+    Pool task: (source rel_path, target rel_path, options) -> (ok, FileRef dict or error).
+    """
+    src_rel, dst_rel, options = task
+    try:
+        png = render_png(load_drawing(_worker_storage.abs_path(src_rel)), options)
+        writer = _worker_storage.open_writer(dst_rel, "image/png")
+        try:
+            writer.write(png)
+        except BaseException:
+            writer.abort()
+            raise
+        return True, writer.commit().model_dump()
+    except Exception as exc:
+        return False, f"{type(exc).__name__}: {exc}"
+
+
+def rasterize_batch(
+        db: Database,
+        storage: FileSystemStorage,
+        pool: Executor,
+        views: Iterable[dict],
+        options: RasterOptions,
+) -> Tuple[int, int]:
+    """
+    Rasterize `views` (documents with _id, asset_id, files.cad) on the pool
+    (created with `init_worker`) and record files.raster. Returns (ok, failed).
+    """
+    views = list(views)
+    tasks = [
+        (
+            view["files"]["cad"]["rel_path"],
+            storage.processed_rel_path("raster", view["asset_id"], str(view["_id"]), ".png"),
+            options,
+        )
+        for view in views
+    ]
+    now = datetime.now(timezone.utc)
+    ops = []
+    ok_count = 0
+    for view, (ok, result) in zip(views, pool.map(rasterize_file, tasks)):
+        if ok:
+            ok_count += 1
+            update: Dict[str, Any] = {"files.raster": result, "raster_error": None, "updated_at": now}
+        else:
+            update = {"raster_error": result, "updated_at": now}
+        ops.append(UpdateOne({"_id": view["_id"]}, {"$set": update}))
+    if ops:
+        db["views"].bulk_write(ops, ordered=False)
+    return ok_count, len(views) - ok_count
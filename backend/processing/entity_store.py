@@ -0,0 +1,257 @@
+#backend/processing/entity_store.py
+"""
+Corpus-wide columnar store for extracted CAD entities.
+
+Four Parquet tables, hive-partitioned by asset:
+
+    {root}/{table}/asset_id={asset_id}/part-{run_id}-{n}.parquet
+
+    layers        view_id, run_id, name, color, lineweight
+    block_counts  view_id, run_id, name, layer, count
+    texts         view_id, run_id, source, page, text, category, layer, x0, y0, x1, y1, size, font, region
+    dimensions    view_id, run_id, source, type, layer, measurement, text
+
+Rows come from the single-pass DWG extractor (cad_worker_windows
+extract_metadata output) and from the PDF metadata JSON
+(processed/metadata), which is where text bounding boxes come from.
+Writers append new part files; re-extracting a view appends rows under a
+newer run_id and `compact()` rewrites each partition into one file holding
+only the latest run per view (per view and source for texts/dimensions).
+Readers use pyarrow.dataset, so selecting columns skips the rest of each
+file and filters are pushed down to row groups and partitions (asset_id
+filters only open that asset's folder).
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import uuid
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    "layers": pa.schema([
+        ("view_id", pa.string()),
+        ("run_id", pa.string()),
+        ("name", pa.string()),
+        ("color", pa.int32()),
+        ("lineweight", pa.int32()),
+    ]),
+    "block_counts": pa.schema([
+        ("view_id", pa.string()),
+        ("run_id", pa.string()),
+        ("name", pa.string()),
+        ("layer", pa.string()),
+        ("count", pa.int32()),
+    ]),
+    "texts": pa.schema([
+        ("view_id", pa.string()),
+        ("run_id", pa.string()),
+        ("source", pa.dictionary(pa.int8(), pa.string())),    # "dwg" | "pdf"
+        ("page", pa.int16()),
+        ("text", pa.string()),
+        ("category", pa.dictionary(pa.int8(), pa.string())),
+        ("layer", pa.string()),
+        ("x0", pa.float32()),
+        ("y0", pa.float32()),
+        ("x1", pa.float32()),
+        ("y1", pa.float32()),
+        ("size", pa.float32()),
+        ("font", pa.dictionary(pa.int16(), pa.string())),
+        ("region", pa.int16()),      # index of the nearest view title on the page (pdf)
+    ]),
+    "dimensions": pa.schema([
+        ("view_id", pa.string()),
+        ("run_id", pa.string()),
+        ("source", pa.dictionary(pa.int8(), pa.string())),
+        ("type", pa.dictionary(pa.int8(), pa.string())),
+        ("layer", pa.string()),
+        ("measurement", pa.float64()),
+        ("text", pa.string()),
+    ]),
+}
+TABLES = tuple(SCHEMAS)
+PARTITIONING = ds.partitioning(pa.schema([("asset_id", pa.string())]), flavor="hive")
+
+Filter = Union[pc.Expression, List[Any], None]
+
+
+def new_run_id() -> str:
+    # Sorts by time, so "latest run" is a plain max().
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+
+def latest_runs(data: pa.Table) -> pa.Table:
+    """
+    Keep only the rows of each view's latest run_id (needs view_id and run_id
+    columns). Tables with a `source` column keep the latest run per
+    (view_id, source), so a PDF-only run does not drop the view's DWG rows.
+    Selection goes through string keys and `is_in` rather than a join, since
+    joins cannot unify the differing dictionaries of separate part files.
+    """
+    parts = [pc.fill_null(data.column("view_id"), "")]
+    if "source" in data.column_names:
+        parts.append(pc.fill_null(pc.cast(data.column("source"), pa.string()), ""))
+    group = pc.binary_join_element_wise(*parts, "\x1f")
+    latest = pa.table({"group": group, "run_id": data.column("run_id")}).group_by("group").aggregate([("run_id", "max")])
+    wanted = pc.binary_join_element_wise(latest.column("group"), latest.column("run_id_max"), "\x1f")
+    keys = pc.binary_join_element_wise(group, data.column("run_id"), "\x1f")
+    return data.filter(pc.is_in(keys, value_set=wanted))
+
+
+class EntityStoreWriter:
+    """
+    Buffers rows per table and appends them as Parquet part files.
+    """
+    def __init__(self, root: Union[str, Path], run_id: Optional[str] = None, max_rows: int = 500_000) -> None:
+        self.root = Path(root)
+        self.run_id = run_id or new_run_id()
+        self.max_rows = max_rows
+        self._rows: Dict[str, List[Dict[str, Any]]] = {name: [] for name in TABLES}
+        self._flushes = 0
+
+    def _add(self, table: str, asset_id: str, view_id: str, rows: Iterable[Dict[str, Any]]) -> None:
+        buf = self._rows[table]
+        for row in rows:
+            row.update(asset_id=asset_id, view_id=view_id, run_id=self.run_id)
+            buf.append(row)
+        if sum(len(b) for b in self._rows.values()) >= self.max_rows:
+            self.flush()
+
+    def add_extraction(self, asset_id: str, view_id: str, data: Dict[str, Any]) -> None:
+        """
+        Rows from an ExtractionEngine result (layers, block_counts, texts, dimensions).
+        """
+        self._add("layers", asset_id, view_id, (
+            {"name": r.get("name"), "color": r.get("color"), "lineweight": r.get("lineweight")}
+            for r in data.get("layers", [])
+        ))
+        self._add("block_counts", asset_id, view_id, (
+            {"name": r.get("name"), "layer": r.get("layer"), "count": r.get("count")}
+            for r in data.get("block_counts", [])
+        ))
+        self._add("texts", asset_id, view_id, (
+            {"source": "dwg", "text": r.get("text"), "layer": r.get("layer"), "category": r.get("type", "").lower()}
+            for r in data.get("texts", [])
+        ))
+        self._add("dimensions", asset_id, view_id, (
+            {"source": "dwg", "type": r.get("type"), "layer": r.get("layer"), "measurement": r.get("measurement")}
+            for r in data.get("dimensions", [])
+        ))
+
+    def add_pdf_metadata(self, asset_id: str, view_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Rows from a processed/metadata PDF JSON: every span becomes a text row
+        with its bbox; dimension-like spans also become dimension rows.
+        """
+        texts = []
+        dims = []
+        for page in metadata.get("pages", []):
+            for span in page.get("spans", []):
+                x0, y0, x1, y1 = (span.get("bbox") or (None,) * 4)[:4]
+                texts.append({
+                    "source": "pdf",
+                    "page": page.get("page_number"),
+                    "text": span.get("text"),
+                    "category": span.get("category"),
+                    "x0": x0, "y0": y0, "x1": x1, "y1": y1,
+                    "size": span.get("size"),
+                    "font": span.get("font"),
+                    "region": span.get("region"),
+                })
+                if span.get("category") == "dimension":
+                    dims.append({"source": "pdf", "type": "text", "text": span.get("text")})
+        self._add("texts", asset_id, view_id, texts)
+        self._add("dimensions", asset_id, view_id, dims)
+
+    def flush(self) -> None:
+        for name, rows in self._rows.items():
+            if not rows:
+                continue
+            schema = SCHEMAS[name].append(pa.field("asset_id", pa.string()))
+            table = pa.Table.from_pylist(rows, schema=schema)
+            ds.write_dataset(
+                table,
+                self.root / name,
+                format="parquet",
+                partitioning=PARTITIONING,
+                basename_template=f"part-{self.run_id}-{self._flushes}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            rows.clear()
+        self._flushes += 1
+
+    def close(self) -> None:
+        self.flush()
+
+
+class EntityStore:
+    """
+    Reader over the store. `columns` prunes columns; `filter` is either a
+    pyarrow.compute expression or a pq-style DNF list such as
+    [("category", "=", "view_title"), ("asset_id", "in", ids)].
+    """
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+
+    def dataset(self, table: str) -> ds.Dataset:
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(TABLES)}")
+        schema = SCHEMAS[table].append(pa.field("asset_id", pa.string()))
+        path = self.root / table
+        if not path.exists():
+            return ds.dataset(pa.Table.from_pylist([], schema=schema))
+        return ds.dataset(path, format="parquet", partitioning=PARTITIONING, schema=schema)
+
+    @staticmethod
+    def _expression(filter: Filter) -> Optional[pc.Expression]:
+        if filter is None or isinstance(filter, pc.Expression):
+            return filter
+        return pq.filters_to_expression(filter)
+
+    def read(self, table: str, columns: Optional[Sequence[str]] = None, filter: Filter = None) -> pa.Table:
+        return self.dataset(table).to_table(columns=list(columns) if columns else None, filter=self._expression(filter))
+
+    def read_latest(self, table: str, columns: Optional[Sequence[str]] = None, filter: Filter = None) -> pa.Table:
+        """
+        Like `read`, but only each view's latest run (for stores not yet compacted).
+        """
+        if columns:
+            extra = ["view_id", "run_id"] + (["source"] if "source" in SCHEMAS[table].names else [])
+            columns = list(dict.fromkeys([*columns, *extra]))
+        return latest_runs(self.read(table, columns, filter))
+
+    def scan_batches(self, table: str, columns: Optional[Sequence[str]] = None, filter: Filter = None):
+        """
+        Stream record batches instead of materializing the whole result.
+        """
+        return self.dataset(table).to_batches(columns=list(columns) if columns else None, filter=self._expression(filter))
+
+    def compact(self, table: str) -> int:
+        """
+        Rewrite every partition with more than one file into a single file
+        holding only the latest run per view (and source, where the table has
+        one). Returns partitions rewritten.
+        """
+        base = self.root / table
+        if not base.exists():
+            return 0
+        rewritten = 0
+        for part_dir in sorted(p for p in base.iterdir() if p.is_dir()):
+            files = sorted(part_dir.glob("*.parquet"))
+            if len(files) < 2:
+                continue
+            data = latest_runs(pq.read_table(files, schema=SCHEMAS[table]))
+
+            target = part_dir / f"part-compacted-{new_run_id()}.parquet"
+            tmp = target.with_suffix(".tmp")
+            pq.write_table(data.cast(SCHEMAS[table]), tmp)
+            tmp.replace(target)
+            for f in files:
+                f.unlink()
+            rewritten += 1
+        return rewritten
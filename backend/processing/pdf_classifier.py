@@ -0,0 +1,38 @@
+#backend/processing/pdf_classifier.py
+"""
+Span classifier for drawing PDFs exported from DWG.
+
+Same rules as cad_worker_windows/debug/debug_introspect_pdf.py, with every
+pattern and keyword list compiled once at import so classifying a span is
+one strip/upper and at most a handful of compiled-regex calls.
+"""
+from __future__ import annotations
+import re
+
+
+VIEW_TITLE_RE = re.compile(r"WALK-IN CLOSET DETAIL|WARDROBE DETAIL|^SCALE:.*DETAIL")
+COMPONENT_RE = re.compile(r"SAFE|DRAWER|LEDGE|HANG ROD|IRON BOARD|METAL LUGGAGE|CLOSET|UNIT")
+# Feet/inches (1'-6", 3'-8 3/4", 11"), decimals, or bare numeric strings (2800, 1 - 6).
+DIMENSION_RE = re.compile(r"\d+'-\d+\"|\d+'\s*-\s*\d+\s*\d*/\d+\"|\d+\"|\d+\.\d+|\d+'-\d+")
+NUMERIC_RE = re.compile(r"[0-9\-\s'/\.]+")
+# Hardware/material codes: HD 214, WD-201, PT-309 ...
+CODE_RE = re.compile(r"[A-Z]{2,3}[- ]?\d{2,4}")
+
+CATEGORIES = ("view_title", "component_label", "dimension", "code", "other_text")
+
+
+def classify_span(text: str) -> str:
+    t = text.strip()
+    if not t:
+        return "empty"
+
+    upper = t.upper()
+    if VIEW_TITLE_RE.search(upper):
+        return "view_title"
+    if upper == t and len(t) <= 40 and COMPONENT_RE.search(upper):
+        return "component_label"
+    if DIMENSION_RE.search(t) or NUMERIC_RE.fullmatch(t):
+        return "dimension"
+    if CODE_RE.fullmatch(upper):
+        return "code"
+    return "other_text"
@@ -0,0 +1,222 @@
+#backend/processing/pdf_metadata.py
+"""
+Parallel drawing-metadata extraction from view PDFs.
+
+Every page of every PDF in a batch is one task on a process pool. Workers
+extract text spans with PyMuPDF, classify them (pdf_classifier) and return
+the page already serialized, so the parent only streams bytes into
+processed/metadata/{asset_id}/{view_id}.json through a StorageWriter and
+never holds a whole document in memory. The resulting FileRefs are written
+back to views.files.metadata with one bulk_write per batch; failures are
+recorded in views.metadata_error (kept apart from the CAD worker's
+last_processing_error).
+
+Output layout:
+
+    {"asset_id": ..., "view_id": ..., "source": "raw/pdf/...", "page_count": n,
+     "pages": [{"page_number", "page_width", "page_height", "spans": [...], "regions": [...]}, ...],
+     "summary": {"category_counts": {...}, "view_titles": [...]}}
+
+Each page is split into per-view regions (spatial.assign_regions): every
+span carries "region", the index into the page's "regions" list
+({"title", "bbox", "category_counts"}) of its nearest view title.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.db.common_models import FileRef
+from backend.processing.pdf_classifier import classify_span
+from backend.processing.spatial import assign_regions
+from backend.storage.base import StorageWriter
+from backend.storage.filesystem import FileSystemStorage
+import fitz  # PyMuPDF
+import orjson
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+EXTRACTOR_VERSION = "pdf_metadata/2"
+# Text only: skip decoding embedded images, which get_text("dict") does by default.
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+MAX_OPEN_DOCS = 4
+
+# (absolute pdf path, page number)
+PageTask = Tuple[str, int]
+# (ok, serialized page or error message, category counts, view titles)
+PageResult = Tuple[bool, bytes, Dict[str, int], List[str]]
+
+# path -> ((st_mtime_ns, st_size), document)
+_open_docs: "OrderedDict[str, Tuple[Tuple[int, int], fitz.Document]]" = OrderedDict()
+
+
+def _open_doc(path: str) -> "fitz.Document":
+    """
+    Per-process cache of open documents, so a PDF is parsed once per worker
+    rather than once per page. Entries are keyed on the file's mtime and size
+    as well as its path: a re-exported PDF replaces the file under the same
+    name, and the old handle would keep reading the previous inode.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _open_docs.get(path)
+    if cached is not None and cached[0] == stamp:
+        _open_docs.move_to_end(path)
+        return cached[1]
+    if cached is not None:
+        del _open_docs[path]
+        cached[1].close()
+    doc = fitz.open(path)
+    _open_docs[path] = (stamp, doc)
+    if len(_open_docs) > MAX_OPEN_DOCS:
+        _open_docs.popitem(last=False)[1][1].close()
+    return doc
+
+
+def extract_page(task: PageTask) -> PageResult:
+    path, page_number = task
+    try:
+        page = _open_doc(path)[page_number]
+        raw = page.get_text("dict", flags=TEXT_FLAGS)
+    except Exception as exc:
+        return False, f"{type(exc).__name__}: {exc}".encode("utf-8"), {}, []
+
+    spans = []
+    counts: Dict[str, int] = {}
+    titles: List[str] = []
+    for bi, block in enumerate(raw.get("blocks", [])):
+        if block.get("type", 0) != 0:
+            continue
+        for li, line in enumerate(block.get("lines", [])):
+            for si, span in enumerate(line.get("spans", [])):
+                text = span.get("text", "").strip()
+                if not text:
+                    continue
+                category = classify_span(text)
+                counts[category] = counts.get(category, 0) + 1
+                if category == "view_title":
+                    titles.append(text)
+                spans.append({
+                    "text": text,
+                    "bbox": [round(v, 2) for v in span.get("bbox", ())],
+                    "size": span.get("size"),
+                    "font": span.get("font"),
+                    "block_index": bi,
+                    "line_index": li,
+                    "span_index": si,
+                    "category": category,
+                })
+
+    page_data = {
+        "page_number": page_number,
+        "page_width": page.rect.width,
+        "page_height": page.rect.height,
+        "spans": spans,
+        "regions": assign_regions(spans),
+    }
+    return True, orjson.dumps(page_data), counts, titles
+
+
+class MetadataStream:
+    """
+    Writes one view's metadata JSON incrementally, page by page.
+    """
+    def __init__(self, writer: StorageWriter, view: dict, page_count: int) -> None:
+        self.writer = writer
+        self.pages_written = 0
+        self.counts: Dict[str, int] = {}
+        self.titles: List[str] = []
+        header = orjson.dumps({
+            "asset_id": view["asset_id"],
+            "view_id": str(view["_id"]),
+            "source": view["files"]["pdf"]["rel_path"],
+            "extractor": EXTRACTOR_VERSION,
+            "page_count": page_count,
+        })
+        # Re-open the header object so pages can be appended to it.
+        writer.write(header[:-1] + b',"pages":[')
+
+    def add_page(self, page_json: bytes, counts: Dict[str, int], titles: List[str]) -> None:
+        if self.pages_written:
+            self.writer.write(b",")
+        self.writer.write(page_json)
+        self.pages_written += 1
+        for category, n in counts.items():
+            self.counts[category] = self.counts.get(category, 0) + n
+        self.titles.extend(titles)
+
+    def finish(self) -> FileRef:
+        summary = orjson.dumps({"category_counts": self.counts, "view_titles": self.titles})
+        self.writer.write(b'],"summary":' + summary + b"}")
+        return self.writer.commit()
+
+
+def _page_count(path: str) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def extract_batch(
+        db: Database,
+        storage: FileSystemStorage,
+        pool: Executor,
+        views: Iterable[dict],
+) -> Tuple[int, int, int]:
+    """
+    Extract metadata for `views` (documents with _id, asset_id, files.pdf)
+    and record the results. Returns (views ok, views failed, pages).
+    """
+    plan: List[Tuple[dict, int]] = []
+    failed: Dict[object, str] = {}
+    for view in views:
+        try:
+            plan.append((view, _page_count(str(storage.abs_path(view["files"]["pdf"]["rel_path"])))))
+        except Exception as exc:
+            failed[view["_id"]] = f"PDF open failed: {type(exc).__name__}: {exc}"
+
+    tasks: List[PageTask] = [
+        (str(storage.abs_path(view["files"]["pdf"]["rel_path"])), page_number)
+        for view, page_count in plan
+        for page_number in range(page_count)
+    ]
+    results = pool.map(extract_page, tasks, chunksize=1)
+
+    refs: Dict[object, FileRef] = {}
+    pages = 0
+    for view, page_count in plan:
+        rel_path = storage.processed_rel_path("metadata", view["asset_id"], str(view["_id"]), ".json")
+        stream: Optional[MetadataStream] = MetadataStream(
+            storage.open_writer(rel_path, "application/json"), view, page_count
+        )
+        for _ in range(page_count):
+            ok, payload, counts, titles = next(results)
+            pages += 1
+            if stream is None:
+                continue
+            if ok:
+                stream.add_page(payload, counts, titles)
+            else:
+                stream.writer.abort()
+                stream = None
+                failed[view["_id"]] = f"Page extraction failed: {payload.decode('utf-8')}"
+        if stream is not None:
+            refs[view["_id"]] = stream.finish()
+
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"_id": view_id},
+            {"$set": {"files.metadata": ref.model_dump(), "metadata_error": None, "updated_at": now}},
+        )
+        for view_id, ref in refs.items()
+    ]
+    ops.extend(
+        UpdateOne({"_id": view_id}, {"$set": {"metadata_error": error, "updated_at": now}})
+        for view_id, error in failed.items()
+    )
+    if ops:
+        db["views"].bulk_write(ops, ordered=False)
+    return len(refs), len(failed), pages
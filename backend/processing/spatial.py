@@ -0,0 +1,192 @@
+#backend/processing/spatial.py
+"""
+Uniform-grid spatial index over text-span bounding boxes (one per page).
+
+Page text is spread fairly evenly over the sheet, so a uniform grid sized
+for a few spans per cell gives near-constant window and nearest-neighbour
+queries without an R-tree dependency. Boxes are stored once as an (n, 4)
+float array (x0, y0, x1, y1); each cell lists the ids of the boxes that
+overlap it.
+
+`assign_regions` splits a sheet into per-view regions by attaching every
+span to its nearest view title, so label/dimension to view association is
+linear in the number of spans instead of comparing every span with every
+other. Sheets have few titles, so that is normally one vectorized
+span x title distance matrix; the grid takes over when titles are many.
+"""
+from __future__ import annotations
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+BBox = Sequence[float]
+
+
+def point_to_boxes(x: float, y: float, boxes: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distance from (x, y) to each box (0 inside the box).
+    """
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0.0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0.0)
+    return np.hypot(dx, dy)
+
+
+class SpanGrid:
+    """
+    Grid index over boxes. `cell_size` defaults to a size that puts about
+    `per_cell` boxes in each cell, and never below longest side / sqrt(n)
+    so flat or point-like extents (collinear or zero-height boxes) still
+    get a grid of about sqrt(n) x sqrt(n) cells at most.
+    """
+    def __init__(self, boxes: Iterable[BBox], cell_size: Optional[float] = None, per_cell: float = 4.0) -> None:
+        self.boxes = np.asarray(list(boxes), dtype=np.float64).reshape(-1, 4)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        n = len(self.boxes)
+        if n == 0:
+            self.origin = (0.0, 0.0)
+            self.cell_size = cell_size or 1.0
+            self.shape = (0, 0)
+            return
+
+        x0, y0 = self.boxes[:, 0].min(), self.boxes[:, 1].min()
+        x1, y1 = self.boxes[:, 2].max(), self.boxes[:, 3].max()
+        if cell_size is None:
+            side = max(x1 - x0, y1 - y0)
+            cell_size = max(math.sqrt((x1 - x0) * (y1 - y0) * per_cell / n), side / math.sqrt(n)) if side > 0 else 1.0
+        self.origin = (float(x0), float(y0))
+        self.cell_size = max(float(cell_size), 1e-9)
+        self.shape = (self._cell(x1, 0), self._cell(y1, 1))
+
+        first = np.floor((self.boxes[:, :2] - self.origin) / self.cell_size).astype(np.int64)
+        last = np.floor((self.boxes[:, 2:] - self.origin) / self.cell_size).astype(np.int64)
+        for i, (cx0, cy0), (cx1, cy1) in zip(range(n), first.tolist(), last.tolist()):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    @classmethod
+    def from_spans(cls, spans: Iterable[Dict[str, Any]], **kwargs: Any) -> "SpanGrid":
+        return cls((s["bbox"] for s in spans), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _cell(self, v: float, axis: int) -> int:
+        return int(math.floor((v - self.origin[axis]) / self.cell_size))
+
+    def _ids_in_cells(self, cx0: int, cy0: int, cx1: int, cy1: int) -> np.ndarray:
+        ids: List[int] = []
+        for cx in range(max(cx0, 0), min(cx1, self.shape[0]) + 1):
+            for cy in range(max(cy0, 0), min(cy1, self.shape[1]) + 1):
+                ids.extend(self.cells.get((cx, cy), ()))
+        return np.unique(np.asarray(ids, dtype=np.int64))
+
+    def window(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """
+        Ids of boxes intersecting the window, in id order.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        ids = self._ids_in_cells(self._cell(x0, 0), self._cell(y0, 1), self._cell(x1, 0), self._cell(y1, 1))
+        b = self.boxes[ids]
+        hit = (b[:, 0] <= x1) & (b[:, 2] >= x0) & (b[:, 1] <= y1) & (b[:, 3] >= y0)
+        return ids[hit]
+
+    def nearest(self, x: float, y: float, k: int = 1, max_distance: float = math.inf) -> List[Tuple[int, float]]:
+        """
+        Up to `k` (id, distance) pairs closest to (x, y), nearest first.
+
+        Rings of cells around the query are searched outwards; after ring r
+        every box within r cells of the query cell has been seen, so the
+        search stops once the k-th best distance is within that radius.
+        """
+        n = len(self)
+        if not n:
+            return []
+        k = min(k, n)
+        cx, cy = self._cell(x, 0), self._cell(y, 1)
+        # Rings needed to cover the whole grid from the query cell; a query
+        # far outside the grid would need many empty rings, so past about
+        # sqrt(n) rings (as many cells as a full scan has boxes) scan instead.
+        max_ring = max(abs(cx), abs(cy), abs(self.shape[0] - cx), abs(self.shape[1] - cy)) + 1
+        if max_ring > math.isqrt(n) + max(self.shape) + 1:
+            return self._nearest_scan(x, y, k, max_distance)
+        seen: Dict[int, float] = {}
+        for r in range(max_ring + 1):
+            ring: List[int] = []
+            for gx in range(cx - r, cx + r + 1):
+                for gy in (cy - r, cy + r) if r else (cy,):
+                    ring.extend(self.cells.get((gx, gy), ()))
+            for gy in range(cy - r + 1, cy + r):
+                for gx in (cx - r, cx + r) if r else ():
+                    ring.extend(self.cells.get((gx, gy), ()))
+            new = [i for i in set(ring) if i not in seen]
+            if new:
+                ids = np.asarray(new, dtype=np.int64)
+                for i, d in zip(new, point_to_boxes(x, y, self.boxes[ids]).tolist()):
+                    seen[i] = d
+            covered = r * self.cell_size  # everything closer than this has been seen
+            if len(seen) >= k:
+                best = sorted(seen.items(), key=lambda item: item[1])[:k]
+                if best[-1][1] <= covered or r == max_ring:
+                    return [(i, d) for i, d in best if d <= max_distance]
+            if covered > max_distance:
+                break
+        return [(i, d) for i, d in sorted(seen.items(), key=lambda item: item[1])[:k] if d <= max_distance]
+
+    def _nearest_scan(self, x: float, y: float, k: int, max_distance: float) -> List[Tuple[int, float]]:
+        dist = point_to_boxes(x, y, self.boxes)
+        order = np.argsort(dist, kind="stable")[:k]
+        return [(int(i), float(dist[i])) for i in order if dist[i] <= max_distance]
+
+
+# Above this many span x title pairs, titles are looked up through a grid
+# instead of one dense distance matrix.
+DENSE_PAIRS = 2_000_000
+
+
+def assign_regions(spans: List[Dict[str, Any]], title_category: str = "view_title") -> List[Dict[str, Any]]:
+    """
+    Attach every span to its nearest view title: sets span["region"] to the
+    region index (None when the page has no titles) and returns the regions
+    as [{"title", "bbox", "category_counts"}], bbox being the union of the
+    region's spans.
+    """
+    has_box = np.fromiter((len(s.get("bbox") or ()) == 4 for s in spans), dtype=bool, count=len(spans))
+    title_ids = [i for i, s in enumerate(spans) if has_box[i] and s.get("category") == title_category]
+    for span in spans:
+        span["region"] = None
+    if not title_ids:
+        return []
+
+    idx = np.flatnonzero(has_box)
+    boxes = np.asarray([spans[i]["bbox"] for i in idx], dtype=np.float64)
+    cx, cy = (boxes[:, 0] + boxes[:, 2]) / 2.0, (boxes[:, 1] + boxes[:, 3]) / 2.0
+    titles = np.asarray([spans[i]["bbox"] for i in title_ids], dtype=np.float64)
+
+    if len(idx) * len(titles) <= DENSE_PAIRS:
+        # Few titles per sheet: one vectorized span x title distance matrix.
+        dx = np.maximum(np.maximum(titles[None, :, 0] - cx[:, None], cx[:, None] - titles[None, :, 2]), 0.0)
+        dy = np.maximum(np.maximum(titles[None, :, 1] - cy[:, None], cy[:, None] - titles[None, :, 3]), 0.0)
+        nearest = np.argmin(dx * dx + dy * dy, axis=1)
+    else:
+        grid = SpanGrid(titles)
+        nearest = np.fromiter((grid.nearest(x, y)[0][0] for x, y in zip(cx, cy)), dtype=np.int64, count=len(idx))
+
+    lo = np.full((len(titles), 2), np.inf)
+    hi = np.full((len(titles), 2), -np.inf)
+    np.minimum.at(lo, nearest, boxes[:, :2])
+    np.maximum.at(hi, nearest, boxes[:, 2:])
+
+    regions: List[Dict[str, Any]] = [
+        {"title": spans[i]["text"], "bbox": [*lo[r].tolist(), *hi[r].tolist()], "category_counts": {}}
+        for r, i in enumerate(title_ids)
+    ]
+    for i, r in zip(idx.tolist(), nearest.tolist()):
+        span = spans[i]
+        span["region"] = r
+        counts = regions[r]["category_counts"]
+        counts[span.get("category")] = counts.get(span.get("category"), 0) + 1
+    return regions
@@ -0,0 +1,176 @@
+#backend/processing/thumbnails.py
+"""
+Fixed-size WebP derivatives of view sketches and rasters.
+
+For every source image (files.sketch, files.raster) three sizes are built:
+
+    thumb    longest side 256, lossy WebP        (result lists)
+    preview  longest side 1024, lossy WebP       (detail view)
+    model    224 x 224 letterboxed on white, lossless WebP  (encoder input)
+
+They live at processed/thumbs/{size}/{asset_id}/{view_id}_{source}.webp
+and are recorded in views.files.thumbs["{source}_{size}"] as DerivativeRefs
+carrying the source checksum; a derivative is only rebuilt when its
+source checksum changes. Each source image is one process-pool task that
+decodes the image once and produces all sizes from it.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import io
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.storage.base import StorageBackend
+from backend.storage.filesystem import FileSystemStorage
+from PIL import Image
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+@dataclass(frozen=True)
+class ThumbSize:
+    name: str
+    max_side: int
+    square: bool = False
+    lossless: bool = False
+    quality: int = 80
+
+
+SIZES = (
+    ThumbSize("preview", 1024),
+    ThumbSize("thumb", 256, quality=75),
+    ThumbSize("model", 224, square=True, lossless=True),
+)
+SOURCES = ("sketch", "raster")
+
+# (source rel_path, source checksum, asset_id, view_id, source kind, size names to build)
+ThumbTask = Tuple[str, str, str, str, str, Tuple[str, ...]]
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _resize(img: Image.Image, size: ThumbSize) -> Image.Image:
+    out = img.copy()
+    # reducing_gap: cheap integer downscale first, then a proper filter.
+    out.thumbnail((size.max_side, size.max_side), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    if size.square:
+        canvas = Image.new("RGB", (size.max_side, size.max_side), "white")
+        canvas.paste(out, ((size.max_side - out.width) // 2, (size.max_side - out.height) // 2))
+        out = canvas
+    return out
+
+
+def build_derivatives(img: Image.Image, sizes: Iterable[ThumbSize]) -> List[Tuple[ThumbSize, Image.Image]]:
+    """
+    Resize largest-first so each step works from the previous, smaller image.
+    """
+    results = []
+    current = _flatten(img)
+    for size in sorted(sizes, key=lambda s: s.max_side, reverse=True):
+        resized = _resize(current, size)
+        results.append((size, resized))
+        if not size.square:
+            current = resized
+    return results
+
+
+_worker_storage: Optional[FileSystemStorage] = None
+
+
+def init_worker(base_dir: str, dedupe: bool) -> None:
+    global _worker_storage
+    _worker_storage = FileSystemStorage(base_dir, dedupe=dedupe)
+
+
+def make_thumbs(task: ThumbTask) -> Tuple[bool, Any]:
+    """
+    Pool task -> (ok, {"{source}_{size}": DerivativeRef dict} or error message).
+    """
+    src_rel, checksum, asset_id, view_id, source, size_names = task
+    sizes = [s for s in SIZES if s.name in size_names]
+    try:
+        with Image.open(_worker_storage.abs_path(src_rel)) as img:
+            img.draft("RGB", (max(s.max_side for s in sizes),) * 2)  # JPEG: decode at reduced scale
+            derivatives = build_derivatives(img, sizes)
+
+        refs: Dict[str, Any] = {}
+        for size, out in derivatives:
+            buf = io.BytesIO()
+            out.save(buf, format="WEBP", quality=size.quality, lossless=size.lossless, method=4)
+            rel_path = StorageBackend.thumb_rel_path(size.name, source, asset_id, view_id)
+            writer = _worker_storage.open_writer(rel_path, "image/webp")
+            try:
+                writer.write(buf.getvalue())
+                ref = writer.commit().model_dump()
+            except BaseException:
+                writer.abort()
+                raise
+            ref.update(source_checksum=checksum, width=out.width, height=out.height)
+            refs[f"{source}_{size.name}"] = ref
+        return True, refs
+    except Exception as exc:
+        return False, f"{type(exc).__name__}: {exc}"
+
+
+def plan_view(view: dict, force: bool = False) -> List[ThumbTask]:
+    """
+    Tasks for the derivatives of `view` that are missing or stale.
+    """
+    files = view.get("files") or {}
+    thumbs = files.get("thumbs") or {}
+    tasks: List[ThumbTask] = []
+    for source in SOURCES:
+        ref = files.get(source)
+        if not ref or not ref.get("checksum"):
+            continue
+        stale = tuple(
+            size.name for size in SIZES
+            if force or (thumbs.get(f"{source}_{size.name}") or {}).get("source_checksum") != ref["checksum"]
+        )
+        if stale:
+            tasks.append((ref["rel_path"], ref["checksum"], view["asset_id"], str(view["_id"]), source, stale))
+    return tasks
+
+
+def thumbnail_batch(
+        db: Database,
+        pool: Executor,
+        views: Iterable[dict],
+        force: bool = False,
+) -> Tuple[int, int, int]:
+    """
+    Build missing/stale derivatives for `views` on the pool (created with
+    `init_worker`). Returns (derivatives written, sources failed, sources skipped).
+    """
+    planned: List[Tuple[Any, ThumbTask]] = []
+    skipped = 0
+    for view in views:
+        tasks = plan_view(view, force)
+        skipped += sum(1 for source in SOURCES if (view.get("files") or {}).get(source)) - len(tasks)
+        planned.extend((view["_id"], task) for task in tasks)
+
+    now = datetime.now(timezone.utc)
+    updates: Dict[Any, Dict[str, Any]] = {}
+    written = failed = 0
+    for (view_id, task), (ok, result) in zip(planned, pool.map(make_thumbs, [t for _, t in planned])):
+        update = updates.setdefault(view_id, {"updated_at": now})
+        if ok:
+            written += len(result)
+            update.update({f"files.thumbs.{key}": ref for key, ref in result.items()})
+            update[f"thumbs_error.{task[4]}"] = None
+        else:
+            failed += 1
+            update[f"thumbs_error.{task[4]}"] = result
+
+    ops = [UpdateOne({"_id": view_id}, {"$set": update}) for view_id, update in updates.items()]
+    if ops:
+        db["views"].bulk_write(ops, ordered=False)
+    return written, failed, skipped
@@ -1,30 +1,71 @@
 #backend/services/asset_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from bson import ObjectId
-from backend.db.asset_models import AssetCreate, AssetInDB, AssetPublic, AssetTagTextState
+from backend.core.config import settings
+from backend.db.asset_models import AssetCreate, AssetPublic, AssetTagTextState
 from pymongo.database import Database
+from backend.services import pagination
+from backend.services.cache import get_cache
 
 
-def create_asset(db: Database, payload: AssetCreate) -> AssetPublic:
-    now = datetime.now(timezone.utc)
+asset_cache = get_cache("assets", settings.cache_max_entries, settings.cache_ttl_seconds)
+# Positive existence checks only; a missing asset is never cached.
+asset_exists_cache = get_cache("asset_exists", settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+# Fields a caller may request from GET /assets
+ASSET_LIST_FIELDS = (
+    "client_name", "project_name", "category", "subcategory", "project_type",
+    "room_type", "style", "created_by", "uploaded_by", "studio", "location",
+    "tags", "uploaded_at", "updated_at", "tag_text_state", "dimension_summary",
+)
+# Heavy/internal fields left out unless explicitly requested
+ASSET_LIST_DEFAULT_EXCLUDE = ("tag_text_state",)
 
+
+def new_asset_doc(payload: AssetCreate, now: datetime) -> dict:
     doc = payload.model_dump()
     doc["uploaded_at"] = now
     doc["updated_at"] = now
     # Initialize tag_text_state for ML pipeline
     doc["tag_text_state"] = AssetTagTextState().model_dump()
+    return doc
+
+
+def asset_doc_to_public(doc: dict) -> AssetPublic:
+    """
+    Validate a Mongo document straight into the public model (one pass).
 
-    result = db["assets"].insert_one(doc)
-    doc["_id"] = str(result.inserted_id)
+    AssetPublic ignores DB-only keys such as `_id` and `tag_text_state`, so
+    no intermediate AssetInDB round trip is needed.
+    """
+    return AssetPublic.model_validate({**doc, "id": str(doc["_id"])})
 
-    asset_in_db = AssetInDB.model_validate(doc)
-    return AssetPublic.model_validate(asset_in_db.model_dump(by_alias=False))
+
+def invalidate_asset(asset_id: str) -> None:
+    """
+    Drop cached reads for an asset; call after any write to it.
+    """
+    asset_cache.invalidate(asset_id)
+    asset_exists_cache.invalidate(asset_id)
+
+
+def create_asset(db: Database, payload: AssetCreate) -> AssetPublic:
+    doc = new_asset_doc(payload, datetime.now(timezone.utc))
+
+    db["assets"].insert_one(doc)
+    invalidate_asset(str(doc["_id"]))
+    return asset_doc_to_public(doc)
 
 
 def get_asset(db: Database, asset_id: str) -> Optional[AssetPublic]:
+    cached = asset_cache.get(asset_id)
+    if cached is not None:
+        return cached
+
     try:
         oid = ObjectId(asset_id)
     except Exception:
@@ -34,6 +75,78 @@ def get_asset(db: Database, asset_id: str) -> Optional[AssetPublic]:
     if not doc:
         return None
     
-    doc["_id"] = str(doc["_id"])
-    asset_in_db = AssetInDB.model_validate(doc)
-    return AssetPublic.model_validate(asset_in_db.model_dump(by_alias=False))
+    asset = asset_doc_to_public(doc)
+    asset_cache.set(asset_id, asset)
+    asset_exists_cache.set(asset_id, True)
+    return asset
+
+
+def asset_exists(db: Database, asset_id: str) -> bool:
+    """
+    Cheap existence check: cache first, then an `_id`-only read that the
+    `_id` index answers without fetching the document.
+    """
+    if asset_exists_cache.get(asset_id):
+        return True
+
+    try:
+        oid = ObjectId(asset_id)
+    except Exception:
+        return False
+
+    if db["assets"].find_one({"_id": oid}, {"_id": 1}) is None:
+        return False
+    asset_exists_cache.set(asset_id, True)
+    return True
+
+
+def asset_list_filter(
+        client_name: Optional[str] = None,
+        project_name: Optional[str] = None,
+        category: Optional[str] = None,
+        tag_category: Optional[str] = None,
+        tag_value: Optional[str] = None,
+        dimensions: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Equality filters on the indexed asset fields (see init_indexes), plus
+    dimension_summary ranges from `dimension_range_filter`.
+    """
+    query: Dict[str, Any] = {}
+    if client_name is not None:
+        query["client_name"] = client_name
+    if project_name is not None:
+        query["project_name"] = project_name
+    if category is not None:
+        query["category"] = category
+    if tag_category is not None or tag_value is not None:
+        tag_match: Dict[str, Any] = {}
+        if tag_category is not None:
+            tag_match["category"] = tag_category
+        if tag_value is not None:
+            tag_match["value"] = tag_value
+        query["tags"] = {"$elemMatch": tag_match}
+    query.update(dimensions or {})
+    return query
+
+
+def list_assets(
+        db: Database,
+        filters: Dict[str, Any],
+        sort_field: str = "_id",
+        order: str = "desc",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    direction = pagination.parse_direction(order)
+    query = pagination.combine_filters(filters, pagination.keyset_filter(sort_field, direction, cursor))
+    projection = pagination.build_projection(fields, ASSET_LIST_FIELDS, ASSET_LIST_DEFAULT_EXCLUDE, sort_field)
+
+    docs = list(
+        db["assets"]
+        .find(query, projection)
+        .sort(pagination.sort_spec(sort_field, direction))
+        .limit(limit + 1)
+    )
+    return pagination.page_from_docs(docs, limit, sort_field)
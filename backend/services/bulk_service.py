@@ -0,0 +1,124 @@
+#backend/services/bulk_service.py
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timezone
+import json
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from backend.core.concurrency import run_blocking
+from backend.db.asset_models import AssetCreate
+from backend.db.bulk_models import AssetWithViewsPublic, BulkValidationErrorDetail, BulkViewError
+from backend.db.view_models import ViewCreate
+from fastapi import HTTPException, status, UploadFile
+from pydantic import ValidationError
+from pymongo.database import Database
+from backend.services.asset_service import asset_doc_to_public, invalidate_asset, new_asset_doc
+from backend.services.view_service import invalidate_view, new_view_doc, view_doc_to_public
+from backend.storage.base import StorageBackend
+
+
+# (sketch, cad) uploads per view index
+ViewUploads = Dict[int, Tuple[Optional[UploadFile], Optional[UploadFile]]]
+
+
+def validate_submission(payload_json: str, uploads: ViewUploads) -> Tuple[AssetCreate, List[ViewCreate]]:
+    """
+    Validate the asset and every view before anything is written.
+
+    Raises a 400 whose detail lists the asset error and one entry per
+    failing view, so the UI can point at the right form.
+    """
+    try:
+        payload = json.loads(payload_json)
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid payload_json: {exc}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("views"), list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payload_json must be {\"asset\": {...}, \"views\": [...]}")
+
+    detail = BulkValidationErrorDetail()
+
+    asset: Optional[AssetCreate] = None
+    try:
+        asset = AssetCreate.model_validate(payload.get("asset"))
+    except ValidationError as exc:
+        detail.asset_error = str(exc)
+
+    views: List[ViewCreate] = []
+    for index, raw_view in enumerate(payload["views"]):
+        try:
+            views.append(ViewCreate.model_validate(raw_view))
+        except ValidationError as exc:
+            detail.view_errors.append(BulkViewError(index=index, error=str(exc)))
+            continue
+        sketch, cad = uploads.get(index, (None, None))
+        if sketch is None and cad is None:
+            detail.view_errors.append(BulkViewError(index=index, error="At least one of sketch or cad must be provided."))
+
+    for index in sorted(uploads):
+        if not 0 <= index < len(payload["views"]):
+            detail.view_errors.append(BulkViewError(index=index, error="File uploaded for a view that is not in payload_json."))
+
+    if detail.asset_error or detail.view_errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail.model_dump())
+
+    return asset, views
+
+
+async def create_asset_with_views(
+        db: Database,
+        storage: StorageBackend,
+        asset: AssetCreate,
+        views: List[ViewCreate],
+        uploads: ViewUploads,
+) -> AssetWithViewsPublic:
+    """
+    Store every view's files concurrently, then persist the asset with one
+    insert_one and all stored views with one insert_many.
+
+    A view whose files fail to store is reported in `errors` and skipped;
+    the others are still created.
+    """
+    now = datetime.now(timezone.utc)
+    asset_oid = ObjectId()
+    asset_id = str(asset_oid)
+    view_oids = [ObjectId() for _ in views]
+
+    results = await asyncio.gather(
+        *(
+            run_blocking(
+                storage.save_view_files,
+                asset_id=asset_id,
+                view_id=str(view_oid),
+                sketch=uploads[index][0],
+                cad=uploads[index][1],
+            )
+            for index, view_oid in enumerate(view_oids)
+        ),
+        return_exceptions=True,
+    )
+
+    view_docs: List[dict] = []
+    errors: List[BulkViewError] = []
+    for index, (meta, view_oid, files) in enumerate(zip(views, view_oids, results)):
+        if isinstance(files, BaseException):
+            errors.append(BulkViewError(index=index, error=f"Failed to store files: {files}"))
+            continue
+        view_docs.append(new_view_doc(asset_id, view_oid, meta, files, now))
+
+    asset_doc = new_asset_doc(asset, now)
+    asset_doc["_id"] = asset_oid
+
+    await run_blocking(db["assets"].insert_one, asset_doc)
+    if view_docs:
+        await run_blocking(db["views"].insert_many, view_docs, ordered=False)
+
+    invalidate_asset(asset_id)
+    for doc in view_docs:
+        invalidate_view(str(doc["_id"]))
+
+    return AssetWithViewsPublic(
+        asset=asset_doc_to_public(asset_doc),
+        views=[view_doc_to_public(doc) for doc in view_docs],
+        errors=errors,
+    )
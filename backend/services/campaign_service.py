@@ -0,0 +1,234 @@
+#backend/services/campaign_service.py
+"""
+Reprocessing campaigns: re-run view processing over the existing corpus
+after an extractor/rasterizer change without starving fresh uploads.
+
+A campaign document (`reprocessing_campaigns`) records the selection, the
+target extractor version and an `_id` cursor. `enqueue_batch` moves the
+next `batch_size` matching views back to "Pending Processing" in the bulk
+lane of the job queue, tagged with `campaign_id` and
+`target_extractor_version`. Completing any view through the job queue
+(`view_processing_queue`) stamps `extractor_version` with the version the
+worker ran (falling back to the target), so fresh uploads and re-run
+campaigns skip views already on the campaign's version.
+Workers serve the interactive lane first (see job_queue fair share).
+Views currently pending or processing are never touched. Pausing or
+cancelling a campaign only stops enqueueing; views already in the bulk
+lane are still processed.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from backend.db.campaign_models import CampaignCreate, CampaignProgress
+from backend.services.job_queue import ERROR, LANE_BULK, PROCESSING
+from fastapi import HTTPException, status
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.database import Database
+
+
+PENDING = "Pending Processing"
+# Statuses a view may be in when a campaign picks it up.
+ACTIVE_STATUSES = (PENDING, PROCESSING)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def selection_filter(campaign: dict) -> Dict[str, Any]:
+    """
+    Views this campaign still has to enqueue (before the cursor is applied).
+    """
+    query: Dict[str, Any] = {
+        "extractor_version": {"$ne": campaign["extractor_version"]},
+        "status": {"$nin": list(ACTIVE_STATUSES)},
+    }
+    if campaign.get("asset_ids"):
+        query["asset_id"] = {"$in": campaign["asset_ids"]}
+    if campaign.get("view_types"):
+        query["view_type"] = {"$in": campaign["view_types"]}
+    return query
+
+
+def create_campaign(db: Database, payload: CampaignCreate) -> dict:
+    now = _utcnow()
+    doc = payload.model_dump()
+    doc.update(
+        state="created",
+        cursor=None,
+        enqueued=0,
+        created_at=now,
+        started_at=None,
+        finished_at=None,
+        updated_at=now,
+    )
+    doc["total"] = db["views"].count_documents(selection_filter(doc))
+    db["reprocessing_campaigns"].insert_one(doc)
+    return doc
+
+
+def get_campaign(db: Database, campaign_id: str) -> Optional[dict]:
+    try:
+        oid = ObjectId(campaign_id)
+    except Exception:
+        return None
+    return db["reprocessing_campaigns"].find_one({"_id": oid})
+
+
+def set_state(db: Database, campaign_id: ObjectId, state: str) -> Optional[dict]:
+    now = _utcnow()
+    update: Dict[str, Any] = {"state": state, "updated_at": now}
+    if state in ("done", "cancelled"):
+        update["finished_at"] = now
+    return db["reprocessing_campaigns"].find_one_and_update(
+        {"_id": campaign_id},
+        {"$set": update},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def pending_in_lane(db: Database, campaign: dict) -> int:
+    return db["views"].count_documents({"campaign_id": campaign["_id"], "status": PENDING})
+
+
+def enqueue_batch(db: Database, campaign: dict, limit: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Move the next batch of matching views into the bulk lane and advance
+    the cursor. `limit` caps the batch below `batch_size`. Returns (views
+    scanned, views enqueued); nothing scanned means the selection is exhausted.
+    """
+    query = selection_filter(campaign)
+    if campaign.get("cursor") is not None:
+        query["_id"] = {"$gt": campaign["cursor"]}
+    ids: List[Any] = [
+        doc["_id"]
+        for doc in db["views"].find(query, {"_id": 1}).sort("_id", ASCENDING).limit(min(campaign["batch_size"], limit or campaign["batch_size"]))
+    ]
+    if not ids:
+        return 0, 0
+
+    now = _utcnow()
+    # Re-checks the selection, so a view that became pending (new upload of
+    # its files) in the meantime stays in the interactive lane.
+    result = db["views"].update_many(
+        {**selection_filter(campaign), "_id": {"$in": ids}},
+        {
+            "$set": {
+                "status": PENDING,
+                "lane": LANE_BULK,
+                "campaign_id": campaign["_id"],
+                "target_extractor_version": campaign["extractor_version"],
+                "attempts": 0,
+                "last_processing_error": None,
+                "updated_at": now,
+            },
+            "$unset": {"next_attempt_at": ""},
+        },
+    )
+    update: Dict[str, Any] = {"$set": {"cursor": ids[-1], "updated_at": now}, "$inc": {"enqueued": result.modified_count}}
+    if campaign.get("started_at") is None:
+        update["$set"]["started_at"] = now
+    db["reprocessing_campaigns"].update_one({"_id": campaign["_id"]}, update)
+    campaign["cursor"] = ids[-1]
+    campaign["enqueued"] = campaign.get("enqueued", 0) + result.modified_count
+    campaign["started_at"] = campaign.get("started_at") or now
+    return len(ids), result.modified_count
+
+
+def run_campaign(db: Database, campaign: dict, stop: Optional[threading.Event] = None, log=print) -> dict:
+    """
+    Enqueue batches until the selection is exhausted, the campaign is
+    paused/cancelled elsewhere, or `stop` is set. Batches are spaced so the
+    average enqueue rate stays at `rate_per_second`, and enqueueing waits
+    while `max_pending` of this campaign's views are already queued.
+    """
+    stop = stop or threading.Event()
+    if campaign["state"] == "cancelled":
+        log(f"[WARN] Campaign {campaign['_id']} was cancelled; not running")
+        return campaign
+    campaign = set_state(db, campaign["_id"], "running") or campaign
+    interval = campaign["batch_size"] / campaign["rate_per_second"]
+    while not stop.is_set():
+        current = db["reprocessing_campaigns"].find_one({"_id": campaign["_id"]}, {"state": 1})
+        if current is None or current["state"] != "running":
+            log(f"[INFO] Campaign {campaign['_id']} is {current and current['state']}; stopping")
+            return campaign
+
+        backlog = pending_in_lane(db, campaign)
+        if backlog >= campaign["max_pending"]:
+            stop.wait(interval)
+            continue
+
+        scanned, enqueued = enqueue_batch(db, campaign, limit=campaign["max_pending"] - backlog)
+        if scanned == 0:
+            log(f"[OK] Campaign {campaign['_id']}: selection exhausted after {campaign['enqueued']} views")
+            return set_state(db, campaign["_id"], "done") or campaign
+        log(f"[INFO] Campaign {campaign['_id']}: +{enqueued} (enqueued {campaign['enqueued']}/{campaign['total']}, backlog {backlog})")
+        stop.wait(interval)
+    return campaign
+
+
+def campaign_progress(db: Database, campaign: dict, now: Optional[datetime] = None) -> CampaignProgress:
+    now = now or _utcnow()
+    counts: Dict[str, int] = {
+        row["_id"]: row["count"]
+        for row in db["views"].aggregate([
+            {"$match": {"campaign_id": campaign["_id"]}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ])
+    }
+    pending = counts.get(PENDING, 0)
+    processing = counts.get(PROCESSING, 0)
+    failed = counts.get(ERROR, 0)
+    completed = sum(counts.values()) - pending - processing - failed
+    total = max(campaign["total"], campaign.get("enqueued", 0))
+    remaining = max(0, total - completed - failed)
+
+    throughput = eta = eta_at = None
+    started = campaign.get("started_at")
+    if started is not None:
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        elapsed = (now - started).total_seconds()
+        if elapsed > 0 and completed + failed > 0:
+            throughput = (completed + failed) / elapsed
+            eta = remaining / throughput
+            eta_at = now + timedelta(seconds=eta)
+
+    return CampaignProgress(
+        id=str(campaign["_id"]),
+        name=campaign["name"],
+        extractor_version=campaign["extractor_version"],
+        state=campaign["state"],
+        total=campaign["total"],
+        enqueued=campaign.get("enqueued", 0),
+        pending=pending,
+        processing=processing,
+        completed=completed,
+        failed=failed,
+        remaining=remaining,
+        percent_done=round(100.0 * (completed + failed) / total, 2) if total else 100.0,
+        throughput_per_second=throughput,
+        eta_seconds=eta,
+        eta_at=eta_at,
+        status_counts=counts,
+        created_at=campaign["created_at"],
+        started_at=campaign.get("started_at"),
+        finished_at=campaign.get("finished_at"),
+        updated_at=campaign["updated_at"],
+    )
+
+
+def get_campaign_progress(db: Database, campaign_id: str) -> CampaignProgress:
+    campaign = get_campaign(db, campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return campaign_progress(db, campaign)
+
+
+def list_campaigns(db: Database, limit: int = 50) -> List[CampaignProgress]:
+    docs = db["reprocessing_campaigns"].find().sort("_id", -1).limit(limit)
+    return [campaign_progress(db, doc) for doc in docs]
@@ -0,0 +1,40 @@
+#backend/services/dimension_filters.py
+"""
+Range filters on `dimension_summary` (views and assets), e.g. width
+1800-2400 mm. Each bound becomes a `$gte`/`$lte` on one indexed field, so
+the query runs as an index range scan (see init_indexes).
+"""
+from __future__ import annotations
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+DIMENSION_FIELDS = ("width", "height", "depth", "max")
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def dimension_range_filter(ranges: Dict[str, Range]) -> Dict[str, Any]:
+    """
+    {"width": (1800, 2400), "height": (None, 2100)} ->
+    {"dimension_summary.width_mm": {"$gte": 1800, "$lte": 2400}, ...}
+    """
+    query: Dict[str, Any] = {}
+    for name, (low, high) in ranges.items():
+        if name not in DIMENSION_FIELDS:
+            raise ValueError(f"Unknown dimension {name!r}")
+        if low is None and high is None:
+            continue
+        if low is not None and high is not None and low > high:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{name}_min_mm must not exceed {name}_max_mm",
+            )
+        bounds: Dict[str, float] = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        query[f"dimension_summary.{name}_mm"] = bounds
+    return query
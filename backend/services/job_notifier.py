@@ -0,0 +1,211 @@
+#backend/services/job_notifier.py
+"""
+Wake-ups for JobQueue workers.
+
+A background thread watches the queue's collection through a change stream
+and sets an event whenever a document enters the pending status (insert,
+retry after failure, expired-lease reclaim). Idle workers block on that
+event instead of polling, so they react within milliseconds of an upload
+and issue only one safety-net claim per `max_interval` while idle (that
+claim also picks up backoff retries whose next_attempt_at has passed,
+which produce no change event).
+
+Change streams need a replica set. On a standalone mongod the watch fails
+and workers fall back to polling with an exponential backoff between
+`min_interval` and `max_interval`, reset whenever a claim finds work. The
+watcher keeps retrying in the background and switches back to push mode
+as soon as a stream can be opened.
+"""
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.core.config import settings
+from backend.services.job_queue import JobQueue
+from pymongo.collection import Collection
+
+
+logger = logging.getLogger(__name__)
+
+
+def pending_pipeline(pending_status: str) -> List[Dict[str, Any]]:
+    """
+    Change-stream pipeline matching documents that became claimable.
+    """
+    return [
+        {"$match": {"$or": [
+            {"operationType": {"$in": ["insert", "replace"]}, "fullDocument.status": pending_status},
+            {"operationType": "update", "updateDescription.updatedFields.status": pending_status},
+        ]}},
+        {"$project": {"_id": 1}},
+    ]
+
+
+class JobNotifier:
+    """
+    Push (change stream) or adaptive-poll wake-ups for one collection.
+    """
+    def __init__(
+            self,
+            collection: Collection,
+            pending_status: str,
+            min_interval: Optional[float] = None,
+            max_interval: Optional[float] = None,
+            stream_retry_seconds: float = 60.0,
+    ) -> None:
+        self.collection = collection
+        self.pipeline = pending_pipeline(pending_status)
+        self.min_interval = min_interval if min_interval is not None else settings.job_poll_min_seconds
+        self.max_interval = max_interval if max_interval is not None else settings.job_poll_max_seconds
+        self.stream_retry_seconds = stream_retry_seconds
+
+        self._event = threading.Event()
+        self._stop = threading.Event()
+        self._streaming = False
+        self._interval = self.min_interval
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    def start(self) -> "JobNotifier":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch_loop, name="job-notifier", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def notify(self) -> None:
+        self._event.set()
+
+    def found_work(self) -> None:
+        """
+        Call after a claim returned jobs: the next idle wait starts short again.
+        """
+        self._interval = self.min_interval
+
+    def wait(self) -> bool:
+        """
+        Block until there may be work. Returns True if woken by a change event.
+
+        In push mode this waits up to `max_interval`; in polling mode it
+        waits the current backoff interval and doubles it for next time.
+        """
+        if self._streaming:
+            timeout = self.max_interval
+        else:
+            timeout = self._interval
+            self._interval = min(self.max_interval, self._interval * 2)
+        woken = self._event.wait(timeout)
+        self._event.clear()
+        return woken and not self._stop.is_set()
+
+    def _watch_loop(self) -> None:
+        resume_after = None
+        while not self._stop.is_set():
+            try:
+                with self.collection.watch(self.pipeline, resume_after=resume_after, max_await_time_ms=1000) as stream:
+                    if not self._streaming:
+                        logger.info("Job notifier: change stream open on %s", self.collection.name)
+                    self._streaming = True
+                    # Anything inserted while no stream was open is picked up by one immediate claim.
+                    self._event.set()
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is not None:
+                            self._event.set()
+                        resume_after = stream.resume_token
+            except Exception as exc:
+                # PyMongoError on a standalone mongod; in-memory stand-ins lack watch() entirely.
+                if self._streaming:
+                    logger.warning("Job notifier: change stream lost (%s); polling", exc)
+                else:
+                    logger.info("Job notifier: change streams unavailable (%s); polling", exc)
+                self._streaming = False
+                resume_after = None
+                self._stop.wait(self.stream_retry_seconds)
+
+
+def notifier_for(queue: JobQueue, **kwargs: Any) -> JobNotifier:
+    return JobNotifier(queue.collection, queue.pending_status, **kwargs)
+
+
+class LeaseKeeper:
+    """
+    Heartbeats one job from a side thread while it is being handled, every
+    third of the lease; stops for good once the lease is lost.
+    """
+    def __init__(self, queue: JobQueue, job: dict) -> None:
+        self.queue = queue
+        self.job = job
+        self.interval = max(0.1, queue.lease_seconds / 3)
+        self.lost = False
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-{job['_id']}", daemon=True)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._done.set()
+        self._thread.join()
+
+    def _beat(self) -> None:
+        while not self._done.wait(self.interval):
+            try:
+                alive = self.queue.heartbeat(self.job)
+            except Exception:
+                # A transient Mongo error: try again next interval, the lease has slack.
+                logger.exception("Heartbeat for job %s failed", self.job["_id"])
+                continue
+            if not alive:
+                self.lost = True
+                return
+
+
+def run_worker(
+        queue: JobQueue,
+        notifier: JobNotifier,
+        worker_id: str,
+        handle: Callable[[dict], Optional[Dict[str, Any]]],
+        stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Claim/process loop shared by the CAD worker and the ML pipeline.
+
+    Jobs are claimed one at a time, right before they are handled, and the
+    lease is heartbeated for as long as `handle(job)` runs, so a slow job is
+    never reclaimed and nothing waits on a lease it is not using.
+    `handle(job)` returns extra fields to set on completion (or None);
+    any exception is recorded through `queue.fail`.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        job = queue.claim(worker_id)
+        if job is None:
+            notifier.wait()
+            continue
+
+        notifier.found_work()
+        started = time.perf_counter()
+        with LeaseKeeper(queue, job) as lease:
+            try:
+                fields = handle(job)
+            except Exception as exc:
+                logger.exception("Job %s failed", job["_id"])
+                queue.fail(job, f"{type(exc).__name__}: {exc}")
+                continue
+        if lease.lost or not queue.complete(job, fields=fields):
+            logger.warning(
+                "Job %s lost its lease after %.1fs; result discarded", job["_id"], time.perf_counter() - started,
+            )
@@ -0,0 +1,295 @@
+#backend/services/job_queue.py
+"""
+Lease-based job queue over a Mongo collection.
+
+Used by the CAD worker (views) and the ML pipeline (embedding_docs). A job
+is simply a document in a "pending" status. Claiming moves it to
+"Processing" and stamps a lease:
+
+    lease_owner       worker id holding the job
+    lease_token       random token identifying this particular claim
+    lease_expires_at  claim is void after this time unless heartbeated
+    attempts          number of claims so far
+    next_attempt_at   earliest time the job may be claimed again (backoff)
+
+Every state change after a claim is conditional on (_id, lease_token), so
+a worker whose lease expired and was reclaimed by someone else cannot
+overwrite the new owner's result. A claim is a single find_one_and_update
+on the oldest claimable job, so concurrent workers never contend for a
+shared candidate list and adding workers adds throughput without any
+coordinator.
+
+Jobs sit in one of two lanes (`lane` field): "interactive" (the default,
+also for documents without the field: fresh uploads) and "bulk"
+(reprocessing campaigns, see campaign_service). Each queue instance serves
+interactive jobs first but, while both lanes have work, gives one claim to
+the bulk lane after every `fair_share` interactive claims, so a campaign
+keeps moving without ever burying new uploads.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+import time
+from typing import Any, Callable, Dict, Optional
+import uuid
+
+from backend.core.config import settings
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+
+PROCESSING = "Processing"
+ERROR = "Error"
+
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+Clock = Callable[[], datetime]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """
+    Claim/heartbeat/complete/fail protocol for one collection.
+
+    `pending_status` is the status a job waits in, `done_status` the one
+    `complete()` moves it to by default. `error_field` receives the message
+    passed to `fail()`. `extra_filter` narrows which pending documents this
+    queue serves (e.g. one model_version of embedding_docs). `fair_share`
+    is the number of interactive claims per bulk claim while both lanes
+    have work. With `version_field` set, `complete()` stamps the version
+    the job was processed with into that field on every job: the `version`
+    argument, else the queue's `current_version` (the version this worker
+    runs), else the job's `target_{version_field}` (set on campaign jobs).
+    Any target is cleared.
+    """
+    def __init__(
+            self,
+            collection: Collection,
+            pending_status: str,
+            done_status: str,
+            error_field: str,
+            extra_filter: Optional[Dict[str, Any]] = None,
+            lease_seconds: Optional[float] = None,
+            max_attempts: Optional[int] = None,
+            backoff_base_seconds: Optional[float] = None,
+            backoff_max_seconds: Optional[float] = None,
+            fair_share: Optional[int] = None,
+            version_field: Optional[str] = None,
+            current_version: Optional[str] = None,
+            clock: Clock = _utcnow,
+    ) -> None:
+        self.collection = collection
+        self.pending_status = pending_status
+        self.done_status = done_status
+        self.error_field = error_field
+        self.extra_filter = dict(extra_filter or {})
+        self.lease_seconds = lease_seconds if lease_seconds is not None else settings.job_lease_seconds
+        self.max_attempts = max_attempts if max_attempts is not None else settings.job_max_attempts
+        self.backoff_base_seconds = (
+            backoff_base_seconds if backoff_base_seconds is not None else settings.job_backoff_base_seconds
+        )
+        self.backoff_max_seconds = (
+            backoff_max_seconds if backoff_max_seconds is not None else settings.job_backoff_max_seconds
+        )
+        self.fair_share = max(1, fair_share if fair_share is not None else settings.job_fair_share)
+        self.version_field = version_field
+        self.current_version = current_version
+        self.clock = clock
+        # Interactive jobs claimed since the bulk lane last got a turn.
+        self._interactive_run = 0
+        # Expired leases are swept at most this often per queue instance.
+        self.reclaim_interval = max(1.0, self.lease_seconds / 2)
+        self._last_reclaim = float("-inf")
+
+    # --- filters ---
+    def _claimable_filter(self, now: datetime, lane: str) -> Dict[str, Any]:
+        # `$not: {$gt}` also matches documents that never had next_attempt_at;
+        # `$ne` likewise puts documents without a lane in the interactive lane.
+        return {
+            **self.extra_filter,
+            "status": self.pending_status,
+            "lane": LANE_BULK if lane == LANE_BULK else {"$ne": LANE_BULK},
+            "next_attempt_at": {"$not": {"$gt": now}},
+        }
+
+    def _record_claim(self, lane: str) -> None:
+        if lane == LANE_BULK:
+            self._interactive_run = 0
+        else:
+            self._interactive_run = min(self.fair_share, self._interactive_run + 1)
+
+    def _lease_set(self, worker_id: str, token: str, now: datetime) -> Dict[str, Any]:
+        return {
+            "status": PROCESSING,
+            "lease_owner": worker_id,
+            "lease_token": token,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "updated_at": now,
+        }
+
+    def backoff_seconds(self, attempts: int) -> float:
+        return min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** max(0, attempts - 1)))
+
+    # --- claiming ---
+    def claim(self, worker_id: str) -> Optional[dict]:
+        """
+        Claim the oldest claimable job of the lane whose turn it is (falling
+        back to the other lane), or return None if there is none.
+        """
+        self._maybe_reclaim()
+        now = self.clock()
+        first = LANE_BULK if self._interactive_run >= self.fair_share else LANE_INTERACTIVE
+        for lane in (first, LANE_BULK if first == LANE_INTERACTIVE else LANE_INTERACTIVE):
+            job = self.collection.find_one_and_update(
+                self._claimable_filter(now, lane),
+                {"$set": self._lease_set(worker_id, uuid.uuid4().hex, now), "$inc": {"attempts": 1}},
+                sort=[("next_attempt_at", ASCENDING), ("_id", ASCENDING)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is not None:
+                self._record_claim(lane)
+                return job
+            if lane == LANE_BULK:
+                # No campaign work: give up the turn instead of re-probing
+                # the empty bulk lane before every interactive claim.
+                self._interactive_run = 0
+        return None
+
+    # --- while processing ---
+    def heartbeat(self, job: dict) -> bool:
+        """
+        Extend the lease. False means the lease was lost and work should stop.
+        """
+        now = self.clock()
+        result = self.collection.update_one(
+            {"_id": job["_id"], "status": PROCESSING, "lease_token": job["lease_token"]},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "updated_at": now}},
+        )
+        return result.matched_count == 1
+
+    def complete(
+            self,
+            job: dict,
+            status: Optional[str] = None,
+            fields: Optional[Dict[str, Any]] = None,
+            version: Optional[str] = None,
+    ) -> bool:
+        """
+        Finish a job, moving it to `status` (default `done_status`) and
+        setting any extra `fields` (e.g. files.metadata) in the same write.
+        `version` is the extractor version that processed the job (see
+        `version_field`).
+        """
+        now = self.clock()
+        update = {
+            "$set": {
+                **(fields or {}),
+                "status": status or self.done_status,
+                self.error_field: None,
+                "updated_at": now,
+            },
+            "$unset": {"lease_owner": "", "lease_token": "", "lease_expires_at": "", "next_attempt_at": "", "lane": ""},
+        }
+        if self.version_field:
+            target = f"target_{self.version_field}"
+            stamped = version or self.current_version or job.get(target)
+            if stamped is not None:
+                update["$set"].setdefault(self.version_field, stamped)
+            update["$unset"][target] = ""
+        result = self.collection.update_one(
+            {"_id": job["_id"], "status": PROCESSING, "lease_token": job["lease_token"]},
+            update,
+        )
+        return result.matched_count == 1
+
+    def fail(self, job: dict, error: str) -> bool:
+        """
+        Record a failed attempt: retry later with exponential backoff, or
+        park the job in "Error" once `max_attempts` is reached.
+        """
+        now = self.clock()
+        attempts = job.get("attempts", 1)
+        update: Dict[str, Any] = {
+            "$set": {self.error_field: error[:2000], "updated_at": now},
+            "$unset": {"lease_owner": "", "lease_token": "", "lease_expires_at": ""},
+        }
+        if attempts >= self.max_attempts:
+            update["$set"]["status"] = ERROR
+        else:
+            update["$set"]["status"] = self.pending_status
+            update["$set"]["next_attempt_at"] = now + timedelta(seconds=self.backoff_seconds(attempts))
+        result = self.collection.update_one(
+            {"_id": job["_id"], "status": PROCESSING, "lease_token": job["lease_token"]},
+            update,
+        )
+        return result.matched_count == 1
+
+    # --- recovery ---
+    def reclaim_expired(self) -> int:
+        """
+        Return jobs whose lease expired (crashed or stalled worker) to the
+        pending status, or to "Error" if they are out of attempts.
+        """
+        now = self.clock()
+        expired = {**self.extra_filter, "status": PROCESSING, "lease_expires_at": {"$lt": now}}
+        unset = {"lease_owner": "", "lease_token": "", "lease_expires_at": ""}
+        message = "Lease expired before the job completed"
+
+        exhausted = self.collection.update_many(
+            {**expired, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"status": ERROR, self.error_field: message, "updated_at": now}, "$unset": unset},
+        )
+        retried = self.collection.update_many(
+            expired,
+            {
+                "$set": {
+                    "status": self.pending_status,
+                    self.error_field: message,
+                    "next_attempt_at": now,
+                    "updated_at": now,
+                },
+                "$unset": unset,
+            },
+        )
+        return exhausted.modified_count + retried.modified_count
+
+    def _maybe_reclaim(self) -> None:
+        mono = time.monotonic()
+        if mono - self._last_reclaim >= self.reclaim_interval:
+            self._last_reclaim = mono
+            self.reclaim_expired()
+
+
+def view_processing_queue(db: Database, **kwargs: Any) -> JobQueue:
+    """
+    CAD worker queue: raw views waiting for metadata/raster extraction.
+    Workers pass `current_version=` their extractor version so every view
+    they complete records it, not only campaign jobs.
+    """
+    return JobQueue(
+        db["views"],
+        pending_status="Pending Processing",
+        done_status="Ready for Embedding",
+        error_field="last_processing_error",
+        version_field="extractor_version",
+        **kwargs,
+    )
+
+
+def embedding_queue(db: Database, model_version: Optional[str] = None, **kwargs: Any) -> JobQueue:
+    """
+    ML pipeline queue: embedding docs waiting to be embedded.
+    """
+    return JobQueue(
+        db["embedding_docs"],
+        pending_status="Ready for Embedding",
+        done_status="Embedded",
+        error_field="last_error",
+        extra_filter={"model_version": model_version} if model_version else None,
+        **kwargs,
+    )
@@ -0,0 +1,122 @@
+#backend/services/pagination.py
+"""
+Keyset pagination and caller-chosen projections for listing endpoints.
+
+Pages are addressed by an opaque cursor holding the (sort value, _id) of
+the last item returned, so page N costs the same index seek as page 1
+instead of skipping N * limit documents.
+"""
+from __future__ import annotations
+import base64
+from datetime import datetime
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo import ASCENDING, DESCENDING
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    value = doc.get(sort_field) if sort_field != "_id" else None
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    raw = json.dumps({"v": value, "id": str(doc["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = raw["v"]
+        if isinstance(value, dict) and "$date" in value:
+            value = datetime.fromisoformat(value["$date"])
+        return value, ObjectId(raw["id"])
+    except Exception:
+        raise _bad_request("Invalid cursor")
+
+
+def keyset_filter(sort_field: str, direction: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Filter selecting documents strictly after the cursor in (sort_field, _id) order.
+    """
+    if not cursor:
+        return {}
+    value, oid = decode_cursor(cursor)
+    op = "$gt" if direction == ASCENDING else "$lt"
+    if sort_field == "_id":
+        return {"_id": {op: oid}}
+    return {
+        "$or": [
+            {sort_field: {op: value}},
+            {sort_field: value, "_id": {op: oid}},
+        ]
+    }
+
+
+def sort_spec(sort_field: str, direction: int) -> List[Tuple[str, int]]:
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def parse_direction(order: str) -> int:
+    return ASCENDING if order == "asc" else DESCENDING
+
+
+def build_projection(
+        fields: Optional[str],
+        allowed: Iterable[str],
+        default_exclude: Iterable[str],
+        sort_field: str,
+) -> Dict[str, int]:
+    """
+    Turn a comma-separated `fields` query param into a Mongo projection.
+
+    `_id` and the sort field are always returned (the cursor needs them).
+    Without `fields`, everything except `default_exclude` is returned.
+    """
+    if not fields:
+        return {name: 0 for name in default_exclude}
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    allowed_set = set(allowed)
+    unknown = [f for f in requested if f not in allowed_set]
+    if unknown:
+        raise _bad_request(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed_set))}")
+
+    projection = {name: 1 for name in requested}
+    projection["_id"] = 1
+    if sort_field != "_id":
+        projection[sort_field] = 1
+    return projection
+
+
+def combine_filters(*filters: Dict[str, Any]) -> Dict[str, Any]:
+    parts = [f for f in filters if f]
+    if not parts:
+        return {}
+    if len(parts) == 1:
+        return parts[0]
+    return {"$and": parts}
+
+
+def page_from_docs(docs: List[dict], limit: int, sort_field: str) -> Dict[str, Any]:
+    """
+    `docs` is fetched with limit + 1 so we know whether another page exists.
+    """
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1], sort_field) if has_more and docs else None
+
+    items = []
+    for doc in docs:
+        item = {"id": str(doc.pop("_id"))}
+        item.update(doc)
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor}
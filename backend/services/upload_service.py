@@ -0,0 +1,259 @@
+#backend/services/upload_service.py
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from backend.db.upload_models import UploadSessionCreate, UploadSessionPublic, ViewFromUploads
+from backend.db.view_models import ViewFiles, ViewPublic
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.database import Database
+from backend.services.view_service import ensure_asset_exists, insert_view
+from backend.storage.base import StorageBackend
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+
+
+def _to_oid(upload_id: str) -> ObjectId:
+    try:
+        return ObjectId(upload_id)
+    except Exception:
+        raise _not_found()
+
+
+def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """
+    Merge overlapping/adjacent [start, end) ranges.
+    """
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _committed_offset(merged: List[List[int]]) -> int:
+    if merged and merged[0][0] == 0:
+        return merged[0][1]
+    return 0
+
+
+def _to_public(doc: dict) -> UploadSessionPublic:
+    merged = merge_ranges(doc.get("received", []))
+    return UploadSessionPublic(
+        id=str(doc["_id"]),
+        asset_id=doc["asset_id"],
+        kind=doc["kind"],
+        filename=doc.get("filename"),
+        content_type=doc.get("content_type"),
+        total_size=doc["total_size"],
+        committed_offset=_committed_offset(merged),
+        received_ranges=merged,
+        status=doc["status"],
+        view_id=doc.get("view_id"),
+        created_at=doc["created_at"],
+        updated_at=doc["updated_at"],
+    )
+
+
+def create_session(db: Database, storage: StorageBackend, payload: UploadSessionCreate) -> UploadSessionPublic:
+    ensure_asset_exists(db, payload.asset_id)
+
+    now = datetime.now(timezone.utc)
+    doc = payload.model_dump()
+    doc.update({
+        "_id": ObjectId(),
+        "received": [],
+        "status": "open",
+        "view_id": None,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+    storage.create_partial(str(doc["_id"]), payload.total_size)
+    db["upload_sessions"].insert_one(doc)
+    return _to_public(doc)
+
+
+def get_session(db: Database, upload_id: str) -> UploadSessionPublic:
+    doc = db["upload_sessions"].find_one({"_id": _to_oid(upload_id)})
+    if not doc:
+        raise _not_found()
+    return _to_public(doc)
+
+
+def get_open_session_doc(db: Database, upload_id: str) -> dict:
+    doc = db["upload_sessions"].find_one({"_id": _to_oid(upload_id)})
+    if not doc:
+        raise _not_found()
+    if doc["status"] != "open":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Upload session is {doc['status']}")
+    return doc
+
+
+def write_chunk(db: Database, storage: StorageBackend, upload_id: str, offset: int, data: bytes) -> None:
+    """
+    Write `data` into the session's partial file. 409 unless the session is
+    open: a finalize may already be hashing the file. A finalize that claims
+    the session after this check moves the partial away first, which turns
+    the open below into a FileNotFoundError (409 as well).
+    """
+    get_open_session_doc(db, upload_id)
+    try:
+        storage.write_partial(upload_id, offset, data)
+    except FileNotFoundError:
+        get_open_session_doc(db, upload_id)
+        raise
+
+
+def record_range(db: Database, upload_id: str, start: int, end: int) -> UploadSessionPublic:
+    """
+    Record that bytes [start, end) are durably on storage.
+
+    `$push` keeps concurrent chunk PUTs race-free; ranges are merged on read.
+    """
+    doc = db["upload_sessions"].find_one_and_update(
+        {"_id": _to_oid(upload_id), "status": "open"},
+        {
+            "$push": {"received": [start, end]},
+            "$set": {"updated_at": datetime.now(timezone.utc)},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if not doc:
+        get_open_session_doc(db, upload_id)  # 404, or 409 if it was claimed meanwhile
+        raise _not_found()
+    return _to_public(doc)
+
+
+def _completed_session(db: Database, upload_id: str, asset_id: str, kind: str) -> dict:
+    doc = get_open_session_doc(db, upload_id)
+    if doc["asset_id"] != asset_id or doc["kind"] != kind:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload session {upload_id} is not a {kind} upload for asset {asset_id}",
+        )
+    merged = merge_ranges(doc.get("received", []))
+    if _committed_offset(merged) < doc["total_size"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload session {upload_id} is incomplete ({_committed_offset(merged)}/{doc['total_size']} bytes)",
+        )
+    return doc
+
+
+def finalize_view(
+        db: Database,
+        storage: StorageBackend,
+        asset_id: str,
+        payload: ViewFromUploads,
+) -> ViewPublic:
+    if payload.sketch_upload_id is None and payload.cad_upload_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one of sketch or cad must be provided.")
+
+    ensure_asset_exists(db, asset_id)
+
+    sessions: List[Tuple[str, dict]] = []
+    for kind, upload_id in (("sketch", payload.sketch_upload_id), ("cad", payload.cad_upload_id)):
+        if upload_id is not None:
+            sessions.append((kind, _completed_session(db, upload_id, asset_id, kind)))
+
+    view_oid = ObjectId()
+    view_id = str(view_oid)
+    claimed = _claim_sessions(db, [doc for _, doc in sessions], view_id)
+
+    promoted: List[ObjectId] = []
+    try:
+        files = ViewFiles()
+        for kind, doc in sessions:
+            rel_path = storage.view_rel_path(kind, asset_id, view_id, doc.get("filename"))
+            content_type = doc.get("content_type") or "application/octet-stream"
+            setattr(files, kind, storage.promote_partial(str(doc["_id"]), rel_path, content_type))
+            promoted.append(doc["_id"])
+
+        view = insert_view(db, asset_id, view_oid, payload.view, files)
+    except BaseException:
+        # Sessions whose partial file is still in place can be finalized again.
+        _release_sessions(db, [oid for oid in claimed if oid not in promoted])
+        if promoted:
+            db["upload_sessions"].update_many(
+                {"_id": {"$in": promoted}, "status": "finalizing"},
+                {"$set": {"status": "failed", "updated_at": datetime.now(timezone.utc)}},
+            )
+        raise
+
+    db["upload_sessions"].update_many(
+        {"_id": {"$in": claimed}},
+        {"$set": {"status": "finalized", "updated_at": datetime.now(timezone.utc)}},
+    )
+    return view
+
+
+def _claim_sessions(db: Database, docs: List[dict], view_id: str) -> List[ObjectId]:
+    """
+    Move `docs` from open to finalizing for `view_id`, all or none.
+
+    The conditional update lets exactly one of several concurrent or retried
+    finalize requests own a session; the others get 409.
+    """
+    claimed: List[ObjectId] = []
+    for doc in docs:
+        won = db["upload_sessions"].find_one_and_update(
+            {"_id": doc["_id"], "status": "open"},
+            {"$set": {"status": "finalizing", "view_id": view_id, "updated_at": datetime.now(timezone.utc)}},
+        )
+        if won is None:
+            _release_sessions(db, claimed)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload session {doc['_id']} is already being finalized",
+            )
+        claimed.append(doc["_id"])
+    return claimed
+
+
+def _release_sessions(db: Database, ids: List[ObjectId]) -> None:
+    if ids:
+        db["upload_sessions"].update_many(
+            {"_id": {"$in": ids}, "status": "finalizing"},
+            {"$set": {"status": "open", "view_id": None, "updated_at": datetime.now(timezone.utc)}},
+        )
+
+
+def abort_session(db: Database, storage: StorageBackend, upload_id: str) -> None:
+    doc = get_open_session_doc(db, upload_id)
+    # Conditional, so a finalize that claimed the session meanwhile keeps its file.
+    if db["upload_sessions"].delete_one({"_id": doc["_id"], "status": "open"}).deleted_count == 0:
+        get_open_session_doc(db, upload_id)
+        raise _not_found()
+    storage.delete_partial(str(doc["_id"]))
+
+
+def gc_stale_sessions(db: Database, storage: StorageBackend, ttl_seconds: int, now: Optional[datetime] = None) -> int:
+    """
+    Delete sessions (and their partial files) untouched for `ttl_seconds`.
+
+    Finalized and failed sessions have no partial file left; their records
+    are simply dropped once they age out. A session stuck in "finalizing"
+    (the request died mid-way) is treated like an open one.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=ttl_seconds)
+
+    removed = 0
+    for doc in db["upload_sessions"].find({"updated_at": {"$lt": cutoff}}, {"_id": 1, "status": 1}):
+        # Only if still stale: a finalize may have claimed it since the scan.
+        result = db["upload_sessions"].delete_one(
+            {"_id": doc["_id"], "status": doc["status"], "updated_at": {"$lt": cutoff}},
+        )
+        if result.deleted_count == 0:
+            continue
+        if doc["status"] in ("open", "finalizing"):
+            storage.delete_partial(str(doc["_id"]))
+        removed += 1
+    return removed
@@ -1,43 +1,45 @@
 #backend/services/view_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 from bson import ObjectId
-from backend.db.view_models import ViewCreate, ViewFiles, ViewInDB, ViewPublic
+from backend.db.view_models import ViewCreate, ViewFiles, ViewPublic
 from fastapi import HTTPException, status
 from pymongo.database import Database
-from backend.services.asset_service import get_asset
+from backend.core.config import settings
+from backend.services import pagination
+from backend.services.asset_service import asset_exists
+from backend.services.cache import get_cache
 from backend.storage.base import StorageBackend
 
 
-def create_view(
-        db: Database,
-        storage: StorageBackend,
-        asset_id: str,
-        meta: ViewCreate,
-        sketch,
-        cad,
-) -> ViewPublic:
-    # Ensure asset exists
-    asset = get_asset(db, asset_id)
-    if asset is None:
+view_cache = get_cache("views", settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+# Fields a caller may request from GET /assets/{asset_id}/views
+VIEW_LIST_FIELDS = (
+    "asset_id", "view_type", "orientation", "scale", "view_name", "description",
+    "files", "status", "last_processing_error", "dimension_summary", "created_at", "updated_at",
+)
+
+
+def ensure_asset_exists(db: Database, asset_id: str) -> None:
+    if not asset_exists(db, asset_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Asset not found",
         )
-    
-    now = datetime.now(timezone.utc)
-    view_oid = ObjectId()
-    view_id_str = str(view_oid)
 
-    files: ViewFiles = storage.save_view_files(
-        asset_id=asset_id,
-        view_id=view_id_str,
-        sketch=sketch,
-        cad=cad,
-    )
 
-    base_doc = {
+def new_view_doc(
+        asset_id: str,
+        view_oid: ObjectId,
+        meta: ViewCreate,
+        files: ViewFiles,
+        now: datetime,
+) -> dict:
+    return {
         "_id": view_oid,
         "asset_id": asset_id,
         "view_type": meta.view_type,
@@ -52,8 +54,111 @@ def create_view(
         "updated_at": now,
     }
 
-    db["views"].insert_one(base_doc)
 
-    base_doc["_id"] = view_id_str
-    view_in_db = ViewInDB.model_validate(base_doc)
-    return ViewPublic.model_validate(view_in_db.model_dump(by_alias=False))
+def view_doc_to_public(doc: dict) -> ViewPublic:
+    """
+    Validate a Mongo document straight into the public model (one pass).
+    """
+    return ViewPublic.model_validate({**doc, "id": str(doc["_id"])})
+
+
+def insert_view(
+        db: Database,
+        asset_id: str,
+        view_oid: ObjectId,
+        meta: ViewCreate,
+        files: ViewFiles,
+) -> ViewPublic:
+    """
+    Insert the view document for files that are already in storage.
+    """
+    doc = new_view_doc(asset_id, view_oid, meta, files, datetime.now(timezone.utc))
+    db["views"].insert_one(doc)
+    invalidate_view(str(view_oid))
+    return view_doc_to_public(doc)
+
+
+def invalidate_view(view_id: str) -> None:
+    """
+    Drop the cached read for a view; call after any write to it.
+    """
+    view_cache.invalidate(view_id)
+
+
+def get_view(db: Database, asset_id: str, view_id: str) -> Optional[ViewPublic]:
+    cached = view_cache.get(view_id)
+    if cached is None:
+        try:
+            oid = ObjectId(view_id)
+        except Exception:
+            return None
+
+        doc = db["views"].find_one({"_id": oid})
+        if not doc:
+            return None
+
+        cached = view_doc_to_public(doc)
+        view_cache.set(view_id, cached)
+
+    if cached.asset_id != asset_id:
+        return None
+    return cached
+
+
+def create_view(
+        db: Database,
+        storage: StorageBackend,
+        asset_id: str,
+        meta: ViewCreate,
+        sketch,
+        cad,
+) -> ViewPublic:
+    ensure_asset_exists(db, asset_id)
+    
+    view_oid = ObjectId()
+
+    files: ViewFiles = storage.save_view_files(
+        asset_id=asset_id,
+        view_id=str(view_oid),
+        sketch=sketch,
+        cad=cad,
+    )
+
+    return insert_view(db, asset_id, view_oid, meta, files)
+
+
+def view_list_filter(
+        asset_id: str,
+        status: Optional[str] = None,
+        view_type: Optional[str] = None,
+        dimensions: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"asset_id": asset_id}
+    if status is not None:
+        query["status"] = status
+    if view_type is not None:
+        query["view_type"] = view_type
+    query.update(dimensions or {})
+    return query
+
+
+def list_views(
+        db: Database,
+        filters: Dict[str, Any],
+        sort_field: str = "_id",
+        order: str = "asc",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    direction = pagination.parse_direction(order)
+    query = pagination.combine_filters(filters, pagination.keyset_filter(sort_field, direction, cursor))
+    projection = pagination.build_projection(fields, VIEW_LIST_FIELDS, (), sort_field)
+
+    docs = list(
+        db["views"]
+        .find(query, projection or None)
+        .sort(pagination.sort_spec(sort_field, direction))
+        .limit(limit + 1)
+    )
+    return pagination.page_from_docs(docs, limit, sort_field)
@@ -1,13 +1,93 @@
 #backend/storage/base.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import Optional
 
+from backend.db.common_models import FileRef
 from backend.db.view_models import ViewFiles
 from fastapi import UploadFile
 
 
+class StorageWriter(ABC):
+    """
+    Incremental writer for a single file. Nothing is visible at the final
+    path until `commit()`; `abort()` discards everything written so far.
+    """
+    @abstractmethod
+    def write(self, chunk: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit(self) -> FileRef:
+        raise NotImplementedError
+
+    @abstractmethod
+    def abort(self) -> None:
+        raise NotImplementedError
+
+
 class StorageBackend(ABC):
+    @staticmethod
+    def view_rel_path(kind: str, asset_id: str, view_id: str, filename: Optional[str] = None) -> str:
+        """
+        Relative path for a view's raw file, following the agreed layout.
+        """
+        if kind == "sketch":
+            ext = Path(filename or "").suffix or ".png"
+            return f"raw/sketch/{asset_id}/{view_id}{ext}"
+        if kind == "cad":
+            return f"raw/cad/{asset_id}/{view_id}.dwg"
+        if kind == "pdf":
+            return f"raw/pdf/{asset_id}/{view_id}.pdf"
+        raise ValueError(f"Unknown view file kind: {kind}")
+
+    @staticmethod
+    def processed_rel_path(kind: str, asset_id: str, view_id: str, ext: str) -> str:
+        """
+        Relative path for a derived file (processed/{kind}/{asset_id}/{view_id}{ext}).
+        """
+        return f"processed/{kind}/{asset_id}/{view_id}{ext}"
+
+    @staticmethod
+    def thumb_rel_path(size: str, source: str, asset_id: str, view_id: str) -> str:
+        """
+        Relative path for a resized derivative of a view's sketch or raster.
+        """
+        return f"processed/thumbs/{size}/{asset_id}/{view_id}_{source}.webp"
+
+    @abstractmethod
+    def open_writer(self, rel_path: str, content_type: str) -> StorageWriter:
+        """
+        Open an incremental writer that lands at `rel_path` on commit.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_partial(self, upload_id: str, total_size: int) -> None:
+        """
+        Allocate the partial file backing a resumable upload session.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_partial(self, upload_id: str, offset: int, data: bytes) -> None:
+        """
+        Write `data` into the partial file at byte `offset`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def promote_partial(self, upload_id: str, rel_path: str, content_type: str) -> FileRef:
+        """
+        Move a completed partial file to `rel_path` and describe it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_partial(self, upload_id: str) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     def save_view_files(
         self,
@@ -1,12 +1,71 @@
 #backend/storage/filesystem.py
 from __future__ import annotations
+import hashlib
+import os
 from pathlib import Path
-from typing import Optional
+import shutil
+import time
+from typing import BinaryIO, Optional
+import uuid
 
+from backend.core.metrics import observe_storage_write
 from backend.db.common_models import FileRef
 from backend.db.view_models import ViewFiles
 from fastapi import UploadFile
-from backend.storage.base import StorageBackend
+from backend.storage.base import StorageBackend, StorageWriter
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileSystemWriter(StorageWriter):
+    """
+    Streams bytes into a temp file on the target filesystem, hashing as it
+    goes, and moves it into place on commit.
+    """
+    def __init__(self, storage: "FileSystemStorage", rel_path: str, content_type: str) -> None:
+        self.storage = storage
+        self.rel_path = rel_path.replace("\\", "/")
+        self.content_type = content_type
+        self.abs_path = storage.base_dir / rel_path
+        self.tmp_path = storage._tmp_path(self.abs_path)
+        self.size_bytes = 0
+        # Time spent in our own I/O; streaming uploads also wait on the client.
+        self.write_seconds = 0.0
+        self._hasher = hashlib.sha256()
+        self._fh = self.tmp_path.open("wb")
+    
+    def write(self, chunk: bytes) -> None:
+        t0 = time.perf_counter()
+        self._hasher.update(chunk)
+        self._fh.write(chunk)
+        self.size_bytes += len(chunk)
+        self.write_seconds += time.perf_counter() - t0
+    
+    def commit(self) -> FileRef:
+        t0 = time.perf_counter()
+        self._fh.close()
+        digest = self._hasher.hexdigest()
+        try:
+            if self.storage.dedupe:
+                self.storage._commit_blob(self.tmp_path, digest, self.abs_path)
+            else:
+                os.replace(self.tmp_path, self.abs_path)
+        finally:
+            self.tmp_path.unlink(missing_ok=True)
+        self.write_seconds += time.perf_counter() - t0
+        observe_storage_write("file", self.size_bytes, self.write_seconds)
+        
+        return FileRef(
+            rel_path=self.rel_path,
+            content_type=self.content_type,
+            size_bytes=self.size_bytes,
+            checksum=digest,
+        )
+    
+    def abort(self) -> None:
+        self._fh.close()
+        self.tmp_path.unlink(missing_ok=True)
 
 
 class FileSystemStorage(StorageBackend):
@@ -15,33 +74,148 @@ class FileSystemStorage(StorageBackend):
 
         raw/sketch/{asset_id}/{view_id}.{ext}
         raw/cad/{asset_id}/{view_id}.dwg
+        uploads/{upload_id}.part          (resumable uploads in progress)
+
+    With dedupe enabled, bytes live once in a content-addressed store and
+    the raw/ paths are hardlinks to it (plain copies if the share does not
+    support hardlinks):
+
+        blobs/sha256/{h[0:2]}/{h[2:4]}/{h}
     """
-    def __init__(self, base_dir: str) -> None:
+    def __init__(self, base_dir: str, dedupe: bool = True) -> None:
         self.base_dir = Path(base_dir).resolve()
+        self.dedupe = dedupe
     
     def _ensure_dir(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
     
-    def _save_upload(self, rel_path: str, upload: UploadFile) -> FileRef:
+    def abs_path(self, rel_path: str) -> Path:
+        return self.base_dir / rel_path
+    
+    @staticmethod
+    def blob_rel_path(digest: str) -> str:
+        return f"blobs/sha256/{digest[0:2]}/{digest[2:4]}/{digest}"
+    
+    def _tmp_path(self, abs_path: Path) -> Path:
+        # Temp files must sit on the same filesystem as their final home so the
+        # commit is a rename: next to the blob store, or next to the target.
+        if self.dedupe:
+            tmp = self.base_dir / "blobs" / "tmp" / f"{uuid.uuid4().hex}.part"
+        else:
+            tmp = abs_path.with_name(f".{abs_path.name}.{uuid.uuid4().hex}.part")
+        self._ensure_dir(tmp)
+        return tmp
+    
+    def _link_or_copy(self, src: Path, dst: Path) -> None:
+        self._ensure_dir(dst)
+        if dst.exists():
+            dst.unlink()
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+    
+    def _commit_blob(self, tmp_path: Path, digest: str, abs_path: Path) -> None:
+        """
+        Move a freshly written temp file into the blob store (or drop it if
+        the content is already there) and point `abs_path` at the blob.
+        """
+        blob_path = self.base_dir / self.blob_rel_path(digest)
+        if blob_path.exists():
+            tmp_path.unlink()
+        else:
+            self._ensure_dir(blob_path)
+            os.replace(tmp_path, blob_path)
+        self._link_or_copy(blob_path, abs_path)
+    
+    def open_writer(self, rel_path: str, content_type: str) -> FileSystemWriter:
+        self._ensure_dir(self.base_dir / rel_path)
+        return FileSystemWriter(self, rel_path, content_type)
+    
+    def _partial_path(self, upload_id: str) -> Path:
+        return self.base_dir / "uploads" / f"{upload_id}.part"
+    
+    def create_partial(self, upload_id: str, total_size: int) -> None:
+        path = self._partial_path(upload_id)
+        self._ensure_dir(path)
+        # Sparse on most filesystems; chunks fill it in at their offsets.
+        with path.open("wb") as f:
+            f.truncate(total_size)
+    
+    def write_partial(self, upload_id: str, offset: int, data: bytes) -> None:
+        t0 = time.perf_counter()
+        fd = os.open(self._partial_path(upload_id), os.O_WRONLY)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+        finally:
+            os.close(fd)
+        observe_storage_write("partial", len(data), time.perf_counter() - t0)
+    
+    def promote_partial(self, upload_id: str, rel_path: str, content_type: str) -> FileRef:
+        partial = self._partial_path(upload_id)
         abs_path = self.base_dir / rel_path
         self._ensure_dir(abs_path)
 
-        with abs_path.open("wb") as f:
-            while True:
-                chunk = upload.file.read(1024 * 1024)
-                if not chunk:
-                    break
-                f.write(chunk)
-        
-        size_bytes = abs_path.stat().st_size
-        content_type = upload.content_type or "application/octet-stream"
+        # Move the partial to a private name first: a chunk PUT racing the
+        # finalize can then no longer open it and change bytes already hashed.
+        promoting = partial.with_suffix(".promoting")
+        os.replace(partial, promoting)
+        try:
+            # Chunks may arrive out of order, so the hash needs its own pass here.
+            hasher = hashlib.sha256()
+            size_bytes = 0
+            with promoting.open("rb") as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    size_bytes += len(chunk)
+            digest = hasher.hexdigest()
+
+            if self.dedupe:
+                self._commit_blob(promoting, digest, abs_path)
+            else:
+                os.replace(promoting, abs_path)
+        except BaseException:
+            # Put the partial back so a released session can keep uploading.
+            if promoting.exists():
+                os.replace(promoting, partial)
+            raise
 
         return FileRef(
             rel_path=rel_path.replace("\\", "/"),
             content_type=content_type,
             size_bytes=size_bytes,
+            checksum=digest,
         )
     
+    def delete_partial(self, upload_id: str) -> None:
+        partial = self._partial_path(upload_id)
+        partial.unlink(missing_ok=True)
+        partial.with_suffix(".promoting").unlink(missing_ok=True)
+    
+    def save_stream(self, rel_path: str, src: BinaryIO, content_type: str) -> FileRef:
+        writer = self.open_writer(rel_path, content_type)
+        try:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+    
+    def _save_upload(self, rel_path: str, upload: UploadFile) -> FileRef:
+        content_type = upload.content_type or "application/octet-stream"
+        return self.save_stream(rel_path, upload.file, content_type)
+    
     def save_view_files(
             self,
             asset_id: str,
@@ -52,12 +226,11 @@ class FileSystemStorage(StorageBackend):
         files = ViewFiles()
         
         if sketch is not None:
-            ext = Path(sketch.filename or "").suffix or ".png"
-            rel_path = f"raw/sketch/{asset_id}/{view_id}{ext}"
+            rel_path = self.view_rel_path("sketch", asset_id, view_id, sketch.filename)
             files.sketch = self._save_upload(rel_path, sketch)
         
         if cad is not None:
-            rel_path = f"raw/cad/{asset_id}/{view_id}.dwg"
+            rel_path = self.view_rel_path("cad", asset_id, view_id)
             files.cad = self._save_upload(rel_path, cad)
         
         return files
@@ -0,0 +1,299 @@
+#backend/tools/backfill_projects.py
+"""
+Bulk importer for historical NAS project folders.
+
+Walks a source tree with os.scandir. Every directory that directly contains
+DWG or sketch files becomes one asset; each file becomes one view. Files
+are hashed and copied into the raw/ layout used by FileSystemStorage in a
+process pool, and assets/views are written to Mongo with batched
+insert_many calls.
+
+Asset naming follows the folder layout relative to --root:
+
+    {root}/{client_name}/{project_name}/.../{files}
+
+Progress is checkpointed (one JSON line per imported folder) so an
+interrupted run can be restarted with the same command and resumes where
+it stopped. Folders written to Mongo but not yet checkpointed are
+imported again without duplicates: assets are upserted on `source_dir`
+(unique index), and view ids are derived from the asset id and file
+name, so views and their raw/ paths come out the same and files whose
+view already exists are not copied again.
+
+Usage:
+
+    python -m backend.tools.backfill_projects --root "/mnt/legacy/Projects" \
+        --uploaded-by backfill --studio B1 --country India --workers 8
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from backend.core.config import settings
+from backend.db.asset_models import AssetCreate
+from backend.db.common_models import FileRef
+from backend.db.init_indexes import ensure_indexes
+from backend.db.mongo import get_database
+from backend.db.view_models import ViewCreate, ViewFiles
+from backend.services.asset_service import new_asset_doc
+from backend.services.view_service import new_view_doc
+from backend.storage.base import StorageBackend
+from backend.storage.filesystem import FileSystemStorage
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+CAD_EXTS = {".dwg"}
+SKETCH_EXTS = {".png", ".jpg", ".jpeg"}
+CONTENT_TYPES = {
+    ".dwg": "application/acad",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+}
+VIEW_TYPE_KEYWORDS = ("elevation", "plan", "section", "detail")
+
+# (source path, rel_path, content_type)
+CopyTask = Tuple[str, str, str]
+# (file name, source path, kind, view metadata)
+PlannedFile = Tuple[str, str, str, ViewCreate]
+
+
+def view_oid_for(asset_oid: ObjectId, filename: str) -> ObjectId:
+    """
+    Stable view id for a source file: the asset's timestamp bytes (so _id
+    order stays roughly chronological) plus a hash of the file name.
+    """
+    digest = hashlib.sha1(f"{asset_oid}/{filename}".encode("utf-8")).digest()
+    return ObjectId(asset_oid.binary[:4] + digest[:8])
+
+
+def _guess_view_type(filename: str) -> str:
+    lower = filename.lower()
+    for keyword in VIEW_TYPE_KEYWORDS:
+        if keyword in lower:
+            return keyword
+    return "detail"
+
+
+def walk_project_dirs(root: str) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """
+    Yield (directory, importable file entries) for every directory under
+    `root` that directly contains DWG or sketch files.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        files: List[os.DirEntry] = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(("__", ".")):
+                            stack.append(entry.path)
+                    elif Path(entry.name).suffix.lower() in CAD_EXTS | SKETCH_EXTS:
+                        files.append(entry)
+        except OSError as exc:
+            print(f"[WARN] Skipping unreadable directory {current}: {exc}")
+            continue
+        if files:
+            yield current, sorted(files, key=lambda e: e.name)
+
+
+_worker_storage: Optional[FileSystemStorage] = None
+
+
+def _init_worker(base_dir: str, dedupe: bool) -> None:
+    global _worker_storage
+    _worker_storage = FileSystemStorage(base_dir, dedupe=dedupe)
+
+
+def _copy_file(task: CopyTask) -> FileRef:
+    src_path, rel_path, content_type = task
+    with open(src_path, "rb") as src:
+        return _worker_storage.save_stream(rel_path, src, content_type)
+
+
+class Checkpoint:
+    """
+    Append-only record of source folders that are fully imported.
+    """
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.done: Set[str] = set()
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self.done.add(json.loads(line)["source_dir"])
+        self._fh = path.open("a", encoding="utf-8")
+
+    def mark(self, source_dirs: List[str]) -> None:
+        for source_dir in source_dirs:
+            self._fh.write(json.dumps({"source_dir": source_dir}) + "\n")
+            self.done.add(source_dir)
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.files = 0
+        self.bytes = 0
+        self.assets = 0
+
+    def report(self, prefix: str = "[INFO]") -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(
+            f"{prefix} assets={self.assets} files={self.files} "
+            f"({self.files / elapsed:.1f} files/s, {self.bytes / elapsed / (1024 * 1024):.1f} MB/s)"
+        )
+
+
+def _plan_folder(
+        source_dir: str,
+        entries: List[os.DirEntry],
+        root: str,
+        args: argparse.Namespace,
+        now: datetime,
+) -> Tuple[dict, List[PlannedFile]]:
+    """
+    Build the asset document and the per-file view plans for one folder.
+    """
+    parts = Path(os.path.relpath(source_dir, root)).parts
+    client_name = parts[0] if len(parts) > 1 else args.default_client
+    project_name = " / ".join(parts[1:]) if len(parts) > 1 else (parts[0] if parts and parts[0] != "." else Path(root).name)
+
+    asset = AssetCreate.model_validate({
+        "client_name": client_name[:100],
+        "project_name": project_name[:256],
+        "category": args.category,
+        "uploaded_by": args.uploaded_by,
+        "studio": args.studio,
+        "location": {"country": args.country},
+    })
+    asset_doc = new_asset_doc(asset, now)
+    asset_doc["_id"] = ObjectId()
+    asset_doc["source_dir"] = source_dir
+
+    planned = []
+    for entry in entries:
+        ext = Path(entry.name).suffix.lower()
+        kind = "cad" if ext in CAD_EXTS else "sketch"
+        meta = ViewCreate(view_type=_guess_view_type(entry.name), view_name=Path(entry.name).stem[:100])
+        planned.append((entry.name, entry.path, kind, meta))
+    return asset_doc, planned
+
+
+def _upsert_assets(db: Database, asset_docs: List[dict]) -> Tuple[Dict[str, ObjectId], int]:
+    """
+    Insert assets whose source_dir is new; returns source_dir -> _id for all
+    of them (existing ids win, so a resumed batch reuses its assets).
+    """
+    result = db["assets"].bulk_write(
+        [UpdateOne({"source_dir": d["source_dir"]}, {"$setOnInsert": d}, upsert=True) for d in asset_docs],
+        ordered=False,
+    )
+    ids = {
+        doc["source_dir"]: doc["_id"]
+        for doc in db["assets"].find({"source_dir": {"$in": [d["source_dir"] for d in asset_docs]}}, {"source_dir": 1})
+    }
+    return ids, result.upserted_count
+
+
+def run(args: argparse.Namespace) -> None:
+    root = os.path.abspath(args.root)
+    db = get_database()
+    ensure_indexes(db)  # the unique source_dir index makes re-imports upserts
+    checkpoint = Checkpoint(Path(args.checkpoint))
+    stats = Stats()
+
+    # Folders planned but not yet copied/inserted; copied together so the
+    # pool stays busy across many small folders.
+    planned_batch: List[Tuple[dict, List[PlannedFile]]] = []
+    planned_files = 0
+
+    def _flush(pool: ProcessPoolExecutor) -> None:
+        asset_ids, new_assets = _upsert_assets(db, [asset_doc for asset_doc, _ in planned_batch])
+        stats.assets += new_assets
+
+        views: List[Tuple[str, ObjectId, ViewCreate, str, datetime]] = []
+        tasks: List[CopyTask] = []
+        for asset_doc, planned in planned_batch:
+            asset_oid = asset_ids[asset_doc["source_dir"]]
+            for name, src_path, kind, meta in planned:
+                view_oid = view_oid_for(asset_oid, name)
+                rel_path = StorageBackend.view_rel_path(kind, str(asset_oid), str(view_oid), name)
+                views.append((str(asset_oid), view_oid, meta, kind, asset_doc["uploaded_at"]))
+                tasks.append((src_path, rel_path, CONTENT_TYPES[Path(name).suffix.lower()]))
+
+        # Views already written by an interrupted run keep their files.
+        existing = {doc["_id"] for doc in db["views"].find({"_id": {"$in": [v[1] for v in views]}}, {"_id": 1})}
+        todo = [i for i, v in enumerate(views) if v[1] not in existing]
+        todo_tasks = [tasks[i] for i in todo]
+        file_refs = pool.map(_copy_file, todo_tasks, chunksize=max(1, len(todo_tasks) // (args.workers * 4)))
+
+        ops = []
+        for i, ref in zip(todo, file_refs):
+            asset_id, view_oid, meta, kind, uploaded_at = views[i]
+            view_doc = new_view_doc(asset_id, view_oid, meta, ViewFiles(**{kind: ref}), uploaded_at)
+            ops.append(UpdateOne({"_id": view_oid}, {"$setOnInsert": view_doc}, upsert=True))
+            stats.files += 1
+            stats.bytes += ref.size_bytes or 0
+        if ops:
+            db["views"].bulk_write(ops, ordered=False)
+        # Only checkpoint once the documents are durable in Mongo.
+        checkpoint.mark([asset_doc["source_dir"] for asset_doc, _ in planned_batch])
+        planned_batch.clear()
+        stats.report()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(settings.file_base_dir, settings.storage_dedupe),
+    ) as pool:
+        for source_dir, entries in walk_project_dirs(root):
+            if source_dir in checkpoint.done:
+                continue
+
+            planned_batch.append(_plan_folder(source_dir, entries, root, args, datetime.now(timezone.utc)))
+            planned_files += len(entries)
+            if planned_files >= args.batch_size:
+                _flush(pool)
+                planned_files = 0
+        if planned_batch:
+            _flush(pool)
+
+    checkpoint.close()
+    stats.report(prefix="[DONE]")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import historical project folders into assets/views.")
+    parser.add_argument("--root", required=True, help="Top-level folder to import.")
+    parser.add_argument("--checkpoint", default="backfill_checkpoint.jsonl", help="Checkpoint file (resume state).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=500, help="Views per insert_many batch.")
+    parser.add_argument("--category", default="wardrobe", choices=["wardrobe", "chair", "table"])
+    parser.add_argument("--uploaded-by", required=True)
+    parser.add_argument("--studio", required=True, choices=["B1", "B2", "F1", "F2", "S1", "S2"])
+    parser.add_argument("--country", required=True)
+    parser.add_argument("--default-client", default="Unknown", help="client_name for folders directly under --root.")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
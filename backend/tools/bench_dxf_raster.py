@@ -0,0 +1,73 @@
+#backend/tools/bench_dxf_raster.py
+"""
+Throughput of the Linux rasterizer against the AutoCAD PNGOUT path.
+
+The PNGOUT path (SendCommand + fixed 10 s wait per drawing) tops out at
+about 6 drawings/min per Windows box. This renders every DXF/DWG under
+--input at each worker count and reports drawings/min and the speedup
+over that baseline. Output PNGs go to a temp dir (or --out).
+
+    python -m backend.tools.bench_dxf_raster --input samples/ --workers 1,2,4,8
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Tuple
+
+from backend.processing.dxf_raster import load_drawing, parse_extents, render_png, RasterOptions
+
+
+PNGOUT_SECONDS_PER_DRAWING = 10.0
+
+
+def _render(task: Tuple[str, str, RasterOptions]) -> Tuple[bool, int]:
+    src, dst, options = task
+    try:
+        png = render_png(load_drawing(src), options)
+    except Exception as exc:
+        print(f"[ERROR] {src}: {exc}")
+        return False, 0
+    Path(dst).write_bytes(png)
+    return True, len(png)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DXF rasterization vs PNGOUT.")
+    parser.add_argument("--input", required=True, help="Folder with .dxf/.dwg files (searched recursively).")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts.")
+    parser.add_argument("--dpi", type=int, default=RasterOptions.dpi)
+    parser.add_argument("--max-px", type=int, default=RasterOptions.max_px)
+    parser.add_argument("--extents", default="auto")
+    parser.add_argument("--out", help="Keep PNGs here instead of a temp dir.")
+    args = parser.parse_args()
+
+    files: List[Path] = sorted(p for p in Path(args.input).rglob("*") if p.suffix.lower() in (".dxf", ".dwg"))
+    if not files:
+        raise SystemExit(f"[ERROR] No .dxf/.dwg files under {args.input}")
+    options = RasterOptions(dpi=args.dpi, max_px=args.max_px, extents=parse_extents(args.extents))
+    out_dir = Path(args.out or tempfile.mkdtemp(prefix="raster_bench_"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(str(p), str(out_dir / f"{i:05d}_{p.stem}.png"), options) for i, p in enumerate(files)]
+
+    baseline = 60.0 / PNGOUT_SECONDS_PER_DRAWING
+    print(f"[INFO] {len(files)} drawings, dpi={options.dpi}, max_px={options.max_px}, output={out_dir}")
+    print(f"[INFO] PNGOUT baseline: {baseline:.1f} drawings/min per AutoCAD box")
+    for workers in (int(w) for w in args.workers.split(",")):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(_render, tasks))
+            elapsed = time.perf_counter() - started
+        ok = sum(1 for success, _ in results if success)
+        size = sum(n for _, n in results)
+        rate = ok / elapsed * 60
+        print(
+            f"workers={workers:<3} {ok}/{len(tasks)} ok in {elapsed:7.2f}s  {rate:8.1f} drawings/min  "
+            f"x{rate / baseline:.1f} vs PNGOUT  avg {size / max(ok, 1) / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#backend/tools/bench_model_conversions.py
+"""
+Micro-benchmarks for the DB-document -> response conversions in
+backend/db/*_models.py.
+
+Compares the old path (validate into *InDB, dump, validate into *Public,
+then FastAPI validating/encoding again against response_model and
+json.dumps) with the current one (validate once into *Public, serialize
+with orjson). No Mongo needed; documents are synthetic.
+
+    python -m backend.tools.bench_model_conversions [--page-size 500]
+"""
+from __future__ import annotations
+import argparse
+from datetime import datetime, timezone
+import json
+import timeit
+from typing import Callable, List
+
+from bson import ObjectId
+from backend.api.responses import FastJSONResponse, model_json
+from backend.db.asset_models import AssetInDB, AssetPublic, AssetTagTextState
+from backend.db.view_models import ViewInDB, ViewPublic
+from backend.services.asset_service import asset_doc_to_public
+from backend.services.view_service import view_doc_to_public
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+
+def _asset_doc() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "client_name": "Marriott",
+        "project_name": "Walk in Closet Detail",
+        "category": "wardrobe",
+        "subcategory": "walk-in",
+        "project_type": "hospitality",
+        "room_type": "master bedroom",
+        "style": "modern",
+        "created_by": "designer_01",
+        "uploaded_by": "designer_01",
+        "studio": "F1",
+        "location": {"country": "India", "city": "Mumbai"},
+        "tags": [{"category": "door", "value": "sliding"}, {"category": "handle", "value": "profile"}],
+        "uploaded_at": now,
+        "updated_at": now,
+        "tag_text_state": AssetTagTextState().model_dump(),
+    }
+
+
+def _view_doc() -> dict:
+    now = datetime.now(timezone.utc)
+    oid = ObjectId()
+    return {
+        "_id": oid,
+        "asset_id": str(ObjectId()),
+        "view_type": "elevation",
+        "orientation": "North",
+        "scale": "1:20",
+        "view_name": "W1 elevation",
+        "description": None,
+        "files": {
+            "sketch": {"rel_path": f"raw/sketch/a/{oid}.png", "content_type": "image/png", "size_bytes": 123456, "checksum": "ab" * 32},
+            "cad": {"rel_path": f"raw/cad/a/{oid}.dwg", "content_type": "application/acad", "size_bytes": 2345678, "checksum": "cd" * 32},
+            "raster": None,
+            "metadata": None,
+        },
+        "status": "Pending Processing",
+        "last_processing_error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+_asset_adapter = TypeAdapter(AssetPublic)
+_view_adapter = TypeAdapter(ViewPublic)
+_asset_list_adapter = TypeAdapter(List[AssetPublic])
+
+
+def _legacy_asset(doc: dict) -> bytes:
+    doc = {**doc, "_id": str(doc["_id"])}
+    public = AssetPublic.model_validate(AssetInDB.model_validate(doc).model_dump(by_alias=False))
+    # FastAPI response_model handling: dump, validate again, encode, json.dumps
+    revalidated = _asset_adapter.validate_python(public.model_dump())
+    return json.dumps(jsonable_encoder(revalidated)).encode("utf-8")
+
+
+def _current_asset(doc: dict) -> bytes:
+    public = asset_doc_to_public(doc)
+    return model_json(public)
+
+
+def _legacy_view(doc: dict) -> bytes:
+    doc = {**doc, "_id": str(doc["_id"])}
+    public = ViewPublic.model_validate(ViewInDB.model_validate(doc).model_dump(by_alias=False))
+    revalidated = _view_adapter.validate_python(public.model_dump())
+    return json.dumps(jsonable_encoder(revalidated)).encode("utf-8")
+
+
+def _current_view(doc: dict) -> bytes:
+    public = view_doc_to_public(doc)
+    return model_json(public)
+
+
+def _legacy_page(docs: List[dict]) -> bytes:
+    items = [asset_doc_to_public(d) for d in docs]
+    revalidated = _asset_list_adapter.validate_python([i.model_dump() for i in items])
+    return json.dumps(jsonable_encoder(revalidated)).encode("utf-8")
+
+
+def _current_page(docs: List[dict]) -> bytes:
+    # Listing path: projected dicts, rendered by orjson.
+    items = []
+    for doc in docs:
+        item = {"id": str(doc["_id"])}
+        item.update((k, v) for k, v in doc.items() if k not in ("_id", "tag_text_state"))
+        items.append(item)
+    return FastJSONResponse({"items": items, "next_cursor": None}).body
+
+
+def _bench(label: str, legacy: Callable[[], bytes], current: Callable[[], bytes], number: int) -> None:
+    t_legacy = min(timeit.repeat(legacy, number=number, repeat=5)) / number
+    t_current = min(timeit.repeat(current, number=number, repeat=5)) / number
+    print(
+        f"{label:<28} legacy {t_legacy * 1e6:>10.1f} us   current {t_current * 1e6:>10.1f} us   "
+        f"speedup x{t_legacy / t_current:.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark model conversion paths.")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--number", type=int, default=2000, help="Iterations for single-document benchmarks.")
+    args = parser.parse_args()
+
+    asset_doc = _asset_doc()
+    view_doc = _view_doc()
+    page_docs = [_asset_doc() for _ in range(args.page_size)]
+
+    _bench("asset doc -> JSON", lambda: _legacy_asset(asset_doc), lambda: _current_asset(asset_doc), args.number)
+    _bench("view doc -> JSON", lambda: _legacy_view(view_doc), lambda: _current_view(view_doc), args.number)
+    _bench(
+        f"asset page ({args.page_size}) -> JSON",
+        lambda: _legacy_page(page_docs),
+        lambda: _current_page(page_docs),
+        max(1, args.number // args.page_size),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#backend/tools/bench_view_uploads.py
+"""
+Concurrency benchmark for POST /assets/{asset_id}/views.
+
+Creates a throwaway asset, then for each concurrency level fires a fixed
+number of view uploads (one synthetic DWG each) while probing /health in
+the background. Reports uploads/s, MB/s, upload latency percentiles and the
+worst /health latency seen during the run, so event-loop stalls show up
+directly.
+
+Usage (against a running backend):
+
+    python -m backend.tools.bench_view_uploads --base-url http://localhost:8000 \
+        --file-size-mb 8 --uploads-per-level 128
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+DEFAULT_LEVELS = "1,2,4,8,16,32,64"
+
+ASSET_PAYLOAD = {
+    "client_name": "bench",
+    "project_name": "bench_view_uploads",
+    "category": "wardrobe",
+    "uploaded_by": "bench",
+    "studio": "B1",
+    "location": {"country": "India"},
+}
+
+VIEW_PAYLOAD = json.dumps({"view_type": "elevation", "view_name": "bench"})
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def _probe_health(client: httpx.AsyncClient, stop: asyncio.Event, samples: List[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await client.get("/health")
+        samples.append(time.perf_counter() - t0)
+        await asyncio.sleep(0.05)
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    asset_id: str,
+    blob: bytes,
+    concurrency: int,
+    total_uploads: int,
+) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def _one() -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            resp = await client.post(
+                f"/assets/{asset_id}/views",
+                data={"payload_json": VIEW_PAYLOAD},
+                files={"cad": ("bench.dwg", blob, "application/acad")},
+            )
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 201:
+                errors += 1
+
+    stop = asyncio.Event()
+    health_samples: List[float] = []
+    prober = asyncio.create_task(_probe_health(client, stop, health_samples))
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(total_uploads)))
+    elapsed = time.perf_counter() - t_start
+
+    stop.set()
+    await prober
+
+    total_mb = len(blob) * total_uploads / (1024 * 1024)
+    return {
+        "concurrency": concurrency,
+        "uploads_per_s": total_uploads / elapsed,
+        "mb_per_s": total_mb / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "health_max_ms": max(health_samples, default=0.0) * 1000,
+        "errors": errors,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    blob = os.urandom(int(args.file_size_mb * 1024 * 1024))
+
+    limits = httpx.Limits(max_connections=max(levels) + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        resp = await client.post("/assets", json=ASSET_PAYLOAD)
+        resp.raise_for_status()
+        asset_id = resp.json()["id"]
+        print(f"[INFO] Benchmark asset: {asset_id} | file size: {args.file_size_mb} MiB")
+
+        header = f"{'conc':>5} {'uploads/s':>10} {'MB/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'health max ms':>14} {'errors':>7}"
+        print(header)
+        print("-" * len(header))
+        for level in levels:
+            row = await _run_level(client, asset_id, blob, level, args.uploads_per_level)
+            print(
+                f"{row['concurrency']:>5} {row['uploads_per_s']:>10.1f} {row['mb_per_s']:>9.1f} "
+                f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['health_max_ms']:>14.1f} {row['errors']:>7}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent view uploads.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS, help="Comma-separated concurrency levels.")
+    parser.add_argument("--uploads-per-level", type=int, default=64)
+    parser.add_argument("--file-size-mb", type=float, default=4.0)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
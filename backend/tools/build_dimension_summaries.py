@@ -0,0 +1,121 @@
+#backend/tools/build_dimension_summaries.py
+"""
+Compute views.dimension_summary (and the per-asset roll-up in
+assets.dimension_summary) from the entity store (build_entity_store).
+
+Dimension text from the PDFs is parsed to mm in one vectorized pass; its
+bbox tells horizontal from vertical dimensions. DWG Measurement values are
+added to the histogram and max (scaled by --dwg-unit).
+
+    python -m backend.tools.build_dimension_summaries [--asset-id A1] [--dwg-unit mm]
+"""
+from __future__ import annotations
+import argparse
+from pathlib import Path
+import time
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.processing.dimensions import HISTOGRAM_EDGES_MM, MM_PER_UNIT, parse_dimensions, summarize_views
+from backend.processing.entity_store import EntityStore
+from backend.storage.filesystem import FileSystemStorage
+import numpy as np
+import pyarrow.compute as pc
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+BATCH = 1000
+
+
+def _view_types(db: Database, view_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for i in range(0, len(view_ids), BATCH):
+        oids = [ObjectId(v) for v in view_ids[i:i + BATCH] if ObjectId.is_valid(v)]
+        for doc in db["views"].find({"_id": {"$in": oids}}, {"view_type": 1, "asset_id": 1}):
+            out[str(doc["_id"])] = doc
+    return out
+
+
+def rollup_assets(db: Database, asset_ids: List[str]) -> int:
+    """
+    assets.dimension_summary = max extents / summed histogram over the asset's views.
+    """
+    ops = []
+    for asset_id in asset_ids:
+        extents = {"width_mm": None, "height_mm": None, "depth_mm": None, "max_mm": None}
+        hist = np.zeros(len(HISTOGRAM_EDGES_MM) + 1, dtype=np.int64)
+        count = 0
+        for view in db["views"].find(
+                {"asset_id": asset_id, "dimension_summary": {"$ne": None}}, {"dimension_summary": 1},
+        ):
+            summary = view["dimension_summary"]
+            for key in extents:
+                if summary.get(key) is not None:
+                    extents[key] = max(extents[key] or 0.0, summary[key])
+            hist += np.asarray(summary.get("histogram") or np.zeros_like(hist))
+            count += summary.get("count", 0)
+        if not count or not ObjectId.is_valid(asset_id):
+            continue
+        counts = hist.tolist()
+        ops.append(UpdateOne(
+            {"_id": ObjectId(asset_id)},
+            {"$set": {"dimension_summary": {
+                **extents, "count": count, "histogram": counts, "bins": [i for i, c in enumerate(counts) if c],
+            }}},
+        ))
+    if ops:
+        db["assets"].bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build numeric dimension summaries for views and assets.")
+    parser.add_argument("--root", help="Entity store root (default: {FILE_BASE_DIR}/processed/entity_store).")
+    parser.add_argument("--asset-id", action="append", dest="asset_ids", help="Only these assets (repeatable).")
+    parser.add_argument("--dwg-unit", choices=sorted(MM_PER_UNIT), default="mm", help="Drawing unit of DWG measurements.")
+    args = parser.parse_args()
+
+    storage = FileSystemStorage(settings.file_base_dir, dedupe=settings.storage_dedupe)
+    store = EntityStore(Path(args.root) if args.root else storage.abs_path("processed/entity_store"))
+    scope = [("asset_id", "in", args.asset_ids)] if args.asset_ids else []
+
+    started = time.perf_counter()
+    texts = store.read_latest(
+        "texts", ["view_id", "text", "x0", "y0", "x1", "y1"],
+        filter=[*scope, ("source", "=", "pdf"), ("category", "=", "dimension")],
+    )
+    dwg = store.read_latest("dimensions", ["view_id", "measurement"], filter=[*scope, ("source", "=", "dwg")])
+
+    pdf_mm = parse_dimensions(texts["text"])
+    width = pc.subtract(texts["x1"], texts["x0"]).to_numpy(zero_copy_only=False)
+    height = pc.subtract(texts["y1"], texts["y0"]).to_numpy(zero_copy_only=False)
+    dwg_mm = dwg["measurement"].to_numpy(zero_copy_only=False).astype(np.float64) * MM_PER_UNIT[args.dwg_unit]
+
+    view_ids = texts["view_id"].to_pylist() + dwg["view_id"].to_pylist()
+    values = np.concatenate([pdf_mm, dwg_mm])
+    horizontal = np.concatenate([width >= height, np.zeros(len(dwg_mm), dtype=bool)])
+    oriented = np.concatenate([~(np.isnan(width) | np.isnan(height)), np.zeros(len(dwg_mm), dtype=bool)])
+    parsed = time.perf_counter()
+    print(f"[INFO] {len(values)} dimension values ({int(np.isnan(pdf_mm).sum())} unparsed) in {parsed - started:.1f}s")
+
+    db = get_database()
+    views = _view_types(db, sorted(set(view_ids)))
+    summaries = summarize_views(view_ids, values, horizontal, oriented, {k: v.get("view_type") for k, v in views.items()})
+
+    ops = [
+        UpdateOne({"_id": ObjectId(view_id)}, {"$set": {"dimension_summary": summary}})
+        for view_id, summary in summaries.items() if view_id in views
+    ]
+    for i in range(0, len(ops), BATCH):
+        db["views"].bulk_write(ops[i:i + BATCH], ordered=False)
+    print(f"[OK] {len(ops)} view summaries written")
+
+    assets = rollup_assets(db, sorted({views[v]["asset_id"] for v in summaries if v in views}))
+    print(f"[DONE] {assets} asset roll-ups in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#backend/tools/build_entity_store.py
+"""
+Load extracted entities into the columnar entity store
+(backend/processing/entity_store.py), by default at
+{FILE_BASE_DIR}/processed/entity_store.
+
+Sources:
+  - views.files.metadata (PDF span JSON from extract_pdf_metadata)
+  - --entities-dir: {view_id}.json outputs of
+    `python -m cad_worker_windows.extract_metadata --out ...`
+
+    python -m backend.tools.build_entity_store --entities-dir /mnt/assets/processed/entities
+    python -m backend.tools.build_entity_store --compact-only
+"""
+from __future__ import annotations
+import argparse
+import json
+from pathlib import Path
+import time
+from typing import Optional
+
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.processing.entity_store import EntityStore, EntityStoreWriter, TABLES
+from backend.storage.filesystem import FileSystemStorage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build/append the Parquet entity store.")
+    parser.add_argument("--root", help="Store root (default: {FILE_BASE_DIR}/processed/entity_store).")
+    parser.add_argument("--entities-dir", help="Folder of {view_id}.json DWG extraction outputs.")
+    parser.add_argument("--asset-id", help="Only this asset's views.")
+    parser.add_argument("--compact-only", action="store_true", help="Skip loading; only compact partitions.")
+    args = parser.parse_args()
+
+    storage = FileSystemStorage(settings.file_base_dir, dedupe=settings.storage_dedupe)
+    root = Path(args.root) if args.root else storage.abs_path("processed/entity_store")
+    entities_dir: Optional[Path] = Path(args.entities_dir) if args.entities_dir else None
+
+    if not args.compact_only:
+        db = get_database()
+        query = {"asset_id": args.asset_id} if args.asset_id else {}
+        writer = EntityStoreWriter(root)
+        started = time.perf_counter()
+        views = 0
+        for view in db["views"].find(query, {"_id": 1, "asset_id": 1, "files.metadata": 1}).sort("_id", 1):
+            view_id = str(view["_id"])
+            loaded = False
+            ref = (view.get("files") or {}).get("metadata")
+            if ref:
+                with storage.abs_path(ref["rel_path"]).open("rb") as f:
+                    writer.add_pdf_metadata(view["asset_id"], view_id, json.load(f))
+                loaded = True
+            if entities_dir is not None:
+                path = entities_dir / f"{view_id}.json"
+                if path.exists():
+                    writer.add_extraction(view["asset_id"], view_id, json.loads(path.read_text(encoding="utf-8")))
+                    loaded = True
+            views += loaded
+            if views and views % 1000 == 0 and loaded:
+                print(f"[INFO] {views} views loaded ({views / (time.perf_counter() - started):.0f} views/s)")
+        writer.close()
+        print(f"[OK] run {writer.run_id}: {views} views -> {root}")
+
+    store = EntityStore(root)
+    for table in TABLES:
+        print(f"[OK] {table}: compacted {store.compact(table)} partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#backend/tools/build_thumbnails.py
+"""
+Build thumbnail / preview / model-input derivatives for view sketches and
+rasters (see backend/processing/thumbnails.py).
+
+Idempotent: a derivative is rebuilt only when the checksum of its source
+changed, so the tool can be re-run after every upload/raster batch.
+
+    python -m backend.tools.build_thumbnails --workers 8
+    python -m backend.tools.build_thumbnails --asset-id 6650f0c2... --force
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.processing.thumbnails import init_worker, thumbnail_batch
+
+
+def _selection(asset_id: Optional[str], after: Optional[ObjectId]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"$or": [{"files.sketch.checksum": {"$ne": None}}, {"files.raster.checksum": {"$ne": None}}]}
+    if asset_id:
+        query["asset_id"] = asset_id
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build WebP thumbnails/previews for views.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--asset-id", help="Only this asset's views.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source is unchanged.")
+    args = parser.parse_args()
+
+    db = get_database()
+    projection = {"_id": 1, "asset_id": 1, "files.sketch": 1, "files.raster": 1, "files.thumbs": 1}
+    started = time.perf_counter()
+    totals = [0, 0, 0]
+    after: Optional[ObjectId] = None
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=init_worker,
+        initargs=(settings.file_base_dir, settings.storage_dedupe),
+    ) as pool:
+        while True:
+            views: List[dict] = list(
+                db["views"].find(_selection(args.asset_id, after), projection).sort("_id", 1).limit(args.batch_size)
+            )
+            if not views:
+                break
+            after = views[-1]["_id"]
+            for i, n in enumerate(thumbnail_batch(db, pool, views, force=args.force)):
+                totals[i] += n
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(
+                f"[INFO] derivatives={totals[0]} failed_sources={totals[1]} up_to_date={totals[2]} "
+                f"({totals[0] / elapsed:.1f} derivatives/s)"
+            )
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#backend/tools/explain_listing_queries.py
+"""
+Verify that the catalog listing queries are index-backed.
+
+Runs `explain()` for the query shapes produced by GET /assets and
+GET /assets/{asset_id}/views (every supported filter, both sort keys, with
+and without a cursor) and fails if any winning plan contains a COLLSCAN, or
+a blocking SORT over assets (the order must come from an index). View
+listings are scoped to one asset, so a SORT there only covers that asset's
+views and is reported without failing.
+Run after `ensure_indexes()` against a populated database:
+
+    python -m backend.tools.explain_listing_queries
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from bson import ObjectId
+from backend.db.init_indexes import ensure_indexes
+from backend.db.mongo import get_database
+from backend.services import pagination
+from backend.services.asset_service import asset_list_filter
+from backend.services.dimension_filters import dimension_range_filter
+from backend.services.view_service import view_list_filter
+from pymongo.collection import Collection
+
+
+def _stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+def _cursor_for(sort_field: str) -> str:
+    doc = {"_id": ObjectId(), "updated_at": datetime.now(timezone.utc).replace(tzinfo=None)}
+    return pagination.encode_cursor(doc, sort_field)
+
+
+def _query_shapes() -> List[Tuple[str, str, Dict[str, Any]]]:
+    asset_filters = {
+        "unfiltered": asset_list_filter(),
+        "client_name": asset_list_filter(client_name="x"),
+        "project_name": asset_list_filter(project_name="x"),
+        "category": asset_list_filter(category="wardrobe"),
+        "tags": asset_list_filter(tag_category="door", tag_value="sliding"),
+        "width range": asset_list_filter(dimensions=dimension_range_filter({"width": (1800, 2400)})),
+        "height max": asset_list_filter(dimensions=dimension_range_filter({"height": (None, 2100)})),
+    }
+    view_filters = {
+        "asset_id": view_list_filter(str(ObjectId())),
+        "asset_id+status": view_list_filter(str(ObjectId()), status="Pending Processing"),
+        "asset_id+view_type": view_list_filter(str(ObjectId()), view_type="elevation"),
+        "asset_id+width range": view_list_filter(
+            str(ObjectId()), dimensions=dimension_range_filter({"width": (1800, 2400)}),
+        ),
+    }
+    shapes = []
+    for collection, filters in (("assets", asset_filters), ("views", view_filters)):
+        for name, query in filters.items():
+            shapes.append((collection, name, query))
+    return shapes
+
+
+def _explain(coll: Collection, query: Dict[str, Any], sort_field: str, cursor: str | None) -> dict:
+    direction = pagination.parse_direction("desc")
+    full = pagination.combine_filters(query, pagination.keyset_filter(sort_field, direction, cursor))
+    return coll.find(full).sort(pagination.sort_spec(sort_field, direction)).limit(51).explain()
+
+
+def main() -> None:
+    db = get_database()
+    ensure_indexes(db)
+
+    failures = 0
+    for collection, name, query in _query_shapes():
+        for sort_field in ("_id", "updated_at"):
+            for cursor in (None, _cursor_for(sort_field)):
+                plan = _explain(db[collection], query, sort_field, cursor)
+                stages = set(_stages(plan.get("queryPlanner", {}).get("winningPlan", {})))
+                label = f"{collection:<6} {name:<20} sort={sort_field:<10} cursor={'yes' if cursor else 'no ':<3}"
+                if "COLLSCAN" in stages or ("SORT" in stages and collection == "assets"):
+                    failures += 1
+                    print(f"[FAIL] {label} stages={sorted(stages)}")
+                elif "SORT" in stages:
+                    print(f"[WARN] {label} stages={sorted(stages)}")
+                else:
+                    print(f"[OK]   {label} stages={sorted(stages)}")
+
+    if failures:
+        print(f"[ERROR] {failures} listing query shape(s) fall back to COLLSCAN or an in-memory SORT.")
+        sys.exit(1)
+    print("[OK] All listing query shapes are index-backed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#backend/tools/extract_pdf_metadata.py
+"""
+Extract drawing metadata from view PDFs (files.pdf) on Linux.
+
+Selects views that have a PDF but no files.metadata yet, in _id order,
+and processes them in batches: every page is a separate task on a process
+pool, results stream to processed/metadata/{asset_id}/{view_id}.json and
+views.files.metadata is updated with one bulk_write per batch. Views that
+fail get metadata_error and are skipped until the next --reprocess.
+
+    python -m backend.tools.extract_pdf_metadata --workers 8
+    python -m backend.tools.extract_pdf_metadata --follow      # keep running
+    python -m backend.tools.extract_pdf_metadata --reprocess   # redo everything
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.processing.pdf_metadata import extract_batch
+from backend.storage.filesystem import FileSystemStorage
+
+
+def _selection(reprocess: bool, after: Optional[ObjectId]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"files.pdf.rel_path": {"$exists": True}}
+    if not reprocess:
+        query["files.metadata"] = None
+        query["metadata_error"] = None
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return query
+
+
+def run_once(db, storage: FileSystemStorage, pool: ProcessPoolExecutor, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    total_ok = total_failed = total_pages = 0
+    after: Optional[ObjectId] = None
+    while True:
+        views: List[dict] = list(
+            db["views"]
+            .find(_selection(args.reprocess, after), {"_id": 1, "asset_id": 1, "files.pdf": 1})
+            .sort("_id", 1)
+            .limit(args.batch_size)
+        )
+        if not views:
+            break
+        after = views[-1]["_id"]
+
+        ok, failed, pages = extract_batch(db, storage, pool, views)
+        total_ok += ok
+        total_failed += failed
+        total_pages += pages
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"[INFO] views ok={total_ok} failed={total_failed} pages={total_pages} "
+            f"({total_pages / elapsed:.1f} pages/s)"
+        )
+    return total_ok + total_failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract drawing metadata from view PDFs.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=50, help="Views per batch / bulk_write.")
+    parser.add_argument("--reprocess", action="store_true", help="Also redo views that already have metadata.")
+    parser.add_argument("--follow", action="store_true", help="Keep running and pick up new PDFs.")
+    parser.add_argument("--interval", type=float, default=10.0, help="Idle wait between scans with --follow.")
+    args = parser.parse_args()
+
+    db = get_database()
+    storage = FileSystemStorage(settings.file_base_dir, dedupe=settings.storage_dedupe)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        while True:
+            processed = run_once(db, storage, pool, args)
+            if not args.follow:
+                break
+            # After a full pass only views without metadata are interesting again.
+            args.reprocess = False
+            if not processed:
+                time.sleep(args.interval)
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+#backend/tools/gc_upload_sessions.py
+"""
+Garbage-collect stale resumable upload sessions and their partial files.
+
+Run periodically (cron / compose `run`):
+
+    python -m backend.tools.gc_upload_sessions [--ttl-seconds 86400]
+"""
+from __future__ import annotations
+import argparse
+
+from backend.api.deps import get_storage
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.services.upload_service import gc_stale_sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete stale resumable upload sessions.")
+    parser.add_argument("--ttl-seconds", type=int, default=settings.upload_session_ttl_seconds)
+    args = parser.parse_args()
+
+    removed = gc_stale_sessions(get_database(), get_storage(), args.ttl_seconds)
+    print(f"[INFO] Removed {removed} stale upload session(s) older than {args.ttl_seconds}s.")
+
+
+if __name__ == "__main__":
+    main()
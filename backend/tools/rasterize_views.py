@@ -0,0 +1,83 @@
+#backend/tools/rasterize_views.py
+"""
+Render processed/raster/{asset_id}/{view_id}.png for views on Linux.
+
+Selects views with a CAD file but no files.raster (and no raster_error),
+in _id order, and renders them in batches on a process pool (one drawing
+per task). DWG needs the ODA File Converter on the host; DXF does not.
+
+    python -m backend.tools.rasterize_views --workers 8 --dpi 150 --max-px 2048
+    python -m backend.tools.rasterize_views --extents 0,0,3000,2400   # fixed window
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from backend.core.config import settings
+from backend.db.mongo import get_database
+from backend.processing.dxf_raster import init_worker, parse_extents, rasterize_batch, RasterOptions
+from backend.storage.filesystem import FileSystemStorage
+
+
+def _selection(reprocess: bool, after: Optional[ObjectId]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"files.cad.rel_path": {"$exists": True}}
+    if not reprocess:
+        query["files.raster"] = None
+        query["raster_error"] = None
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rasterize view CAD files without AutoCAD.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dpi", type=int, default=RasterOptions.dpi, help="Pixels per drawing inch (unitless = mm).")
+    parser.add_argument("--max-px", type=int, default=RasterOptions.max_px, help="Cap on the longest side in pixels.")
+    parser.add_argument("--extents", default="auto", help='"auto" or "x0,y0,x1,y1" in drawing units.')
+    parser.add_argument("--color", action="store_true", help="Keep layer colors instead of black on white.")
+    parser.add_argument("--reprocess", action="store_true")
+    args = parser.parse_args()
+
+    options = RasterOptions(
+        dpi=args.dpi,
+        max_px=args.max_px,
+        extents=parse_extents(args.extents),
+        monochrome=not args.color,
+    )
+    db = get_database()
+    storage = FileSystemStorage(settings.file_base_dir, dedupe=settings.storage_dedupe)
+
+    started = time.perf_counter()
+    total_ok = total_failed = 0
+    after: Optional[ObjectId] = None
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=init_worker,
+        initargs=(settings.file_base_dir, settings.storage_dedupe),
+    ) as pool:
+        while True:
+            views: List[dict] = list(
+                db["views"]
+                .find(_selection(args.reprocess, after), {"_id": 1, "asset_id": 1, "files.cad": 1})
+                .sort("_id", 1)
+                .limit(args.batch_size)
+            )
+            if not views:
+                break
+            after = views[-1]["_id"]
+            ok, failed = rasterize_batch(db, storage, pool, views, options)
+            total_ok += ok
+            total_failed += failed
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(f"[INFO] rasters ok={total_ok} failed={total_failed} ({(total_ok + total_failed) / elapsed * 60:.1f} drawings/min)")
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
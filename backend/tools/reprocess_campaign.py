@@ -0,0 +1,87 @@
+#backend/tools/reprocess_campaign.py
+"""
+Bulk reprocessing campaigns (backend/services/campaign_service.py).
+
+    # create: select views not yet processed by extractor v2 (optionally some assets / view types)
+    python -m backend.tools.reprocess_campaign create --name "extractor v2" --extractor-version v2 \
+        [--asset-id A1 --asset-id A2] [--view-type elevation] [--batch-size 500] [--rate 50] [--max-pending 5000]
+    # enqueue in rate-limited batches until exhausted (safe to stop and re-run)
+    python -m backend.tools.reprocess_campaign run <campaign_id>
+    python -m backend.tools.reprocess_campaign status <campaign_id>
+    python -m backend.tools.reprocess_campaign pause|cancel <campaign_id>
+
+Progress is also served at GET /campaigns/{campaign_id}.
+"""
+from __future__ import annotations
+import argparse
+
+from backend.db.campaign_models import CampaignCreate
+from backend.db.mongo import get_database
+from backend.services import campaign_service
+
+
+def _load(db, campaign_id: str) -> dict:
+    campaign = campaign_service.get_campaign(db, campaign_id)
+    if campaign is None:
+        raise SystemExit(f"[ERROR] Campaign {campaign_id} not found")
+    return campaign
+
+
+def _print_progress(db, campaign: dict) -> None:
+    p = campaign_service.campaign_progress(db, campaign)
+    print(f"[INFO] {p.id} '{p.name}' ({p.extractor_version}) state={p.state}")
+    print(f"[INFO]   enqueued {p.enqueued}/{p.total}; pending {p.pending}, processing {p.processing}, "
+          f"completed {p.completed}, failed {p.failed} ({p.percent_done:.1f}% done)")
+    if p.eta_seconds is not None:
+        print(f"[INFO]   {p.throughput_per_second:.2f} views/s, ETA {p.eta_seconds / 3600:.1f} h ({p.eta_at:%Y-%m-%d %H:%M} UTC)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reprocess existing views through the bulk lane.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="Create a campaign.")
+    create.add_argument("--name", required=True)
+    create.add_argument("--extractor-version", required=True)
+    create.add_argument("--asset-id", action="append", dest="asset_ids")
+    create.add_argument("--view-type", action="append", dest="view_types")
+    create.add_argument("--batch-size", type=int, default=500)
+    create.add_argument("--rate", type=float, default=50.0, help="Views enqueued per second (average).")
+    create.add_argument("--max-pending", type=int, default=5000, help="Stop enqueueing while this many are waiting.")
+
+    for name in ("run", "status", "pause", "cancel"):
+        sub.add_parser(name).add_argument("campaign_id")
+    args = parser.parse_args()
+
+    db = get_database()
+    if args.command == "create":
+        payload = CampaignCreate(
+            name=args.name,
+            extractor_version=args.extractor_version,
+            asset_ids=args.asset_ids,
+            view_types=args.view_types,
+            batch_size=args.batch_size,
+            rate_per_second=args.rate,
+            max_pending=args.max_pending,
+        )
+        campaign = campaign_service.create_campaign(db, payload)
+        print(f"[OK] Campaign {campaign['_id']}: {campaign['total']} views selected")
+        return
+
+    campaign = _load(db, args.campaign_id)
+    if args.command == "run":
+        try:
+            campaign = campaign_service.run_campaign(db, campaign)
+        except KeyboardInterrupt:
+            campaign_service.set_state(db, campaign["_id"], "paused")
+            print("[WARN] Interrupted; campaign paused (re-run to resume)")
+        _print_progress(db, _load(db, args.campaign_id))
+    elif args.command == "status":
+        _print_progress(db, campaign)
+    else:
+        campaign_service.set_state(db, campaign["_id"], "paused" if args.command == "pause" else "cancelled")
+        print(f"[OK] Campaign {campaign['_id']} {args.command}{'d' if args.command == 'pause' else 'led'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Windows CAD worker (AutoCAD automation) and its shared extraction code.
+"""
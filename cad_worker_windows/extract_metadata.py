@@ -0,0 +1,233 @@
+"""
+Single-pass drawing metadata extraction.
+
+The debug script walks model space once per entity type (block references,
+TEXT, MTEXT, aligned dimensions), and every walk is a full COM traversal.
+Here the engine walks the source once and hands each entity to the
+collectors registered for its type, so traversal cost is paid once no
+matter how many collectors run. Time spent inside each collector is
+measured separately from the traversal itself.
+
+Usage:
+
+    # Windows, active AutoCAD document
+    python -m cad_worker_windows.extract_metadata --source autocad --out meta.json
+    # Linux / CI
+    python -m cad_worker_windows.extract_metadata --source dxf drawing.dxf --out meta.json
+    python -m cad_worker_windows.extract_metadata --source fixture recorded.json
+
+    # record the active drawing for replay on Linux
+    python -m cad_worker_windows.extract_metadata --source autocad --record recorded.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cad_worker_windows.sources import (
+    ALIGNED_DIMENSION,
+    BLOCK_REFERENCE,
+    MTEXT,
+    ROTATED_DIMENSION,
+    TEXT,
+    AutocadSource,
+    DrawingSource,
+    DxfSource,
+    FixtureSource,
+    record_fixture,
+)
+
+BLOCK_SAMPLE_SIZE = 300
+
+
+class Collector:
+    """
+    Base collector. `entity_types` are the ObjectNames routed to `visit`;
+    `begin` runs once before each traversal (tables, not entities) and must
+    reset any per-drawing state, since an engine is reused across drawings.
+    """
+    name = "collector"
+    entity_types: Tuple[str, ...] = ()
+
+    def begin(self, source: DrawingSource) -> None:
+        pass
+
+    def visit(self, source: DrawingSource, type_name: str, ent: Any) -> None:
+        pass
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class LayerCollector(Collector):
+    name = "layers"
+
+    def begin(self, source: DrawingSource) -> None:
+        self.layers = source.layers()
+
+    def result(self) -> Dict[str, Any]:
+        return {"layers": self.layers}
+
+
+class BlockCollector(Collector):
+    name = "blocks"
+    entity_types = (BLOCK_REFERENCE,)
+
+    def __init__(self, sample_size: int = BLOCK_SAMPLE_SIZE) -> None:
+        self.sample_size = sample_size
+
+    def begin(self, source: DrawingSource) -> None:
+        self.counts: Counter = Counter()
+        self.instances: List[Dict[str, Any]] = []
+
+    def visit(self, source: DrawingSource, type_name: str, ent: Any) -> None:
+        name = source.block_name(ent)
+        layer = source.layer(ent)
+        self.counts[(name, layer)] += 1
+        if len(self.instances) < self.sample_size:
+            ip = source.insertion_point(ent)
+            pos = {"x": ip[0], "y": ip[1], "z": ip[2]} if ip is not None else None
+            self.instances.append({"name": name, "layer": layer, "position": pos})
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "block_counts": [{"name": n, "layer": l, "count": c} for (n, l), c in self.counts.items()],
+            "block_instances_sample": self.instances,
+        }
+
+
+class TextCollector(Collector):
+    name = "texts"
+    entity_types = (TEXT, MTEXT)
+
+    def begin(self, source: DrawingSource) -> None:
+        self.texts: List[Dict[str, Any]] = []
+
+    def visit(self, source: DrawingSource, type_name: str, ent: Any) -> None:
+        self.texts.append({
+            "type": "MTEXT" if type_name == MTEXT else "TEXT",
+            "layer": source.layer(ent),
+            "text": source.text(type_name, ent),
+        })
+
+    def result(self) -> Dict[str, Any]:
+        return {"texts": self.texts}
+
+
+class DimensionCollector(Collector):
+    name = "dimensions"
+    entity_types = (ALIGNED_DIMENSION, ROTATED_DIMENSION)
+
+    def begin(self, source: DrawingSource) -> None:
+        self.dims: List[Dict[str, Any]] = []
+
+    def visit(self, source: DrawingSource, type_name: str, ent: Any) -> None:
+        self.dims.append({
+            "type": "AlignedDimension" if type_name == ALIGNED_DIMENSION else "RotatedDimension",
+            "layer": source.layer(ent),
+            "measurement": source.measurement(ent),
+        })
+
+    def result(self) -> Dict[str, Any]:
+        return {"dimensions": self.dims}
+
+
+def default_collectors() -> List[Collector]:
+    return [LayerCollector(), BlockCollector(), TextCollector(), DimensionCollector()]
+
+
+@dataclass
+class ExtractionResult:
+    document: str
+    data: Dict[str, Any]
+    entity_count: int  # entities dispatched to at least one collector
+    # seconds: one entry per collector, plus "traversal" (walk + dispatch) and "total"
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class ExtractionEngine:
+    def __init__(self, collectors: Optional[Sequence[Collector]] = None) -> None:
+        self.collectors = list(collectors) if collectors is not None else default_collectors()
+        self.dispatch: Dict[str, List[Collector]] = defaultdict(list)
+        for collector in self.collectors:
+            for type_name in collector.entity_types:
+                self.dispatch[type_name].append(collector)
+
+    def run(self, source: DrawingSource) -> ExtractionResult:
+        perf = time.perf_counter
+        spent: Dict[str, float] = {c.name: 0.0 for c in self.collectors}
+        started = perf()
+
+        for collector in self.collectors:
+            t0 = perf()
+            collector.begin(source)
+            spent[collector.name] += perf() - t0
+
+        walk_started = perf()
+        entity_count = 0
+        visit_seconds = 0.0
+        dispatch = self.dispatch
+        for type_name, ent in source.entities(dispatch.keys()):
+            entity_count += 1
+            for collector in dispatch[type_name]:
+                t0 = perf()
+                collector.visit(source, type_name, ent)
+                elapsed = perf() - t0
+                spent[collector.name] += elapsed
+                visit_seconds += elapsed
+        walk_seconds = perf() - walk_started
+
+        data: Dict[str, Any] = {}
+        for collector in self.collectors:
+            t0 = perf()
+            data.update(collector.result())
+            spent[collector.name] += perf() - t0
+
+        timings = dict(spent)
+        timings["traversal"] = max(0.0, walk_seconds - visit_seconds)
+        timings["total"] = perf() - started
+        return ExtractionResult(source.document_name(), data, entity_count, timings)
+
+
+def open_source(kind: str, path: Optional[str]) -> DrawingSource:
+    if kind == "autocad":
+        return AutocadSource()
+    if not path:
+        raise SystemExit(f"--source {kind} needs a path")
+    if kind == "dxf":
+        return DxfSource(path)
+    return FixtureSource(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract layers, blocks, text and dimensions in one pass.")
+    parser.add_argument("--source", choices=["autocad", "dxf", "fixture"], default="autocad")
+    parser.add_argument("path", nargs="?", help="DXF file or fixture JSON (not used for --source autocad).")
+    parser.add_argument("--out", help="Write the extracted metadata JSON here.")
+    parser.add_argument("--record", help="Record the source as a replayable fixture JSON and exit.")
+    args = parser.parse_args()
+
+    source = open_source(args.source, args.path)
+    if args.record:
+        print(f"[OK] Recorded fixture -> {record_fixture(source, args.record)}")
+        return
+
+    result = ExtractionEngine().run(source)
+    print(f"[INFO] {result.document}: {result.entity_count} entities")
+    for name, seconds in result.timings.items():
+        print(f"[INFO]   {name:<12} {seconds * 1000:>9.1f} ms")
+
+    if args.out:
+        out = {"document": result.document, **result.data, "timings": result.timings}
+        Path(args.out).write_text(json.dumps(out), encoding="utf-8")
+        print(f"[OK] Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Drawing sources for the extraction engine (extract_metadata.py).
+
+A source yields every model-space entity exactly once as (type name,
+native object) and knows how to read the handful of properties the
+collectors need from its own native objects. Type names are the AutoCAD
+ObjectName values ("AcDbBlockReference", "AcDbText", ...) regardless of
+the source, so collectors are written once.
+
+- AutocadSource: the active (or given) document over pyautocad COM (Windows).
+- DxfSource: a DXF file read with ezdxf (Linux, CI, DWG converted to DXF).
+- FixtureSource: a JSON recording of any source (see record_fixture), for tests.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+BLOCK_REFERENCE = "AcDbBlockReference"
+TEXT = "AcDbText"
+MTEXT = "AcDbMText"
+ALIGNED_DIMENSION = "AcDbAlignedDimension"
+ROTATED_DIMENSION = "AcDbRotatedDimension"
+
+Point = Optional[Tuple[float, float, float]]
+
+
+class DrawingSource(ABC):
+    name = "source"
+
+    @abstractmethod
+    def document_name(self) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def layers(self) -> List[Dict[str, Any]]:
+        """Layer table rows: name, color, lineweight."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def entities(self, types: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Single pass over model space yielding (ObjectName, native entity),
+        restricted to `types` when given.
+        """
+        raise NotImplementedError
+
+    # --- property access (one native call each) ---
+    @abstractmethod
+    def layer(self, ent: Any) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def block_name(self, ent: Any) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def insertion_point(self, ent: Any) -> Point:
+        raise NotImplementedError
+
+    @abstractmethod
+    def text(self, type_name: str, ent: Any) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def measurement(self, ent: Any) -> Optional[float]:
+        raise NotImplementedError
+
+
+class AutocadSource(DrawingSource):
+    """
+    pyautocad COM source. Model space is walked once with casting enabled,
+    instead of one `iter_objects(type)` traversal per entity type.
+    """
+    name = "autocad"
+
+    def __init__(self, acad: Any = None) -> None:
+        if acad is None:
+            from pyautocad import Autocad  # Windows-only dependency
+
+            acad = Autocad(create_if_not_exists=False)
+        self.acad = acad
+
+    def document_name(self) -> str:
+        return self.acad.doc.FullName
+
+    def layers(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": layer.Name, "color": layer.Color, "lineweight": layer.Lineweight}
+            for layer in self.acad.doc.Layers
+        ]
+
+    def entities(self, types: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Any]]:
+        # iter_objects filters on ObjectName inside its single walk and only
+        # casts (an extra COM round-trip) the entities that match.
+        for ent in self.acad.iter_objects(list(types) if types else None):
+            type_name = ent.ObjectName
+            if types is None or type_name in types:
+                yield type_name, ent
+
+    def layer(self, ent: Any) -> Optional[str]:
+        return ent.Layer
+
+    def block_name(self, ent: Any) -> Optional[str]:
+        return ent.Name
+
+    def insertion_point(self, ent: Any) -> Point:
+        try:
+            ip = ent.InsertionPoint
+        except Exception:
+            return None
+        return (ip[0], ip[1], ip[2]) if ip is not None else None
+
+    def text(self, type_name: str, ent: Any) -> Optional[str]:
+        try:
+            return ent.Contents if type_name == MTEXT else ent.TextString
+        except Exception:
+            return None
+
+    def measurement(self, ent: Any) -> Optional[float]:
+        try:
+            return ent.Measurement
+        except Exception:
+            return None
+
+
+# ezdxf DIMENSION dimtype (low 3 bits) -> AutoCAD ObjectName
+_DXF_DIMENSION_TYPES = {0: ROTATED_DIMENSION, 1: ALIGNED_DIMENSION}
+_DXF_TYPES = {"INSERT": BLOCK_REFERENCE, "TEXT": TEXT, "MTEXT": MTEXT}
+
+
+class DxfSource(DrawingSource):
+    """
+    ezdxf source for DXF files (or DWG converted with ODA File Converter).
+    """
+    name = "dxf"
+
+    def __init__(self, path: str | Path) -> None:
+        import ezdxf
+
+        self.path = Path(path)
+        self.doc = ezdxf.readfile(str(self.path))
+
+    def document_name(self) -> str:
+        return str(self.path)
+
+    def layers(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": layer.dxf.name, "color": layer.dxf.color, "lineweight": layer.dxf.lineweight}
+            for layer in self.doc.layers
+        ]
+
+    def entities(self, types: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Any]]:
+        for ent in self.doc.modelspace():
+            dxftype = ent.dxftype()
+            if dxftype == "DIMENSION":
+                type_name = _DXF_DIMENSION_TYPES.get(ent.dimtype & 7, "AcDbDimension")
+            else:
+                type_name = _DXF_TYPES.get(dxftype, f"AcDb{dxftype.title()}")
+            if types is None or type_name in types:
+                yield type_name, ent
+
+    def layer(self, ent: Any) -> Optional[str]:
+        return ent.dxf.get("layer")
+
+    def block_name(self, ent: Any) -> Optional[str]:
+        return ent.dxf.get("name")
+
+    def insertion_point(self, ent: Any) -> Point:
+        ip = ent.dxf.get("insert")
+        return (ip.x, ip.y, ip.z) if ip is not None else None
+
+    def text(self, type_name: str, ent: Any) -> Optional[str]:
+        return ent.text if type_name == MTEXT else ent.dxf.get("text")
+
+    def measurement(self, ent: Any) -> Optional[float]:
+        try:
+            return ent.get_measurement()
+        except Exception:
+            return None
+
+
+class FixtureSource(DrawingSource):
+    """
+    Replays a JSON recording: {"document", "layers": [...], "entities": [{"type", ...}]}.
+    """
+    name = "fixture"
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.data = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def document_name(self) -> str:
+        return self.data.get("document", str(self.path))
+
+    def layers(self) -> List[Dict[str, Any]]:
+        return self.data.get("layers", [])
+
+    def entities(self, types: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Any]]:
+        for ent in self.data.get("entities", []):
+            if types is None or ent["type"] in types:
+                yield ent["type"], ent
+
+    def layer(self, ent: Any) -> Optional[str]:
+        return ent.get("layer")
+
+    def block_name(self, ent: Any) -> Optional[str]:
+        return ent.get("name")
+
+    def insertion_point(self, ent: Any) -> Point:
+        ip = ent.get("position")
+        return tuple(ip) if ip is not None else None
+
+    def text(self, type_name: str, ent: Any) -> Optional[str]:
+        return ent.get("text")
+
+    def measurement(self, ent: Any) -> Optional[float]:
+        return ent.get("measurement")
+
+
+def record_fixture(source: DrawingSource, path: str | Path) -> Path:
+    """
+    Record the entities the collectors care about from any source (e.g. a
+    live AutoCAD session) so they can be replayed with FixtureSource on Linux.
+    """
+    entities = []
+    for type_name, ent in source.entities():
+        row: Dict[str, Any] = {"type": type_name, "layer": source.layer(ent)}
+        if type_name == BLOCK_REFERENCE:
+            row["name"] = source.block_name(ent)
+            row["position"] = source.insertion_point(ent)
+        elif type_name in (TEXT, MTEXT):
+            row["text"] = source.text(type_name, ent)
+        elif type_name in (ALIGNED_DIMENSION, ROTATED_DIMENSION):
+            row["measurement"] = source.measurement(ent)
+        entities.append(row)
+
+    path = Path(path)
+    data = {"document": source.document_name(), "layers": source.layers(), "entities": entities}
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
@@ -1,12 +1,284 @@
 # retrieval/api/main.py
-from fastapi import FastAPI
+from __future__ import annotations
+from contextlib import asynccontextmanager, contextmanager
+import logging
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Union
+
+from fastapi import FastAPI, HTTPException, Request, status
+from pydantic import BaseModel, ConfigDict, Field
+from retrieval.core.config import settings
+from retrieval.db.mongo import get_database
+from retrieval.index.batcher import SearchBatcher
+from retrieval.index.facets import load_facets, tag_key
+from retrieval.index.faiss_index import INDEX_FILE, FaissIndex, index_dir, load_faiss_index
+from retrieval.index.flat import FlatIndex, latest_model_version, load_flat_index
+from retrieval.index.manager import IndexManager, VersionNotReadyError
+from retrieval.index.segments import SegmentedIndex, SegmentMaintainer, SegmentView
+
+
+# uvicorn only configures its own loggers; this makes the index lifecycle
+# messages (load, warm-up, compaction) visible under the same process.
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+MainIndex = Union[FaissIndex, FlatIndex]
+
+
+class TagFilter(BaseModel):
+    category: str
+    value: str
+
+
+class SearchFilters(BaseModel):
+    """
+    Facet filter: a hit must match one of the listed values of every given
+    field, and all of the given tags.
+    """
+    category: Optional[List[str]] = None
+    project_type: Optional[List[str]] = None
+    room_type: Optional[List[str]] = None
+    style: Optional[List[str]] = None
+    studio: Optional[List[str]] = None
+    view_type: Optional[List[str]] = None
+    tags: Optional[List[TagFilter]] = None
+
+    def facets(self) -> Dict[str, List[str]]:
+        out = self.model_dump(exclude={"tags"}, exclude_none=True)
+        if self.tags:
+            out["tags"] = [tag_key(t.category, t.value) for t in self.tags]
+        return out
+
+
+class SearchRequest(BaseModel):
+    vector: List[float] = Field(min_length=1, description="Projected query embedding (z_query).")
+    k: int = Field(10, ge=1)
+    model_version: Optional[str] = Field(None, description="Pin a loaded version; default follows the traffic split.")
+    routing_key: Optional[str] = Field(None, description="Sticky split bucket, e.g. a session id.")
+    filters: Optional[SearchFilters] = None
+    exclude: Optional[SearchFilters] = Field(None, description="Hits matching any of these values are dropped.")
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+class SearchHit(BaseModel):
+    faiss_id: int
+    view_id: str
+    asset_id: str
+    score: float
+
+
+class TrafficSplit(BaseModel):
+    weights: Dict[str, float] = Field(min_length=1, description='e.g. {"v1": 0.9, "v2": 0.1}')
+
+
+class SearchResponse(BaseModel):
+    model_version: str
+    took_ms: float
+    # "batched" (unfiltered), "exact" (scan of the matching rows), "ann" (index search with a row selector) or "empty"
+    strategy: str
+    matched: Optional[int] = None  # rows passing the filters
+    results: List[SearchHit]
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+def resolve_version() -> Optional[str]:
+    return settings.model_version or latest_model_version(get_database())
+
+
+def load_index(version: str) -> SegmentedIndex:
+    """
+    The persisted FAISS index of `version` (memory-mapped), or, when none
+    has been built, its vectors streamed from Mongo; plus facet bitmaps and
+    a delta segment caught up with embedding_docs.
+    """
+    db = get_database()
+    directory = index_dir(settings.file_base_dir, version)
+    built = os.path.exists(os.path.join(directory, INDEX_FILE))
+    if settings.index_source == "faiss" or (settings.index_source == "auto" and built):
+        model = db["models"].find_one({"_id": f"faiss_index_{version}"}, {"search_params": 1, "snapshot_at": 1, "created_at": 1}) or {}
+        params = dict(model.get("search_params") or {})
+        if settings.search_nprobe is not None:
+            params["nprobe"] = settings.search_nprobe
+        if settings.search_ef_search is not None:
+            params["efSearch"] = settings.search_ef_search
+        index: MainIndex = load_faiss_index(directory, version, params)
+        index.as_of = model.get("snapshot_at") or model.get("created_at")
+        logger.info(
+            "Mapped %s index (%d x %d) for %s in %.2fs", index.index_type, index.size, index.dim, version, index.load_seconds,
+        )
+    else:
+        index = load_flat_index(db, version)
+        logger.info("Loaded %d x %d vectors for %s in %.1fs", index.size, index.dim, version, index.load_seconds)
+
+    started = time.perf_counter()
+    index.facets = load_facets(db, index.view_ids, index.asset_ids)
+    logger.info("Built facet bitmaps (%.1f MiB) in %.1fs", index.facets.nbytes / 2**20, time.perf_counter() - started)
+
+    segmented = SegmentedIndex(index, settings.filter_exact_max_rows)
+    caught_up = segmented.refresh(db)
+    logger.info("Applied %d embedding_docs changes since the %s snapshot", caught_up, version)
+    return segmented
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.manager = IndexManager(load_index, settings.warmup_queries)
+    app.state.batcher = SearchBatcher(settings.search_max_batch).start()
+    app.state.maintainer = SegmentMaintainer(
+        app.state.manager.indexes,
+        get_database,
+        poll_seconds=settings.delta_poll_seconds,
+        max_delta_rows=settings.delta_merge_rows,
+        max_tombstone_ratio=settings.delta_merge_tombstone_ratio,
+        reconcile_seconds=settings.delta_reconcile_seconds,
+    )
+    version = resolve_version()
+    if version is None:
+        logger.warning("No embedded docs found; /search is unavailable until a version is loaded")
+    else:
+        app.state.manager.load(version, activate=True)
+    app.state.maintainer.start()
+    yield
+    app.state.maintainer.stop()
+    app.state.batcher.stop()
+
+
+app = FastAPI(title="Archimera Retrieval", lifespan=lifespan)
+
+
+@contextmanager
+def _acquire(app: FastAPI, version: Optional[str] = None, routing_key: Optional[str] = None) -> Iterator[SegmentView]:
+    """
+    The current segments of the requested / routed version, held for the request.
+    """
+    try:
+        with app.state.manager.acquire(version, routing_key) as index:
+            yield index.current
+    except VersionNotReadyError:
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="No index loaded")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Model version {version} is not loaded")
 
-app = FastAPI(title="Archimera Retrieval")
 
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+def health(request: Request):
+    manager: IndexManager = request.app.state.manager
+    state = manager.status()
+    active = next((v for v in state["versions"] if v["model_version"] == state["active"]), None)
+    return {
+        "status": "ok",
+        "model_version": state["active"],
+        "index_type": active["index_type"] if active else None,
+        "vectors": active["vectors"] if active else 0,
+        "split": state["split"],
+    }
+
+
+@app.post("/search", response_model=SearchResponse)
+def search(payload: SearchRequest, request: Request) -> SearchResponse:
+    with _acquire(request.app, payload.model_version, payload.routing_key) as index:
+        if len(payload.vector) != index.dim:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Expected a {index.dim}-dimensional vector, got {len(payload.vector)}",
+            )
+        k = min(payload.k, settings.search_max_k)
+        include = payload.filters.facets() if payload.filters else None
+        exclude = payload.exclude.facets() if payload.exclude else None
+        started = time.perf_counter()
+        if include or exclude:
+            scores, rows, strategy, matched = index.search_filtered(payload.vector, k, include, exclude)
+            scores, rows = scores[0], rows[0]
+        else:
+            scores, rows = request.app.state.batcher.search(index, payload.vector, k)
+            strategy, matched = "batched", None
+        results = index.results(scores, rows)
+        return SearchResponse(
+            model_version=index.model_version,
+            took_ms=(time.perf_counter() - started) * 1000,
+            strategy=strategy,
+            matched=matched,
+            results=results,
+        )
+
+
+@app.get("/facets")
+def facets(request: Request, model_version: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Filterable values and their row counts (tags as "category:value").
+    """
+    with _acquire(request.app, model_version) as index:
+        return index.facet_values()
+
+
+@app.get("/admin/versions")
+def list_versions(request: Request):
+    """
+    Loaded, loading, draining and failed versions, the active one and the split.
+    """
+    return request.app.state.manager.status()
+
+
+@app.post("/admin/versions/{model_version}/load", status_code=status.HTTP_202_ACCEPTED)
+def load_version(model_version: str, request: Request, activate: bool = False):
+    """
+    Load and warm a version in the background (replacing a loaded copy);
+    with `activate`, swap all traffic to it once it is ready.
+    """
+    started = request.app.state.manager.load_async(model_version, activate)
+    return {"model_version": model_version, "loading": True, "started": started, "activate": activate}
+
+
+@app.post("/admin/versions/{model_version}/activate")
+def activate_version(model_version: str, request: Request):
+    manager: IndexManager = request.app.state.manager
+    try:
+        manager.activate(model_version)
+    except VersionNotReadyError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Model version {model_version} is not loaded")
+    return manager.status()
+
+
+@app.put("/admin/split")
+def set_split(payload: TrafficSplit, request: Request):
+    """
+    Serve several loaded versions at once, weighted (A/B comparison).
+    """
+    manager: IndexManager = request.app.state.manager
+    try:
+        manager.set_split(payload.weights)
+    except VersionNotReadyError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Not loaded: {exc}")
+    return manager.status()
+
+
+@app.delete("/admin/versions/{model_version}")
+def unload_version(model_version: str, request: Request):
+    """
+    Stop routing to a version; it is evicted once its in-flight requests finish.
+    """
+    manager: IndexManager = request.app.state.manager
+    try:
+        manager.unload(model_version)
+    except VersionNotReadyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Model version {model_version} is not loaded")
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return manager.status()
+
 
-@app.get("/search")
-def search():
-    return {"message": "Search API is up and running!"}
+@app.post("/admin/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_index(request: Request):
+    """
+    Reload the served version (e.g. after an embedding run or an index build)
+    in the background; the old copy keeps serving until the new one is warm.
+    """
+    manager: IndexManager = request.app.state.manager
+    version = manager.active or resolve_version()
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No embedded docs found")
+    started = manager.load_async(version, activate=manager.active is None)
+    return {"model_version": version, "loading": True, "started": started}
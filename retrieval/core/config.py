@@ -0,0 +1,48 @@
+# retrieval/core/config.py
+from __future__ import annotations
+from typing import Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Settings for the retrieval service.
+
+    Reads env vars:
+        MONGO_URI - same database as the backend (embedding_docs, views)
+        FILE_BASE_DIR - NAS mount (read-only here)
+        MODEL_VERSION - embedding_docs.model_version served at start-up; None = newest version with embedded docs
+        SEARCH_MAX_K - upper bound on `k` per request
+        SEARCH_MAX_BATCH - most concurrent queries answered by one matrix scan
+        INDEX_SOURCE - "auto" (persisted FAISS index if built, else vectors from Mongo), "faiss" or "mongo"
+        SEARCH_NPROBE / SEARCH_EF_SEARCH - override the IVF / HNSW search params recorded by build_index
+        FILTER_EXACT_MAX_ROWS - filtered queries matching at most this many rows are scored exactly
+        WARMUP_QUERIES - random searches run on a newly loaded version before it takes traffic
+        DELTA_POLL_SECONDS - how often embedding_docs are tailed into the delta segment (0 = never)
+        DELTA_MERGE_ROWS / DELTA_MERGE_TOMBSTONE_RATIO - compact once the delta segment or the tombstones grow past these
+        DELTA_RECONCILE_SECONDS - how often rows of deleted embedding docs are looked for
+    """
+    mongo_uri: str = "mongodb://mongo:27017/cad_db"
+    file_base_dir: str = "/mnt/assets"
+    model_version: Optional[str] = None
+    search_max_k: int = 100
+    search_max_batch: int = 32
+    index_source: Literal["auto", "faiss", "mongo"] = "auto"
+    search_nprobe: Optional[int] = None
+    search_ef_search: Optional[int] = None
+    filter_exact_max_rows: int = 10_000
+    warmup_queries: int = 64
+    delta_poll_seconds: float = 2.0
+    delta_merge_rows: int = 50_000
+    delta_merge_tombstone_ratio: float = 0.05
+    delta_reconcile_seconds: float = 600.0
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="",
+        case_sensitive=False,
+    )
+
+
+settings = Settings()
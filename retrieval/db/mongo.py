@@ -0,0 +1,21 @@
+# retrieval/db/mongo.py
+from __future__ import annotations
+from typing import Optional
+
+from pymongo import MongoClient
+from pymongo.database import Database
+from retrieval.core.config import settings
+
+
+_client: Optional[MongoClient] = None
+_db: Optional[Database] = None
+
+
+def get_database() -> Database:
+    global _client, _db
+    if _db is None:
+        _client = MongoClient(settings.mongo_uri)
+        # If URI has DB in it, use that; else fall back to 'cad_db'
+        db = _client.get_default_database()
+        _db = db if db is not None else _client["cad_db"]
+    return _db
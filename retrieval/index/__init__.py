@@ -0,0 +1,3 @@
+"""
+Vector indexes served by the retrieval API.
+"""
@@ -0,0 +1,85 @@
+# retrieval/index/batcher.py
+"""
+Opportunistic batching of concurrent searches.
+
+A single query is a mat-vec that streams the whole embedding matrix from
+memory, so it is bandwidth-bound; k concurrent queries answered as one
+mat-mat read the matrix once. Requests are queued to one worker thread,
+which takes everything waiting when it becomes free and answers it with
+one `index.search` per index in the batch (several model versions can be
+served at once). Nothing waits for a batch to fill: an idle worker
+serves a lone request immediately, and under load the batches grow on
+their own, so tail latency stays close to one scan instead of growing
+with the queue.
+"""
+from __future__ import annotations
+from concurrent.futures import Future
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SearchBatcher:
+    def __init__(self, max_batch: int = 32) -> None:
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple[Any, np.ndarray, int, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.queries = 0
+
+    def start(self) -> "SearchBatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="search-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def search(self, index: Any, vector: Any, k: int, timeout: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (scores, rows) for one query against `index`, answered as part of a batch.
+        """
+        future: Future = Future()
+        self._queue.put((index, np.asarray(vector, dtype=np.float32), k, future))
+        return future.result(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch: List[Tuple[Any, np.ndarray, int, Future]] = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            groups: Dict[int, List[Tuple[Any, np.ndarray, int, Future]]] = {}
+            for entry in batch:
+                groups.setdefault(id(entry[0]), []).append(entry)
+            for group in groups.values():
+                self._answer(group)
+
+    def _answer(self, batch: List[Tuple[Any, np.ndarray, int, Future]]) -> None:
+        index = batch[0][0]
+        try:
+            k = max(k for _, _, k, _ in batch)
+            scores, rows = index.search(np.stack([q for _, q, _, _ in batch]), k)
+        except Exception as exc:
+            for *_, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.queries += len(batch)
+        for i, (_, _, k, future) in enumerate(batch):
+            future.set_result((scores[i, :k], rows[i, :k]))
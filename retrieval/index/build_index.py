@@ -0,0 +1,188 @@
+# retrieval/index/build_index.py
+"""
+Build the FAISS index for one model_version and record it in `models`.
+
+    python -m retrieval.index.build_index --type hnsw
+    python -m retrieval.index.build_index --model-version v1.0 --type ivf --nlist 1024 --nprobe 32
+    python -m retrieval.index.build_index --type flat --dry-run
+
+Reads every embedded `output_embedding.vector` of the version (as the
+service's Mongo fallback does), builds a flat, IVF or HNSW inner-product
+index over the normalized vectors and writes
+models/faiss_index/{version}/ under FILE_BASE_DIR. The build is then
+evaluated on `--eval-queries` corpus vectors: recall@k against exact
+search and single-query latency. Build parameters, query-time parameters
+and the evaluation are stored in `models` as `faiss_index_{version}`; the
+service applies the recorded search parameters when it loads the index,
+and tails embedding_docs changed since `snapshot_at` into its delta segment.
+"""
+from __future__ import annotations
+import argparse
+from datetime import datetime, timezone
+import math
+import time
+from typing import Any, Dict, Tuple
+
+import faiss
+import numpy as np
+from retrieval.core.config import settings
+from retrieval.db.mongo import get_database
+from retrieval.index.faiss_index import apply_search_params, index_dir, index_rel_dir, index_type_of, save_faiss_index
+from retrieval.index.flat import FlatIndex, latest_model_version, load_flat_index
+
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+
+def default_nlist(n: int) -> int:
+    # ~4*sqrt(n) lists, but keep >= 39 training points per centroid.
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def build(vectors: np.ndarray, index_type: str, params: Dict[str, Any], seed: int = 0) -> Any:
+    """
+    Inner-product index over `vectors` (rows already L2-normalized), labels = row positions.
+    """
+    d = vectors.shape[1]
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(d)
+    elif index_type == "ivf":
+        index = faiss.IndexIVFFlat(faiss.IndexFlatIP(d), d, params["nlist"], faiss.METRIC_INNER_PRODUCT)
+        train_size = min(len(vectors), params["train_size"])
+        sample = np.random.default_rng(seed).choice(len(vectors), train_size, replace=False)
+        index.train(vectors[np.sort(sample)])
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, params["M"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["efConstruction"]
+    else:
+        raise ValueError(f"Unknown index type {index_type!r}")
+    index.add(vectors)
+    return index
+
+
+def params_of(index: Any) -> Dict[str, Any]:
+    """
+    Build params that reproduce `index`'s structure (for rebuilding it with other vectors).
+    """
+    kind = index_type_of(index)
+    if kind == "hnsw":
+        return {"M": index.hnsw.nb_neighbors(1), "efConstruction": index.hnsw.efConstruction}
+    if kind == "ivf":
+        return {"nlist": faiss.extract_index_ivf(index).nlist, "train_size": 100_000}
+    return {}
+
+
+def evaluate(exact: FlatIndex, index: Any, queries: np.ndarray, k: int) -> Dict[str, Any]:
+    """
+    recall@k of `index` against exact search, and single-query latency.
+    """
+    truth = np.vstack([exact.search(queries[i:i + 256], k)[1] for i in range(0, len(queries), 256)])
+    _, found = index.search(queries, k)
+    hits = sum(len(np.intersect1d(t, f[f >= 0])) for t, f in zip(truth, found))
+
+    timings = np.empty(len(queries))
+    for i, q in enumerate(queries):
+        t0 = time.perf_counter()
+        index.search(q[None, :], k)
+        timings[i] = time.perf_counter() - t0
+    p50, p99 = np.percentile(timings * 1000, [50, 99])
+    return {
+        "k": k,
+        "queries": len(queries),
+        "recall_at_k": round(hits / max(truth.size, 1), 4),
+        "latency_p50_ms": round(float(p50), 3),
+        "latency_p99_ms": round(float(p99), 3),
+    }
+
+
+def parse_params(args: argparse.Namespace, n: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    (build params, search params) for the chosen index type.
+    """
+    if args.type == "ivf":
+        nlist = args.nlist or default_nlist(n)
+        return (
+            {"nlist": nlist, "train_size": min(n, max(args.train_size, 39 * nlist))},
+            {"nprobe": min(args.nprobe, nlist)},
+        )
+    if args.type == "hnsw":
+        return {"M": args.hnsw_m, "efConstruction": args.ef_construction}, {"efSearch": args.ef_search}
+    return {}, {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and evaluate the FAISS index for a model_version.")
+    parser.add_argument("--model-version", default=None, help="Default: MODEL_VERSION, else the newest embedded version.")
+    parser.add_argument("--type", choices=INDEX_TYPES, default="hnsw")
+    parser.add_argument("--root", default=settings.file_base_dir, help="File server root (FILE_BASE_DIR).")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (default ~4*sqrt(n)).")
+    parser.add_argument("--nprobe", type=int, default=16, help="IVF lists scanned per query.")
+    parser.add_argument("--train-size", type=int, default=100_000, help="IVF training sample.")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbours per node.")
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--eval-queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="Build and evaluate, but write nothing.")
+    args = parser.parse_args()
+
+    db = get_database()
+    version = args.model_version or settings.model_version or latest_model_version(db)
+    if version is None:
+        print("[ERROR] No embedded docs found")
+        raise SystemExit(1)
+
+    exact = load_flat_index(db, version)
+    if exact.size == 0:
+        print(f"[ERROR] No embedded vectors for {version}")
+        raise SystemExit(1)
+    print(f"[INFO] Loaded {exact.size} x {exact.dim} vectors for {version} in {exact.load_seconds:.1f}s")
+
+    build_params, search_params = parse_params(args, exact.size)
+    started = time.perf_counter()
+    index = build(exact.vectors, args.type, build_params, seed=args.seed)
+    apply_search_params(index, search_params)
+    build_seconds = time.perf_counter() - started
+    print(f"[OK] Built {args.type} index {build_params} in {build_seconds:.1f}s")
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(exact.size, min(args.eval_queries, exact.size), replace=False)
+    evaluation = evaluate(exact, index, exact.vectors[sample], args.k)
+    print(
+        f"[INFO] recall@{args.k} {evaluation['recall_at_k']:.4f}  "
+        f"p50 {evaluation['latency_p50_ms']:.2f} ms  p99 {evaluation['latency_p99_ms']:.2f} ms  {search_params}"
+    )
+
+    if args.dry_run:
+        print("[DONE] Dry run, nothing written")
+        return
+
+    path = save_faiss_index(
+        index_dir(args.root, version), index, exact.faiss_ids, exact.view_ids, exact.asset_ids,
+    )
+    db["models"].replace_one(
+        {"_id": f"faiss_index_{version}"},
+        {
+            "_id": f"faiss_index_{version}",
+            "type": "faiss_index",
+            "version": version,
+            "storage": {"rel_path": f"{index_rel_dir(version)}/index.faiss"},
+            "index_type": args.type,
+            "metric": "inner_product",
+            "vectors": exact.size,
+            "dim": exact.dim,
+            "build_params": build_params,
+            "search_params": search_params,
+            "build_seconds": round(build_seconds, 2),
+            "snapshot_at": exact.as_of,
+            "evaluation": evaluation,
+            "created_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+    print(f"[DONE] Wrote {path} and models/faiss_index_{version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# retrieval/index/faiss_index.py
+"""
+Persisted FAISS indexes, loaded memory-mapped.
+
+`build_index.py` writes one directory per model_version:
+
+    models/faiss_index/{version}/index.faiss      flat / IVF / HNSW over normalized z_out
+    models/faiss_index/{version}/faiss_ids.npy    row -> embedding_docs faiss_id
+    models/faiss_index/{version}/view_ids.npy     row -> view_id
+    models/faiss_index/{version}/asset_ids.npy    row -> asset_id
+
+FAISS labels are row positions, like FlatIndex rows. Everything is opened
+with mmap (IO_FLAG_MMAP / IO_FLAG_MMAP_IFC for the index, mmap_mode="r" for
+the arrays), so loading is O(1), vectors are paged in on demand, and every
+replica on a host shares one copy in the page cache instead of holding a
+private one.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime
+import os
+import time
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from retrieval.index.flat import normalize_rows, top_k
+
+if TYPE_CHECKING:
+    from retrieval.index.facets import FacetIndex
+
+
+INDEX_FILE = "index.faiss"
+ID_FILES = ("faiss_ids", "view_ids", "asset_ids")
+
+# IVF inverted lists are mmapped by IO_FLAG_MMAP; flat/HNSW storage needs
+# IO_FLAG_MMAP_IFC, which IVF files reject.
+MMAP_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+MMAP_IFC_FLAGS = MMAP_FLAGS | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+
+# Upper bound on efSearch when widening an HNSW search for a filter.
+MAX_FILTERED_EF = 2048
+
+
+def index_rel_dir(model_version: str) -> str:
+    return f"models/faiss_index/{model_version}"
+
+
+def index_dir(base_dir: str, model_version: str) -> str:
+    return os.path.join(base_dir, index_rel_dir(model_version))
+
+
+def index_type_of(index: Any) -> str:
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if faiss.try_extract_index_ivf(index) is not None:
+        return "ivf"
+    return "flat"
+
+
+def apply_search_params(index: Any, params: Optional[Dict[str, Any]]) -> None:
+    """
+    Set query-time knobs (nprobe for IVF, efSearch for HNSW); others are ignored.
+    """
+    kind = index_type_of(index)
+    space = faiss.ParameterSpace()
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        if (name == "nprobe" and kind == "ivf") or (name == "efSearch" and kind == "hnsw"):
+            space.set_index_parameter(index, name, value)
+
+
+def prepare_for_serving(index: Any, params: Optional[Dict[str, Any]]) -> None:
+    """
+    Apply search params and, for IVF, add the row -> list entry map that
+    reconstruct_batch (exact filtered search, compaction) needs.
+    """
+    apply_search_params(index, params)
+    if index_type_of(index) == "ivf":
+        faiss.extract_index_ivf(index).make_direct_map()
+
+
+@dataclass
+class FaissIndex:
+    model_version: str
+    index: Any                   # faiss.Index; labels are row positions
+    faiss_ids: np.ndarray        # (n,) int64
+    view_ids: np.ndarray         # (n,) str
+    asset_ids: np.ndarray        # (n,) str
+    path: str = ""
+    search_params: Dict[str, Any] = field(default_factory=dict)
+    load_seconds: float = 0.0
+    facets: Optional["FacetIndex"] = None
+    as_of: Optional[datetime] = None      # when build_index read the vectors
+
+    @property
+    def index_type(self) -> str:
+        return index_type_of(self.index)
+
+    @property
+    def size(self) -> int:
+        return int(self.index.ntotal)
+
+    @property
+    def dim(self) -> int:
+        return int(self.index.d)
+
+    def prepare_queries(self, queries: Any) -> np.ndarray:
+        q = np.array(queries, dtype=np.float32, ndmin=2, order="C")
+        if q.shape[1] != self.dim:
+            raise ValueError(f"Query dimension {q.shape[1]} does not match index dimension {self.dim}")
+        return normalize_rows(q)
+
+    def search(self, queries: Any, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (scores, row positions), each (n_queries, k), best first; rows are -1
+        where the index found fewer than k neighbours.
+        """
+        q = self.prepare_queries(queries)
+        return self.index.search(q, min(k, max(self.size, 1)))
+
+    def search_rows(self, q: np.ndarray, k: int, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact search over a (small) subset of rows, for prepared queries `q`.
+        """
+        scores, pos = top_k(q @ self.index.reconstruct_batch(rows).T, k)
+        return scores, rows[pos]
+
+    def search_selected(self, q: np.ndarray, k: int, bits: np.ndarray, selectivity: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Index search restricted to the rows set in packed `bits`, widened by
+        1 / selectivity so enough matching candidates are visited.
+        """
+        selector = faiss.IDSelectorBitmap(self.size, faiss.swig_ptr(bits))
+        widen = 1.0 / max(selectivity, 1e-6)
+        kind = self.index_type
+        if kind == "hnsw":
+            ef = min(max(math.ceil(self.index.hnsw.efSearch * widen), k), MAX_FILTERED_EF)
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=ef)
+        elif kind == "ivf":
+            ivf = faiss.extract_index_ivf(self.index)
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=min(math.ceil(ivf.nprobe * widen), ivf.nlist))
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        return self.index.search(q, min(k, max(self.size, 1)), params=params)
+
+    def results(self, scores: np.ndarray, rows: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "faiss_id": int(self.faiss_ids[r]),
+                "view_id": str(self.view_ids[r]),
+                "asset_id": str(self.asset_ids[r]),
+                "score": float(s),
+            }
+            for s, r in zip(scores.tolist(), rows.tolist())
+            if r >= 0
+        ]
+
+
+def _replace(path: str, write) -> None:
+    # Readers that mmapped the old file keep its inode; new readers see the new one.
+    tmp = f"{path}.tmp-{os.getpid()}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _save_array(path: str, array: np.ndarray) -> None:
+    def write(tmp: str) -> None:
+        with open(tmp, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+    _replace(path, write)
+
+
+def save_faiss_index(
+        directory: str,
+        index: Any,
+        faiss_ids: np.ndarray,
+        view_ids: np.ndarray,
+        asset_ids: np.ndarray,
+) -> str:
+    """
+    Write the index and its row arrays to `directory`; index.faiss goes last.
+    """
+    os.makedirs(directory, exist_ok=True)
+    _save_array(os.path.join(directory, "faiss_ids.npy"), np.asarray(faiss_ids, dtype=np.int64))
+    _save_array(os.path.join(directory, "view_ids.npy"), np.asarray(view_ids, dtype=str))
+    _save_array(os.path.join(directory, "asset_ids.npy"), np.asarray(asset_ids, dtype=str))
+    path = os.path.join(directory, INDEX_FILE)
+    _replace(path, lambda tmp: faiss.write_index(index, tmp))
+    return path
+
+
+def load_faiss_index(
+        directory: str,
+        model_version: str,
+        search_params: Optional[Dict[str, Any]] = None,
+) -> FaissIndex:
+    started = time.perf_counter()
+    path = os.path.join(directory, INDEX_FILE)
+    try:
+        index = faiss.read_index(path, MMAP_IFC_FLAGS)
+    except RuntimeError:
+        index = faiss.read_index(path, MMAP_FLAGS)
+    arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ID_FILES]
+    if any(len(a) != index.ntotal for a in arrays):
+        raise ValueError(f"{directory}: row arrays do not match the {index.ntotal} vectors in {INDEX_FILE}")
+    prepare_for_serving(index, search_params)
+    return FaissIndex(
+        model_version,
+        index,
+        *arrays,
+        path=path,
+        search_params=dict(search_params or {}),
+        load_seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,168 @@
+# retrieval/index/flat.py
+"""
+Exact (brute-force) cosine search over one model_version's CAD embeddings.
+
+All `output_embedding.vector`s are held in one C-contiguous float32 matrix,
+L2-normalized once at load time, so a query is a single BLAS mat-vec (or
+mat-mat for a batch) followed by `argpartition` top-k; only the k winners
+are sorted. Row i of the matrix is described by `faiss_ids[i]`,
+`view_ids[i]` and `asset_ids[i]`, so turning hits into results never
+touches Mongo.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pymongo.database import Database
+
+if TYPE_CHECKING:
+    from retrieval.index.facets import FacetIndex
+
+
+EMBEDDED = "Embedded"
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    In-place L2 normalization (zero rows stay zero).
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best-first (scores, positions) of the k largest entries of each row.
+    """
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        empty = np.empty(scores.shape[:-1] + (0,))
+        return empty.astype(scores.dtype), empty.astype(np.int64)
+    part = np.argpartition(scores, -k, axis=-1)[..., -k:]
+    part_scores = np.take_along_axis(scores, part, axis=-1)
+    order = np.argsort(-part_scores, axis=-1)
+    return np.take_along_axis(part_scores, order, axis=-1), np.take_along_axis(part, order, axis=-1)
+
+
+@dataclass
+class FlatIndex:
+    model_version: str
+    vectors: np.ndarray          # (n, d) float32, rows L2-normalized
+    faiss_ids: np.ndarray        # (n,) int64
+    view_ids: np.ndarray         # (n,) object (str)
+    asset_ids: np.ndarray        # (n,) object (str)
+    load_seconds: float = 0.0
+    facets: Optional["FacetIndex"] = None
+    as_of: Optional[datetime] = None      # embedding_docs changes after this may be missing
+
+    @property
+    def index_type(self) -> str:
+        return "memory"
+
+    @property
+    def size(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    def prepare_queries(self, queries: Any) -> np.ndarray:
+        q = np.array(queries, dtype=np.float32, ndmin=2, order="C")
+        if q.shape[1] != self.dim:
+            raise ValueError(f"Query dimension {q.shape[1]} does not match index dimension {self.dim}")
+        return normalize_rows(q)
+
+    def search(self, queries: Any, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (scores, row positions), each (n_queries, k), best first. Scores are cosine similarities.
+        """
+        q = self.prepare_queries(queries)
+        scores = q @ self.vectors.T if len(q) > 1 else (self.vectors @ q[0])[None, :]
+        return top_k(scores, k)
+
+    def search_rows(self, q: np.ndarray, k: int, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact search over a subset of rows, for prepared queries `q`. Small
+        subsets are gathered; large ones reuse the full scan and drop the rest.
+        """
+        if len(rows) * 4 < self.size:
+            scores = q @ self.vectors[rows].T
+        else:
+            scores = (q @ self.vectors.T)[:, rows]
+        scores, pos = top_k(scores, k)
+        return scores, rows[pos]
+
+    def results(self, scores: np.ndarray, rows: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "faiss_id": int(self.faiss_ids[r]),
+                "view_id": self.view_ids[r],
+                "asset_id": self.asset_ids[r],
+                "score": float(s),
+            }
+            for s, r in zip(scores.tolist(), rows.tolist())
+        ]
+
+
+def latest_model_version(db: Database) -> Optional[str]:
+    doc = db["embedding_docs"].find_one(
+        {"status": EMBEDDED}, {"model_version": 1}, sort=[("updated_at", -1)],
+    )
+    return doc["model_version"] if doc else None
+
+
+def load_flat_index(db: Database, model_version: str, batch_size: int = 5000) -> FlatIndex:
+    """
+    Stream the embedded docs of `model_version` into one preallocated matrix.
+
+    Rows are in natural order (no server-side sort over large documents);
+    each row keeps its doc's faiss_id, and docs without one are numbered
+    after the largest assigned id.
+    """
+    started = time.perf_counter()
+    as_of = datetime.now(timezone.utc)
+    query = {"model_version": model_version, "status": EMBEDDED, "output_embedding.vector": {"$exists": True}}
+    projection = {"output_embedding.vector": 1, "output_embedding.faiss_id": 1, "view_id": 1, "asset_id": 1}
+    n = db["embedding_docs"].count_documents(query)
+
+    vectors: Optional[np.ndarray] = None
+    faiss_ids = np.full(n, -1, dtype=np.int64)
+    view_ids = np.empty(n, dtype=object)
+    asset_ids = np.empty(n, dtype=object)
+    i = 0
+    for doc in db["embedding_docs"].find(query, projection, batch_size=batch_size):
+        if i >= n:  # docs embedded while loading wait for the next reload
+            break
+        emb = doc["output_embedding"]
+        vec = emb["vector"]
+        if vectors is None:
+            vectors = np.empty((n, len(vec)), dtype=np.float32)
+        vectors[i] = vec
+        fid = emb.get("faiss_id")
+        faiss_ids[i] = -1 if fid is None else fid
+        view_ids[i] = str(doc["view_id"])
+        asset_ids[i] = str(doc["asset_id"])
+        i += 1
+
+    if vectors is None:
+        vectors = np.empty((0, 0), dtype=np.float32)
+    vectors, faiss_ids, view_ids, asset_ids = vectors[:i], faiss_ids[:i], view_ids[:i], asset_ids[:i]
+    missing = faiss_ids < 0
+    if missing.any():
+        start = int(faiss_ids.max(initial=-1)) + 1
+        faiss_ids[missing] = np.arange(start, start + int(missing.sum()))
+
+    return FlatIndex(
+        model_version=model_version,
+        vectors=normalize_rows(np.ascontiguousarray(vectors)),
+        faiss_ids=faiss_ids,
+        view_ids=view_ids,
+        asset_ids=asset_ids,
+        load_seconds=time.perf_counter() - started,
+        as_of=as_of,
+    )
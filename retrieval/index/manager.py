@@ -0,0 +1,241 @@
+# retrieval/index/manager.py
+"""
+Serving several index versions at once, with hot swaps.
+
+Each loaded index is a `LoadedVersion` with a reference count. Requests
+take a reference for as long as they use an index (`acquire`), so
+switching the active version, changing the traffic split or reloading a
+version only changes which entry the *next* request picks; entries that
+are no longer routable are retired and dropped once their last request
+has finished (for mmapped FAISS indexes that unmaps the files).
+
+New versions are loaded and warmed in a background thread and only become
+routable once ready, so a swap never puts a cold index in front of
+traffic. Routing is either explicit (a request names its model_version)
+or a weighted split over ready versions; a routing key (e.g. a session
+id) makes the split sticky.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class VersionNotReadyError(LookupError):
+    pass
+
+
+class LoadedVersion:
+    def __init__(self, version: str, index: Any) -> None:
+        self.version = version
+        self.index = index
+        self.refs = 0
+        self.requests = 0
+        self.retired = False
+        self.loaded_at = datetime.now(timezone.utc)
+
+    def describe(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "model_version": self.version,
+            "index_type": index.index_type if index is not None else None,
+            "vectors": index.size if index is not None else 0,
+            "in_flight": self.refs,
+            "requests": self.requests,
+            "retired": self.retired,
+            "loaded_at": self.loaded_at,
+            "segments": index.stats() if hasattr(index, "stats") else None,
+        }
+
+
+def warm_up(index: Any, queries: int = 64, seed: int = 0) -> float:
+    """
+    Page the index in before it takes traffic: read mmapped files through
+    the page cache, then run a few random searches. Returns seconds spent.
+    """
+    started = time.perf_counter()
+    path = getattr(index, "path", "")
+    if path and os.path.exists(path):
+        with open(path, "rb") as f:
+            while f.read(8 << 20):
+                pass
+    if queries > 0 and index.size > 0:
+        rng = np.random.default_rng(seed)
+        for q in rng.standard_normal((queries, index.dim), dtype=np.float32):
+            index.search(q, 10)
+    return time.perf_counter() - started
+
+
+class IndexManager:
+    def __init__(self, loader: Callable[[str], Any], warmup_queries: int = 64) -> None:
+        self.loader = loader
+        self.warmup_queries = warmup_queries
+        self._lock = threading.Lock()
+        self._ready: Dict[str, LoadedVersion] = {}
+        self._retired: List[LoadedVersion] = []
+        self._loading: Dict[str, threading.Thread] = {}
+        self._errors: Dict[str, str] = {}
+        self.active: Optional[str] = None
+        self.split: Dict[str, float] = {}
+
+    # -------- loading --------
+
+    def load(self, version: str, activate: bool = False) -> LoadedVersion:
+        """
+        Load, warm and register `version` in the calling thread; an already
+        loaded copy is replaced and drains.
+        """
+        index = self.loader(version)
+        seconds = warm_up(index, self.warmup_queries)
+        logger.info("Warmed %s in %.1fs", version, seconds)
+        entry = LoadedVersion(version, index)
+        with self._lock:
+            old = self._ready.get(version)
+            self._ready[version] = entry
+            self._errors.pop(version, None)
+            if old is not None:
+                self._retire(old)
+            if activate or self.active is None:
+                self._activate(version)
+        return entry
+
+    def load_async(self, version: str, activate: bool = False) -> bool:
+        """
+        Start loading `version` in the background; False if already loading.
+        """
+        with self._lock:
+            if version in self._loading:
+                return False
+
+            def run() -> None:
+                try:
+                    self.load(version, activate)
+                except Exception as exc:
+                    logger.exception("Loading %s failed", version)
+                    with self._lock:
+                        self._errors[version] = str(exc)
+                finally:
+                    with self._lock:
+                        self._loading.pop(version, None)
+
+            thread = threading.Thread(target=run, name=f"load-{version}", daemon=True)
+            self._loading[version] = thread
+        thread.start()
+        return True
+
+    # -------- routing --------
+
+    def activate(self, version: str) -> None:
+        """
+        Send all unpinned traffic to `version` (atomic for new requests).
+        """
+        with self._lock:
+            if version not in self._ready:
+                raise VersionNotReadyError(version)
+            self._activate(version)
+
+    def set_split(self, weights: Dict[str, float]) -> None:
+        """
+        Route unpinned traffic by weight, e.g. {"v1": 0.9, "v2": 0.1}.
+        """
+        weights = {v: float(w) for v, w in weights.items() if w > 0}
+        with self._lock:
+            missing = [v for v in weights if v not in self._ready]
+            if missing or not weights:
+                raise VersionNotReadyError(", ".join(missing) or "empty split")
+            self.split = weights
+            self.active = max(weights, key=weights.get)
+
+    def unload(self, version: str) -> None:
+        """
+        Stop routing to `version`; it is evicted after its requests drain.
+        """
+        with self._lock:
+            if version == self.active or version in self.split:
+                raise ValueError(f"{version} is receiving traffic; activate or split to another version first")
+            entry = self._ready.pop(version, None)
+            if entry is None:
+                raise VersionNotReadyError(version)
+            self._retire(entry)
+
+    @contextmanager
+    def acquire(self, version: Optional[str] = None, routing_key: Optional[str] = None) -> Iterator[Any]:
+        """
+        An index for one request: `version` if given, else one picked by the split.
+        """
+        with self._lock:
+            entry = self._ready.get(version or self._route(routing_key) or "")
+            if entry is None:
+                raise VersionNotReadyError(version or "no active version")
+            entry.refs += 1
+            entry.requests += 1
+        try:
+            yield entry.index
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                if entry.retired and entry.refs == 0:
+                    self._evict(entry)
+
+    def indexes(self) -> List[Any]:
+        """
+        Indexes of the ready versions (for background maintenance).
+        """
+        with self._lock:
+            return [e.index for e in self._ready.values()]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self.active,
+                "split": dict(self.split),
+                "versions": [e.describe() for e in self._ready.values()],
+                "draining": [e.describe() for e in self._retired],
+                "loading": sorted(self._loading),
+                "errors": dict(self._errors),
+            }
+
+    # -------- internals (lock held) --------
+
+    def _activate(self, version: str) -> None:
+        self.active = version
+        self.split = {version: 1.0}
+
+    def _route(self, routing_key: Optional[str]) -> Optional[str]:
+        if len(self.split) <= 1:
+            return self.active
+        total = sum(self.split.values())
+        if routing_key is None:
+            point = random.random() * total
+        else:
+            digest = hashlib.sha1(routing_key.encode("utf-8")).digest()
+            point = int.from_bytes(digest[:8], "big") / 2**64 * total
+        for version, weight in sorted(self.split.items()):
+            point -= weight
+            if point < 0:
+                return version
+        return self.active
+
+    def _retire(self, entry: LoadedVersion) -> None:
+        entry.retired = True
+        if entry.refs == 0:
+            self._evict(entry)
+        else:
+            self._retired.append(entry)
+
+    def _evict(self, entry: LoadedVersion) -> None:
+        if entry in self._retired:
+            self._retired.remove(entry)
+        entry.index = None
+        logger.info("Evicted %s (loaded %s)", entry.version, f"{entry.loaded_at:%Y-%m-%d %H:%M:%S}")
@@ -0,0 +1,661 @@
+# retrieval/index/segments.py
+"""
+Main + delta segments, so newly embedded views are searchable in seconds.
+
+The main segment is whatever was loaded for the version (mmapped FAISS
+index or vectors from Mongo) and is never modified. `refresh` tails the
+version's `embedding_docs` in (updated_at, _id) order, starting a little
+before the main segment's snapshot. `updated_at` is stamped by the worker
+before its write commits, so a doc can appear behind the tail position:
+every poll re-scans a trailing `TAIL_OVERLAP` window and skips docs whose
+(view_id, updated_at) was already applied. For every changed doc:
+
+    Embedded with a vector   tombstones the view's current row and appends
+                             the new vector to the delta segment
+    anything else / gone     tombstones the view's current row
+
+Tombstones are a packed live bitmap over main rows plus a live flag per
+delta row. A query searches both segments and merges the top-k: the main
+segment over-fetches by the tombstone count while that is small and is
+otherwise restricted by the live bitmap (facets.filtered_search); the
+delta segment is a small matrix searched exactly.
+
+Writers never touch what readers hold: each change builds a new immutable
+`SegmentView` and publishes it with one reference assignment, so queries
+take no lock and never see half a batch. `compact` folds the delta and the
+tombstones into a new main segment in the background (same index type and
+parameters, kept in memory until the next build_index + reload) while the
+tail keeps running; views changed meanwhile are replayed onto the result
+before it is published. Docs deleted outright never appear in the tail,
+so `reconcile` periodically tombstones rows whose embedded doc is gone.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from pymongo.database import Database
+from retrieval.index.build_index import build, params_of
+from retrieval.index.facets import ASSET_FACETS, VIEW_FACETS, FacetIndex, fetch_facet_rows, filtered_search, popcount, unpack
+from retrieval.index.faiss_index import FaissIndex, prepare_for_serving
+from retrieval.index.flat import EMBEDDED, FlatIndex, normalize_rows, top_k
+
+
+logger = logging.getLogger(__name__)
+
+# Each poll re-scans this far behind the newest updated_at seen, to catch
+# writes that committed late; the tail also starts this far before the
+# main snapshot. Must exceed worker clock skew plus write latency.
+TAIL_OVERLAP = timedelta(seconds=30)
+
+# Up to this many tombstoned main rows, the main segment over-fetches
+# instead of searching under the live bitmap.
+MAX_OVERFETCH = 256
+
+SINGLE_FACETS = ASSET_FACETS + VIEW_FACETS
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def all_rows(n: int) -> np.ndarray:
+    bits = np.full((n + 7) // 8, 0xFF, dtype=np.uint8)
+    if n % 8:
+        bits[-1] = (1 << (n % 8)) - 1
+    return bits
+
+
+def merge_top_k(parts: Sequence[Tuple[np.ndarray, np.ndarray]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best k of several (scores, rows) results; rows -1 mark missing hits.
+    """
+    scores = np.concatenate([np.asarray(s, dtype=np.float32) for s, _ in parts], axis=1)
+    rows = np.concatenate([np.asarray(r, dtype=np.int64) for _, r in parts], axis=1)
+    scores[rows < 0] = -np.inf
+    best, pos = top_k(scores, k)
+    rows = np.take_along_axis(rows, pos, axis=1)
+    rows[~np.isfinite(best)] = -1
+    return best, rows
+
+
+class SegmentView:
+    """
+    Immutable, searchable state: main rows first, delta rows after them.
+    """
+    def __init__(
+            self,
+            main: Any,
+            main_live: np.ndarray,
+            main_dead: int,
+            delta: FlatIndex,
+            delta_live: np.ndarray,
+            exact_max_rows: int,
+    ) -> None:
+        self.main = main
+        self.main_live = main_live
+        self.main_dead = main_dead
+        self.delta = delta
+        self.delta_live = delta_live
+        self.exact_max_rows = exact_max_rows
+        self.offset = main.size
+        self.size = main.size - main_dead + int(delta_live.sum())
+
+    @property
+    def model_version(self) -> str:
+        return self.main.model_version
+
+    @property
+    def index_type(self) -> str:
+        return self.main.index_type
+
+    @property
+    def dim(self) -> int:
+        return self.main.dim
+
+    @property
+    def path(self) -> str:
+        return getattr(self.main, "path", "")
+
+    def prepare_queries(self, queries: Any) -> np.ndarray:
+        return self.main.prepare_queries(queries)
+
+    def _search_main(self, q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.main_dead == 0:
+            return self.main.search(q, k)
+        if self.main_dead <= MAX_OVERFETCH:
+            scores, rows = self.main.search(q, k + self.main_dead)
+            r = np.maximum(rows, 0)
+            alive = (rows >= 0) & (((self.main_live[r >> 3] >> (r & 7)) & 1) == 1)
+            return scores, np.where(alive, rows, -1)
+        scores, rows, _ = filtered_search(self.main, q, k, self.main_live, self.exact_max_rows)
+        return scores, rows
+
+    def _search_delta(self, q: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        live = self.delta_live if mask is None else self.delta_live & mask
+        rows = np.flatnonzero(live)
+        if not len(rows):
+            return np.empty((len(q), 0), dtype=np.float32), np.empty((len(q), 0), dtype=np.int64)
+        scores, rows = self.delta.search_rows(q, k, rows)
+        return scores, rows + self.offset
+
+    def search(self, queries: Any, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (scores, rows), each (n_queries, k), over live rows of both segments.
+        """
+        q = self.prepare_queries(queries)
+        return merge_top_k([self._search_main(q, k), self._search_delta(q, k)], k)
+
+    def search_filtered(
+            self,
+            queries: Any,
+            k: int,
+            include: Optional[Dict[str, List[str]]],
+            exclude: Optional[Dict[str, List[str]]],
+    ) -> Tuple[np.ndarray, np.ndarray, str, int]:
+        """
+        (scores, rows, main-segment strategy, matching live rows) under facet filters.
+        """
+        q = self.prepare_queries(queries)
+        mask = self.main.facets.mask(include, exclude)
+        main_bits = self.main_live if mask is None else mask & self.main_live
+        scores, rows, strategy = filtered_search(self.main, q, k, main_bits, self.exact_max_rows)
+
+        delta_mask = self.delta.facets.mask(include, exclude)
+        delta_rows = None if delta_mask is None else unpack(delta_mask, self.delta.size)
+        delta = self._search_delta(q, k, delta_rows)
+        matched = popcount(main_bits) + int((self.delta_live if delta_rows is None else self.delta_live & delta_rows).sum())
+        if strategy == "empty" and delta[1].size:
+            strategy = "exact"
+        return (*merge_top_k([(scores, rows), delta], k), strategy, matched)
+
+    def results(self, scores: np.ndarray, rows: np.ndarray) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for s, r in zip(scores.tolist(), rows.tolist()):
+            if r < 0:
+                continue
+            segment, i = (self.main, r) if r < self.offset else (self.delta, r - self.offset)
+            out.append({
+                "faiss_id": int(segment.faiss_ids[i]),
+                "view_id": str(segment.view_ids[i]),
+                "asset_id": str(segment.asset_ids[i]),
+                "score": float(s),
+            })
+        return out
+
+    def facet_values(self) -> Dict[str, Dict[str, int]]:
+        """
+        Live row count per facet value, over both segments.
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        for field, values in (self.main.facets.bitmaps if self.main.facets else {}).items():
+            counts[field] = {v: popcount(b & self.main_live) for v, b in values.items()}
+        for field, values in self.delta.facets.bitmaps.items():
+            for v, b in values.items():
+                extra = int((unpack(b, self.delta.size) & self.delta_live).sum())
+                counts.setdefault(field, {})[v] = counts.get(field, {}).get(v, 0) + extra
+        return counts
+
+
+class DeltaSegment:
+    """
+    Append-only rows (writer side). Vectors live in a buffer that doubles
+    when full; published views are prefixes of it, so appends never move
+    rows a reader can see.
+    """
+    def __init__(self, dim: int) -> None:
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.live = np.zeros(0, dtype=bool)
+        self.size = 0
+        self.faiss_ids: List[int] = []
+        self.view_ids: List[str] = []
+        self.asset_ids: List[str] = []
+        self.values: Dict[str, List[Optional[str]]] = {f: [] for f in SINGLE_FACETS}
+        self.tags: List[List[str]] = []
+
+    @property
+    def dead(self) -> int:
+        return self.size - int(self.live[:self.size].sum())
+
+    def append(
+            self,
+            vectors: np.ndarray,
+            faiss_ids: Sequence[int],
+            view_ids: Sequence[str],
+            asset_ids: Sequence[str],
+            values: Dict[str, Sequence[Optional[str]]],
+            tags: Sequence[List[str]],
+    ) -> range:
+        m = len(vectors)
+        if self.size + m > len(self.vectors):
+            capacity = max(1024, 2 * len(self.vectors), self.size + m)
+            grown = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            live = np.zeros(capacity, dtype=bool)
+            live[:self.size] = self.live[:self.size]
+            self.vectors, self.live = grown, live
+        rows = range(self.size, self.size + m)
+        self.vectors[rows.start:rows.stop] = vectors
+        self.live[rows.start:rows.stop] = True
+        self.faiss_ids.extend(int(x) for x in faiss_ids)
+        self.view_ids.extend(view_ids)
+        self.asset_ids.extend(asset_ids)
+        for name in SINGLE_FACETS:
+            self.values[name].extend(values[name])
+        self.tags.extend(tags)
+        self.size += m
+        return rows
+
+    def view(self, model_version: str) -> Tuple[FlatIndex, np.ndarray]:
+        m = self.size
+        facets = FacetIndex.from_rows(
+            m, {f: np.array(v, dtype=object) for f, v in self.values.items()}, np.arange(m), self.tags,
+        )
+        index = FlatIndex(
+            model_version=model_version,
+            vectors=self.vectors[:m],
+            faiss_ids=np.array(self.faiss_ids, dtype=np.int64),
+            view_ids=np.array(self.view_ids, dtype=object),
+            asset_ids=np.array(self.asset_ids, dtype=object),
+            facets=facets,
+        )
+        return index, self.live[:m].copy()
+
+
+def merge_segments(view: SegmentView) -> Any:
+    """
+    New main segment holding the live rows of both segments of `view`.
+    """
+    main, delta = view.main, view.delta
+    main_keep = unpack(view.main_live, main.size)
+    main_rows = np.flatnonzero(main_keep)
+    delta_rows = np.flatnonzero(view.delta_live)
+
+    if isinstance(main, FaissIndex):
+        main_vectors = np.vstack(
+            [main.index.reconstruct_batch(main_rows[i:i + 65536]) for i in range(0, len(main_rows), 65536)]
+            or [np.empty((0, main.dim), dtype=np.float32)]
+        )
+    else:
+        main_vectors = main.vectors[main_rows]
+    vectors = np.ascontiguousarray(np.vstack([main_vectors, delta.vectors[delta_rows]]))
+    faiss_ids = np.concatenate([np.asarray(main.faiss_ids)[main_rows], delta.faiss_ids[delta_rows]])
+    view_ids = np.concatenate([np.asarray(main.view_ids)[main_rows].astype(object), delta.view_ids[delta_rows]])
+    asset_ids = np.concatenate([np.asarray(main.asset_ids)[main_rows].astype(object), delta.asset_ids[delta_rows]])
+    facets = FacetIndex.merge([(main.facets or FacetIndex(main.size, {}), main_keep), (delta.facets, view.delta_live)])
+
+    if isinstance(main, FaissIndex):
+        kind, params = main.index_type, params_of(main.index)
+        if kind == "ivf":
+            params["nlist"] = min(params["nlist"], max(len(vectors) // 39, 1))
+        if not len(vectors):
+            kind = "flat"  # nothing to train on
+        index = build(vectors, kind, params)
+        prepare_for_serving(index, main.search_params)
+        return FaissIndex(
+            main.model_version, index, faiss_ids, view_ids, asset_ids,
+            search_params=dict(main.search_params), facets=facets, as_of=main.as_of,
+        )
+    return FlatIndex(
+        main.model_version, vectors, faiss_ids, view_ids, asset_ids, facets=facets, as_of=main.as_of,
+    )
+
+
+class SegmentedIndex:
+    """
+    A served model_version: main segment + delta segment + tombstones.
+    Readers use `current`; `refresh`, `reconcile` and `compact` are for the
+    maintenance thread.
+    """
+    def __init__(self, main: Any, exact_max_rows: int = 10_000) -> None:
+        self.exact_max_rows = exact_max_rows
+        self._lock = threading.Lock()           # serializes writers
+        self._compacting = threading.Lock()
+        self._trackers: List[Set[str]] = []     # views changed while a compaction / reconcile runs
+        # Newest updated_at seen by the tail, and the updated_at applied per
+        # view within the overlap window (so re-scanned docs are skipped).
+        self._high_water = as_utc(main.as_of or datetime.now(timezone.utc))
+        self._applied: Dict[str, datetime] = {}
+        self.refreshed_at: Optional[datetime] = None
+        self.appended = 0
+        self.tombstoned = 0
+        self.compactions = 0
+        self._reset(main)
+        self._publish()
+
+    # -------- reader side --------
+
+    @property
+    def model_version(self) -> str:
+        return self.current.model_version
+
+    @property
+    def index_type(self) -> str:
+        return self.current.index_type
+
+    @property
+    def size(self) -> int:
+        return self.current.size
+
+    @property
+    def dim(self) -> int:
+        return self.current.dim
+
+    @property
+    def path(self) -> str:
+        return self.current.path
+
+    def search(self, queries: Any, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.current.search(queries, k)
+
+    @property
+    def compacting(self) -> bool:
+        return self._compacting.locked()
+
+    def stats(self) -> Dict[str, Any]:
+        view = self.current
+        return {
+            "main_rows": view.main.size,
+            "main_tombstones": view.main_dead,
+            "delta_rows": view.delta.size,
+            "delta_live": int(view.delta_live.sum()),
+            "appended": self.appended,
+            "tombstoned": self.tombstoned,
+            "compactions": self.compactions,
+            "compacting": self.compacting,
+            "tail_position": self._high_water,
+            "refreshed_at": self.refreshed_at,
+        }
+
+    # -------- writer side (lock held) --------
+
+    def _reset(self, main: Any) -> None:
+        # Callers publish once the new state is complete.
+        self._main = main
+        self._main_live = all_rows(main.size)
+        self._main_dead = 0
+        self._main_order: Optional[np.ndarray] = None
+        self._delta = DeltaSegment(main.dim)
+        self._delta_rows: Dict[str, int] = {}
+        self._next_faiss_id = int(np.max(main.faiss_ids, initial=-1)) + 1
+
+    def _untrack(self, tracker: Set[str]) -> None:
+        # By identity: trackers are sets, and two empty ones compare equal.
+        self._trackers = [t for t in self._trackers if t is not tracker]
+
+    def _publish(self) -> None:
+        delta, delta_live = self._delta.view(self._main.model_version)
+        self.current = SegmentView(self._main, self._main_live, self._main_dead, delta, delta_live, self.exact_max_rows)
+
+    def _main_rows(self, view_ids: Sequence[str]) -> np.ndarray:
+        """
+        Main row of each view id (-1 when not in the main segment).
+        """
+        if not len(view_ids) or self._main.size == 0:
+            return np.full(len(view_ids), -1, dtype=np.int64)
+        ids = np.asarray(self._main.view_ids)
+        if self._main_order is None:
+            self._main_order = np.argsort(ids, kind="stable")
+        wanted = np.asarray(view_ids, dtype=object if ids.dtype == object else str)
+        pos = np.minimum(np.searchsorted(ids, wanted, sorter=self._main_order), len(ids) - 1)
+        rows = self._main_order[pos]
+        return np.where(ids[rows] == wanted, rows, -1)
+
+    def _tombstone(self, view_ids: Sequence[str]) -> int:
+        """
+        Kill the live rows of `view_ids` in both segments; returns rows killed.
+        """
+        killed = 0
+        in_main = []
+        for vid in view_ids:
+            row = self._delta_rows.pop(vid, None)
+            if row is not None:
+                self._delta.live[row] = False
+                killed += 1
+            else:
+                in_main.append(vid)
+        rows = self._main_rows(in_main)
+        rows = rows[rows >= 0]
+        if len(rows):
+            alive = ((self._main_live[rows >> 3] >> (rows & 7)) & 1) == 1
+            rows = np.unique(rows[alive])
+            if len(rows):
+                live = self._main_live.copy()  # readers keep the old bitmap
+                np.bitwise_and.at(live, rows >> 3, ~(np.left_shift(1, rows & 7)).astype(np.uint8))
+                self._main_live = live
+                self._main_dead += len(rows)
+                killed += len(rows)
+        self.tombstoned += killed
+        return killed
+
+    def _append(self, db: Database, docs: Sequence[Dict[str, Any]]) -> int:
+        vectors = np.array([d["output_embedding"]["vector"] for d in docs], dtype=np.float32, ndmin=2)
+        view_ids = [str(d["view_id"]) for d in docs]
+        asset_ids = [str(d["asset_id"]) for d in docs]
+        faiss_ids = []
+        for d in docs:
+            fid = d["output_embedding"].get("faiss_id")
+            if fid is None:
+                fid, self._next_faiss_id = self._next_faiss_id, self._next_faiss_id + 1
+            faiss_ids.append(fid)
+        row_values, row_groups, group_tags = fetch_facet_rows(db, view_ids, asset_ids)
+        rows = self._delta.append(
+            normalize_rows(vectors), faiss_ids, view_ids, asset_ids,
+            {f: row_values[f].tolist() for f in SINGLE_FACETS},
+            [group_tags[g] for g in row_groups],
+        )
+        for vid, row in zip(view_ids, rows):
+            self._delta_rows[vid] = row
+        self.appended += len(docs)
+        return len(docs)
+
+    def _apply(self, db: Database, docs: Sequence[Dict[str, Any]]) -> None:
+        latest: Dict[str, Optional[Dict[str, Any]]] = {}
+        for doc in docs:
+            vector = (doc.get("output_embedding") or {}).get("vector")
+            ok = doc.get("status") == EMBEDDED and vector is not None and len(vector) == self._main.dim
+            if doc.get("status") == EMBEDDED and vector is not None and not ok:
+                logger.warning("%s: %d-dim vector in a %d-dim index, skipped", doc["_id"], len(vector), self._main.dim)
+            latest[str(doc["view_id"])] = doc if ok else None
+            self._applied[str(doc["view_id"])] = as_utc(doc["updated_at"])
+        for tracker in self._trackers:
+            tracker.update(latest)
+        self._tombstone(list(latest))
+        appends = [d for d in latest.values() if d is not None]
+        if appends:
+            self._append(db, appends)
+
+    # -------- maintenance --------
+
+    def refresh(self, db: Database, batch_size: int = 1000) -> int:
+        """
+        Apply embedding_docs changed since the last refresh; returns docs applied.
+        The window is scanned with a key-only projection; vectors are only
+        fetched for docs not applied yet.
+        """
+        coll = db["embedding_docs"]
+        projection = {
+            "view_id": 1, "asset_id": 1, "status": 1, "updated_at": 1,
+            "output_embedding.vector": 1, "output_embedding.faiss_id": 1,
+        }
+        seen = 0
+        with self._lock:
+            since, last_id = self._high_water - TAIL_OVERLAP, None
+            while True:
+                query: Dict[str, Any] = {"model_version": self._main.model_version}
+                if last_id is None:
+                    query["updated_at"] = {"$gte": since}
+                else:
+                    query["$or"] = [{"updated_at": {"$gt": since}}, {"updated_at": since, "_id": {"$gt": last_id}}]
+                cursor = coll.find(query, {"view_id": 1, "updated_at": 1})
+                keys = list(cursor.sort([("updated_at", 1), ("_id", 1)]).limit(batch_size))
+                if not keys:
+                    break
+                fresh = [k["_id"] for k in keys if self._applied.get(str(k["view_id"])) != as_utc(k["updated_at"])]
+                if fresh:
+                    docs = list(coll.find({"_id": {"$in": fresh}}, projection))
+                    if docs:
+                        self._apply(db, docs)
+                        seen += len(docs)
+                since, last_id = as_utc(keys[-1]["updated_at"]), keys[-1]["_id"]
+                self._high_water = max(self._high_water, since)
+                if len(keys) < batch_size:
+                    break
+            horizon = self._high_water - TAIL_OVERLAP
+            self._applied = {vid: ts for vid, ts in self._applied.items() if ts >= horizon}
+            if seen:
+                self._publish()
+            self.refreshed_at = datetime.now(timezone.utc)
+        return seen
+
+    def reconcile(self, db: Database) -> int:
+        """
+        Tombstone rows whose view no longer has an embedded doc; returns rows killed.
+        """
+        tracker: Set[str] = set()
+        with self._lock:
+            self._trackers.append(tracker)
+        try:
+            embedded = {
+                str(d["view_id"])
+                for d in db["embedding_docs"].find(
+                    {"model_version": self._main.model_version, "status": EMBEDDED}, {"view_id": 1, "_id": 0},
+                )
+            }
+        finally:
+            with self._lock:
+                self._untrack(tracker)
+
+        with self._lock:
+            main_rows = np.flatnonzero(unpack(self._main_live, self._main.size))
+            main_ids = np.asarray(self._main.view_ids)[main_rows].astype(str)
+            gone = main_ids[~np.isin(main_ids, list(embedded))].tolist()
+            gone += [vid for vid in self._delta_rows if vid not in embedded]
+            # Views the tail touched meanwhile already reflect their latest state.
+            gone = [vid for vid in gone if vid not in tracker]
+            # A running compaction has already merged these rows; it must
+            # drop them again when it publishes.
+            for other in self._trackers:
+                other.update(gone)
+            killed = self._tombstone(gone) if gone else 0
+            if killed:
+                self._publish()
+        return killed
+
+    def needs_compaction(self, max_delta_rows: int, max_tombstone_ratio: float) -> bool:
+        view = self.current
+        dead = view.main_dead + (view.delta.size - int(view.delta_live.sum()))
+        return view.delta.size >= max_delta_rows or dead > max_tombstone_ratio * max(view.main.size, 1)
+
+    def compact(self) -> bool:
+        """
+        Fold the delta segment and tombstones into a new main segment.
+        Queries and the tail keep running on the old segments meanwhile.
+        """
+        if not self._compacting.acquire(blocking=False):
+            return False
+        try:
+            tracker: Set[str] = set()
+            with self._lock:
+                view = self.current
+                start = self._delta.size
+                self._trackers.append(tracker)
+            started = time.perf_counter()
+            try:
+                main = merge_segments(view)
+            finally:
+                with self._lock:
+                    self._untrack(tracker)
+
+            with self._lock:
+                old = self._delta
+                self._reset(main)
+                # Rows appended while merging move to the new delta segment...
+                carry = [r for r in range(start, old.size) if old.live[r]]
+                if carry:
+                    rows = self._delta.append(
+                        old.vectors[carry],
+                        [old.faiss_ids[r] for r in carry],
+                        [old.view_ids[r] for r in carry],
+                        [old.asset_ids[r] for r in carry],
+                        {f: [old.values[f][r] for r in carry] for f in SINGLE_FACETS},
+                        [old.tags[r] for r in carry],
+                    )
+                    for r, row in zip(carry, rows):
+                        self._delta_rows[old.view_ids[r]] = row
+                # ...and views changed meanwhile lose their merged (stale) row.
+                rows = self._main_rows(sorted(tracker))
+                rows = np.unique(rows[rows >= 0])
+                if len(rows):
+                    np.bitwise_and.at(self._main_live, rows >> 3, ~(np.left_shift(1, rows & 7)).astype(np.uint8))
+                    self._main_dead = len(rows)
+                self._publish()
+                self.compactions += 1
+            logger.info(
+                "Compacted %s: %d rows in main, %d carried over, %.1fs",
+                main.model_version, main.size, len(carry), time.perf_counter() - started,
+            )
+            return True
+        finally:
+            self._compacting.release()
+
+
+class SegmentMaintainer:
+    """
+    Background thread: refresh every loaded version every `poll_seconds`,
+    compact when the delta or the tombstones grow too large, reconcile
+    deletions every `reconcile_seconds`.
+    """
+    def __init__(
+            self,
+            indexes: Callable[[], List[Any]],
+            get_db: Callable[[], Database],
+            poll_seconds: float = 2.0,
+            max_delta_rows: int = 50_000,
+            max_tombstone_ratio: float = 0.05,
+            reconcile_seconds: float = 600.0,
+    ) -> None:
+        self.indexes = indexes
+        self.get_db = get_db
+        self.poll_seconds = poll_seconds
+        self.max_delta_rows = max_delta_rows
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.reconcile_seconds = reconcile_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reconciled: Dict[int, float] = {}
+
+    def start(self) -> "SegmentMaintainer":
+        if self._thread is None and self.poll_seconds > 0:
+            self._thread = threading.Thread(target=self._run, name="segment-maintainer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def run_once(self) -> None:
+        db = self.get_db()
+        for index in self.indexes():
+            if not isinstance(index, SegmentedIndex):
+                continue
+            try:
+                index.refresh(db)
+                now = time.monotonic()
+                if now - self._reconciled.setdefault(id(index), now) >= self.reconcile_seconds:
+                    index.reconcile(db)
+                    self._reconciled[id(index)] = now
+                if not index.compacting and index.needs_compaction(self.max_delta_rows, self.max_tombstone_ratio):
+                    threading.Thread(target=index.compact, name=f"compact-{index.model_version}", daemon=True).start()
+            except Exception:
+                logger.exception("Segment maintenance for %s failed", index.model_version)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.run_once()
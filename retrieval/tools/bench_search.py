@@ -0,0 +1,74 @@
+# retrieval/tools/bench_search.py
+"""
+Latency of FlatIndex.search on synthetic data (no Mongo needed).
+
+    python -m retrieval.tools.bench_search --n 100000 --dim 512 --queries 2000 --k 10
+    # concurrent clients through the batcher, as the API serves them
+    python -m retrieval.tools.bench_search --concurrency 16
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import numpy as np
+from retrieval.index.batcher import SearchBatcher
+from retrieval.index.flat import FlatIndex, normalize_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark brute-force top-k search.")
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=1, help="Client threads (>1 goes through SearchBatcher).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = normalize_rows(rng.standard_normal((args.n, args.dim), dtype=np.float32))
+    index = FlatIndex(
+        model_version="bench",
+        vectors=vectors,
+        faiss_ids=np.arange(args.n, dtype=np.int64),
+        view_ids=np.array([f"v{i}" for i in range(args.n)], dtype=object),
+        asset_ids=np.array([f"a{i // 4}" for i in range(args.n)], dtype=object),
+    )
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    for q in queries[:20]:  # warm up caches / BLAS threads
+        index.search(q, args.k)
+
+    timings = np.empty(args.queries)
+    if args.concurrency <= 1:
+        started = time.perf_counter()
+        for i, q in enumerate(queries):
+            t0 = time.perf_counter()
+            scores, rows = index.search(q, args.k)
+            index.results(scores[0], rows[0])
+            timings[i] = time.perf_counter() - t0
+        wall = time.perf_counter() - started
+    else:
+        batcher = SearchBatcher().start()
+
+        def one(i: int) -> None:
+            t0 = time.perf_counter()
+            scores, rows = batcher.search(index, queries[i], args.k)
+            index.results(scores, rows)
+            timings[i] = time.perf_counter() - t0
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(one, range(args.queries)))
+        wall = time.perf_counter() - started
+        batcher.stop()
+        print(f"[INFO] {batcher.queries / max(batcher.batches, 1):.1f} queries per scan on average")
+
+    p50, p95, p99 = np.percentile(timings * 1000, [50, 95, 99])
+    print(f"[INFO] {args.n} x {args.dim} float32 ({vectors.nbytes / 2**20:.0f} MiB), k={args.k}, concurrency {args.concurrency}")
+    print(f"[DONE] p50 {p50:.2f} ms  p95 {p95:.2f} ms  p99 {p99:.2f} ms  ({args.queries / wall:.0f} qps)")
+
+
+if __name__ == "__main__":
+    main()
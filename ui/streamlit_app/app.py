@@ -66,15 +66,26 @@ def main() -> None:
             #     st.error(f"validation error: {is_valid[1]}")
             # * Responsive Devs
             if is_valid[0]:
-                # 1. Create Asset
-                asset_resp = asset_api.create_asset(asset_metadata)
-                asset_id = asset_resp["id"]
-
-                # 2. Create each view with metadata + files
-                for meta, files in zip(view_metadata_list, view_files_list):
-                    view_api.create_view(asset_id, meta, files)
+                has_large_file = any(
+                    view_api.is_large(files.get("sketch_file")) or view_api.is_large(files.get("cad_file"))
+                    for files in view_files_list
+                )
+                if not has_large_file:
+                    # One request for the asset and all of its views
+                    resp = asset_api.create_asset_with_views(asset_metadata, view_metadata_list, view_files_list)
+                    asset_id = resp["asset"]["id"]
+                    for err in resp["errors"]:
+                        st.error(f"View {err['index'] + 1}: {err['error']}")
+                    num_views = len(resp["views"])
+                else:
+                    # Large files go through resumable uploads, one view at a time
+                    asset_resp = asset_api.create_asset(asset_metadata)
+                    asset_id = asset_resp["id"]
+                    for meta, files in zip(view_metadata_list, view_files_list):
+                        view_api.create_view(asset_id, meta, files)
+                    num_views = len(view_metadata_list)
                 
-                st.success(f"Asset {asset_id} and {len(view_metadata_list)} views submitted.")
+                st.success(f"Asset {asset_id} and {num_views} views submitted.")
             else:
                 st.error(f"Validation Error: {is_valid[1]}")
 
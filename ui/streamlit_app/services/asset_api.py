@@ -7,6 +7,7 @@ through the backend service.
 
 Responsibilities:
     - POST /assets  → Create a new asset document
+    - POST /assets/bulk → Create an asset and all its views in one request
     - (future) GET /assets/{id} → Fetch an asset
     - (future) PUT /assets/{id} → Update an asset
 
@@ -16,7 +17,8 @@ Notes:
       because those require multipart file uploads.
 """
 
-from typing import Any, Dict
+import json
+from typing import Any, Dict, List
 
 from .http_client import post
 
@@ -50,3 +52,39 @@ def create_asset(asset_metadata: Dict[str, Any]) -> Dict[str, Any]:
     # NOTE: This sends normal JSON (NOT multipart)
     response = post("/assets", json=asset_metadata)
     return response.json()
+
+
+def create_asset_with_views(
+    asset_metadata: Dict[str, Any],
+    view_metadata_list: List[Dict[str, Any]],
+    view_files_list: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Create an asset together with all of its views in a single multipart request.
+
+    Files are sent as `sketch_{i}` / `cad_{i}` for the i-th view. The backend
+    validates everything before writing, so a bad view rejects the whole
+    submission with per-view errors instead of leaving a half-created asset.
+
+    Returns:
+        dict:
+            Parsed JSON response with `asset`, `views` and per-view `errors`
+            for any view whose files could not be stored.
+
+    Raises:
+        requests.HTTPError:
+            If the backend responds with 4xx or 5xx.
+    """
+    files = []
+    for index, view_files in enumerate(view_files_list):
+        if view_files.get("sketch_file"):
+            files.append((f"sketch_{index}", view_files["sketch_file"]))
+        if view_files.get("cad_file"):
+            files.append((f"cad_{index}", view_files["cad_file"]))
+
+    data = {
+        "payload_json": json.dumps({"asset": asset_metadata, "views": view_metadata_list})
+    }
+
+    response = post("/assets/bulk", files=files, data=data)
+    return response.json()
@@ -28,3 +28,31 @@ def post(path: str, json=None, files=None, data=None):
     resp.raise_for_status()
 
     return resp
+
+
+def put(path: str, data=None, params=None, timeout=None):
+    """
+    Simple HTTP PUT wrapper (raw body), used for resumable upload chunks.
+
+    Raises:
+        requests.HTTPError if status is not OK.
+    """
+    url = f"{API_BASE_URL.rstrip('/')}/{path.lstrip('/')}"
+    resp = requests.put(url, data=data, params=params, timeout=timeout)
+    resp.raise_for_status()
+
+    return resp
+
+
+def get(path: str, params=None):
+    """
+    Simple HTTP GET wrapper.
+
+    Raises:
+        requests.HTTPError if status is not OK.
+    """
+    url = f"{API_BASE_URL.rstrip('/')}/{path.lstrip('/')}"
+    resp = requests.get(url, params=params)
+    resp.raise_for_status()
+
+    return resp
@@ -0,0 +1,96 @@
+"""
+upload_api.py
+
+Client for the backend's resumable upload protocol, used for large CAD
+files where a dropped VPN connection would otherwise mean re-sending the
+whole file.
+
+Protocol:
+    - POST /uploads                      → open a session (asset, kind, size)
+    - PUT  /uploads/{id}?offset=N        → send bytes at offset N
+    - GET  /uploads/{id}                 → committed offset / received ranges
+    - POST /assets/{id}/views/from-uploads → turn finished sessions into a view
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from .http_client import get, post, put
+
+
+CHUNK_SIZE: int = 8 * 1024 * 1024
+MAX_RETRIES: int = 5
+
+
+def _missing_ranges(session: Dict[str, Any]):
+    """Yield [start, end) gaps between the ranges the server already has."""
+    cursor = 0
+    for start, end in session["received_ranges"]:
+        if start > cursor:
+            yield cursor, start
+        cursor = max(cursor, end)
+    if cursor < session["total_size"]:
+        yield cursor, session["total_size"]
+
+
+def upload_file(asset_id: str, kind: str, uploaded_file) -> str:
+    """
+    Upload a file through a resumable session and return the session id.
+
+    Only byte ranges the server has not acknowledged are (re)sent, so a
+    retry after a failure resumes instead of starting over.
+
+    Args:
+        asset_id: Asset the file belongs to.
+        kind: "sketch" or "cad".
+        uploaded_file: Streamlit UploadedFile (or any seekable file object with name/type).
+
+    Returns:
+        str: Upload session id, to pass to `create_view_from_uploads`.
+    """
+    data = uploaded_file.getvalue()
+    session = post("/uploads", json={
+        "asset_id": asset_id,
+        "kind": kind,
+        "filename": getattr(uploaded_file, "name", None),
+        "content_type": getattr(uploaded_file, "type", None),
+        "total_size": len(data),
+    }).json()
+    upload_id = session["id"]
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            for gap_start, gap_end in list(_missing_ranges(session)):
+                for offset in range(gap_start, gap_end, CHUNK_SIZE):
+                    chunk = data[offset:min(offset + CHUNK_SIZE, gap_end)]
+                    session = put(f"/uploads/{upload_id}", data=chunk, params={"offset": offset}, timeout=300).json()
+            return upload_id
+        except requests.RequestException:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(2 ** attempt)
+            session = get(f"/uploads/{upload_id}").json()
+
+    return upload_id
+
+
+def create_view_from_uploads(
+    asset_id: str,
+    view_metadata: Dict[str, Any],
+    sketch_upload_id: Optional[str],
+    cad_upload_id: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Finalize completed upload sessions into a view.
+
+    Returns:
+        dict: Parsed JSON response (the created view).
+    """
+    resp = post(f"/assets/{asset_id}/views/from-uploads", json={
+        "view": view_metadata,
+        "sketch_upload_id": sketch_upload_id,
+        "cad_upload_id": cad_upload_id,
+    })
+    return resp.json()
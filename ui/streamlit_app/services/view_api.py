@@ -1,9 +1,18 @@
 import json
 from typing import Any, Dict
 
+from . import upload_api
 from .http_client import post
 
 
+# Files above this size go through the resumable upload protocol.
+RESUMABLE_THRESHOLD_BYTES: int = 32 * 1024 * 1024
+
+
+def is_large(file) -> bool:
+    return file is not None and getattr(file, "size", 0) > RESUMABLE_THRESHOLD_BYTES
+
+
 def create_view(asset_id: str, view_metadata: Dict[str, Any], view_files: Dict[str, Any]) -> dict:
     """
     Create a new view for an asset with metadata and files.
@@ -12,6 +21,9 @@ def create_view(asset_id: str, view_metadata: Dict[str, Any], view_files: Dict[s
         - payload_json (view_metadata)
         - sketch (file)
         - cad (file)
+
+    Large files are sent through resumable upload sessions instead, so a
+    dropped connection only costs the unacknowledged chunks.
     
     Args:
         asset_id: ID of the asset this view belongs to.
@@ -21,15 +33,24 @@ def create_view(asset_id: str, view_metadata: Dict[str, Any], view_files: Dict[s
     Returns:
         dict: Parsed JSON response from backend.
     """
+    sketch_file = view_files.get("sketch_file")
+    cad_file = view_files.get("cad_file")
+
+    if is_large(sketch_file) or is_large(cad_file):
+        sketch_upload_id = upload_api.upload_file(asset_id, "sketch", sketch_file) if sketch_file else None
+        cad_upload_id = upload_api.upload_file(asset_id, "cad", cad_file) if cad_file else None
+        return upload_api.create_view_from_uploads(asset_id, view_metadata, sketch_upload_id, cad_upload_id)
+
     files = {}
-    if view_files.get("sketch_file"):
-        files["sketch"] = view_files["sketch_file"]
-    if view_files.get("cad_file"):
-        files["cad"] = view_files["cad_file"]
+    if sketch_file:
+        files["sketch"] = sketch_file
+    if cad_file:
+        files["cad"] = cad_file
     
     data = {
         "payload_json": json.dumps(view_metadata)
     }
 
-    resp = post(f"/assets/{asset_id}/views", files=files, data=data)
+    # Streaming endpoint: files go straight to the NAS without local spooling.
+    resp = post(f"/assets/{asset_id}/views/stream", files=files, data=data)
     return resp.json()